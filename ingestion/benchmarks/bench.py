@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the ingestion pipeline.
+
+Every case loads one resource end to end (fetch, extract, normalize, load) into
+a throwaway local DuckDB database, with the Riksdagen API replaced by recorded
+fixtures served from localhost (see sources/riksdagen/replay.py). Each case
+runs in its own process so peak RSS is per case, and reports wall time,
+rows/sec, peak RSS and the time spent per dlt stage.
+
+Usage:
+    # Once, with network: record the responses every case needs
+    python benchmarks/bench.py record [--fixtures=DIR]
+
+    # Anywhere, without network
+    python benchmarks/bench.py run [--fixtures=DIR] [--resource=NAME ...] [--case=NAME ...]
+                                   [--repeat=N] [--output=results.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+INGESTION_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+# Fixed date ranges of closed sessions, so recorded fixtures never go stale
+SCENARIOS = {
+    "anforandelista": {"start_date": "2023-09-01", "end_date": "2023-09-30"},
+    "dokumentlista": {"start_date": "2024-01-01", "end_date": "2024-01-14"},
+    "personlista": {},
+    # The range lies before the incremental initial_value, which would filter out every row
+    "voteringlista": {"start_date": "2023-09-01", "end_date": "2023-12-31", "full_refresh": True},
+}
+
+# Fetch/normalize variants, and the resources each one applies to
+CASES = {
+    "default": ({}, {"anforandelista", "dokumentlista", "personlista", "voteringlista"}),
+    "workers": ({"max_workers": 4}, {"anforandelista", "dokumentlista", "voteringlista"}),
+    "stream": ({"stream": True}, {"anforandelista", "voteringlista"}),
+    "arrow": ({"arrow": True}, {"anforandelista", "dokumentlista", "voteringlista"}),
+}
+
+
+def iter_cases(resources=None, cases=None):
+    for case, (_, applies_to) in CASES.items():
+        if cases and case not in cases:
+            continue
+        for resource in SCENARIOS:
+            if resource in applies_to and (not resources or resource in resources):
+                yield resource, case
+
+
+def run_case(resource: str, case: str, fixtures: str, record: bool = False) -> dict:
+    """Load one resource into a temporary DuckDB database and measure it."""
+    sys.path.insert(0, str(INGESTION_DIR))
+    from contextlib import ExitStack
+
+    import dlt
+    from cli import create_resource_source, use_fixtures
+    from ingestion.metrics import get_metrics
+
+    options, _ = CASES[case]
+    with ExitStack() as stack, tempfile.TemporaryDirectory() as workdir:
+        if record:
+            use_fixtures(stack, record_to=fixtures)
+        else:
+            use_fixtures(stack, replay_from=fixtures)
+
+        source = create_resource_source(resource, **SCENARIOS[resource], **options)
+        dlt_pipeline = dlt.pipeline(
+            pipeline_name=f"bench_{resource}_{case}",
+            destination=dlt.destinations.duckdb(str(Path(workdir) / "bench.duckdb")),
+            dataset_name="raw_riksdagen",
+            pipelines_dir=str(Path(workdir) / "pipelines"),
+        )
+        started = time.perf_counter()
+        dlt_pipeline.run(source)
+        seconds = time.perf_counter() - started
+        get_metrics().record_trace(dlt_pipeline.last_trace)
+
+    summary = get_metrics().summary()
+    rows = summary["row_counts"].get(resource, 0)
+    if not rows:
+        # An empty load would report a meaningless rows/sec, so count it as a failure
+        raise RuntimeError(f"{resource}/{case} loaded no rows")
+    return {
+        "resource": resource,
+        "case": case,
+        "seconds": round(seconds, 3),
+        "rows": rows,
+        "rows_total": sum(summary["row_counts"].values()),
+        "rows_per_second": round(rows / seconds, 1) if seconds else None,
+        "peak_rss_bytes": summary["peak_rss_bytes"],
+        "stages": summary["stages"],
+        "requests": sum(stats["count"] for stats in summary["requests"].values()),
+    }
+
+
+def _spawn(resource: str, case: str, fixtures: str, record: bool) -> dict:
+    """Run a case in a fresh interpreter and parse its JSON result."""
+    command = [sys.executable, __file__, "case", resource, case, f"--fixtures={fixtures}"]
+    if record:
+        command.append("--record")
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=INGESTION_DIR)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{resource}/{case} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _aggregate(results: list) -> dict:
+    """Median over repeats; peak RSS is the maximum."""
+    first = results[0]
+
+    def median(name):
+        return statistics.median(result[name] or 0 for result in results)
+
+    return {
+        **first,
+        "repeats": len(results),
+        "seconds": median("seconds"),
+        "rows_per_second": median("rows_per_second"),
+        "peak_rss_bytes": max(result["peak_rss_bytes"] for result in results),
+        "stages": {
+            stage: statistics.median(result["stages"].get(stage, 0.0) for result in results)
+            for stage in first["stages"]
+        },
+    }
+
+
+def print_table(results: list) -> None:
+    print(f"{'resource':<16}{'case':<10}{'rows':>9}{'rows/s':>11}{'seconds':>9}{'RSS MiB':>9}  stages")
+    for result in results:
+        stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in result["stages"].items())
+        print(
+            f"{result['resource']:<16}{result['case']:<10}{result['rows']:>9}"
+            f"{result['rows_per_second'] or 0:>11.0f}{result['seconds']:>9.2f}"
+            f"{result['peak_rss_bytes'] / 2**20:>9.0f}  {stages}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline ingestion benchmarks")
+    subparsers = parser.add_subparsers(dest="command")
+
+    for name, help_text in (
+        ("record", "Record the fixtures of every case from the live API"),
+        ("run", "Run the benchmarks against recorded fixtures (no network)"),
+    ):
+        command_parser = subparsers.add_parser(name, help=help_text)
+        command_parser.add_argument("--fixtures", default=str(DEFAULT_FIXTURES), help="Fixture directory")
+        command_parser.add_argument("--resource", action="append", choices=list(SCENARIOS), help="Only these resources")
+        command_parser.add_argument("--case", action="append", choices=list(CASES), help="Only these cases")
+    subparsers.choices["run"].add_argument("--repeat", type=int, default=3, help="Runs per case (median is reported)")
+    subparsers.choices["run"].add_argument("--output", help="Write the results as JSON")
+
+    case_parser = subparsers.add_parser("case", help=argparse.SUPPRESS)
+    case_parser.add_argument("resource", choices=list(SCENARIOS))
+    case_parser.add_argument("case", choices=list(CASES))
+    case_parser.add_argument("--fixtures", default=str(DEFAULT_FIXTURES))
+    case_parser.add_argument("--record", action="store_true")
+
+    args = parser.parse_args()
+
+    if args.command == "case":
+        print(json.dumps(run_case(args.resource, args.case, args.fixtures, record=args.record)))
+    elif args.command == "record":
+        for resource, case in iter_cases(args.resource, args.case):
+            result = _spawn(resource, case, args.fixtures, record=True)
+            print(f"Recorded {resource}/{case}: {result['requests']} requests, {result['rows']} rows")
+    elif args.command == "run":
+        if not Path(args.fixtures).is_dir():
+            parser.error(f"No fixtures in {args.fixtures}; run `bench.py record` first")
+        results = [
+            _aggregate([_spawn(resource, case, args.fixtures, record=False) for _ in range(args.repeat)])
+            for resource, case in iter_cases(args.resource, args.case)
+        ]
+        print_table(results)
+        if args.output:
+            Path(args.output).write_text(json.dumps(results, indent=2))
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
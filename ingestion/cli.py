@@ -3,24 +3,97 @@
 CLI interface for ingestion container.
 
 Usage:
-    ingestion-cli run <resource> [--start-date=YYYY-MM-DD] [--end-date=YYYY-MM-DD] [--database=NAME]
+    ingestion-cli run <resource> [<resource> ...] [--start-date=YYYY-MM-DD] [--end-date=YYYY-MM-DD] [--database=NAME] [--workers=N] [--stream] [--arrow] [--delta | --full-refresh] [--cache-dir=DIR] [--max-rps=N]
+                            [--metrics-file=PATH] [--prometheus-file=PATH] [--metrics-port=PORT]
+                            [--checkpoint-every=N] [--resume] [--stage-to=URL] [--stage-only]
+                            [--record-to=DIR | --replay-from=DIR] [--partition=KEY] [--dedup] [--archive-to=DIR] [--memory-budget=SIZE]
+    ingestion-cli run-all [options as for run, except checkpointing/staging]
+    ingestion-cli load-staged <resource> [--staging-url=URL] [--load-id=ID] [--database=NAME]
+    ingestion-cli rebuild <resource> [--archive-dir=DIR] [--database=NAME] [--arrow]
+    ingestion-cli serve [--port=PORT] [--max-jobs=N] [--max-rss-growth=SIZE]
+    ingestion-cli plan <resource> [<resource> ...] [--start-date=YYYY-MM-DD] [--end-date=YYYY-MM-DD] [--workers=N] [--output=PATH]
 """
 import argparse
+import json
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from dlt import pipeline
+from ingestion.archive import ARCHIVE_DIR_ENV_VAR, RawArchive, get_archive_dir
+from ingestion.checkpoint import (
+    DEFAULT_CHECKPOINT_EVERY,
+    CheckpointStore,
+    checkpoint_id,
+    chunked,
+    unit_key,
+)
+from ingestion.dedup import DEDUP_KEYS, ContentIndex
+from ingestion.memory import MEMORY_BUDGET_ENV_VAR, get_memory_budget, parse_size
+from ingestion.metrics import get_metrics
 from ingestion.motherduck import create_motherduck_destination
+from ingestion.staging import (
+    STAGING_URL_ENV_VAR,
+    create_staging_destination,
+    get_staging_url,
+    list_manifests,
+    load_staged,
+    stage,
+)
+from ingestion.sources.riksdagen.cache import CACHE_DIR_ENV_VAR
+from ingestion.sources.riksdagen.catalogue import CATALOGUE_PATH_ENV_VAR
+from ingestion.sources.riksdagen.planner import PLANNERS, plan
+from ingestion.sources.riksdagen.rebuild import REBUILD_KEYS
+from ingestion.sources.riksdagen.rebuild import create_source as create_rebuild_source
+from ingestion.sources.riksdagen.replay import RECORD_DIR_ENV_VAR, serve_fixtures
+from ingestion.sources.riksdagen.throttle import (
+    INITIAL_RATE_ENV_VAR,
+    MAX_RATE_ENV_VAR,
+    get_rate_limiter,
+)
+from ingestion.sources.riksdagen.transforms import enable_arrow_lineage_columns
 from ingestion.sources.riksdagen.resources import (
     anforandelista,
     dokumentlista,
     personlista,
     voteringlista,
 )
+from ingestion.worker import DEFAULT_MAX_JOBS, DEFAULT_PORT, serve
+
+
+# Source creators for every ingestion resource
+RESOURCES = {
+    "anforandelista": anforandelista.create_source,
+    "dokumentlista": dokumentlista.create_source,
+    "personlista": personlista.create_source,
+    "voteringlista": voteringlista.create_source,
+}
+
+# Resources that can yield normalized Arrow tables instead of dicts
+ARROW_RESOURCES = {"anforandelista", "dokumentlista", "voteringlista"}
+
+# Resources made up of independent work units that can be checkpointed
+GRID_RESOURCES = {
+    "anforandelista": anforandelista,
+    "voteringlista": voteringlista,
+}
+
+# Resources that keep per-partition state (see dokumentlista.create_sharded_resource).
+# Incremental resources must share one pipeline: a pipeline per partition would
+# restart their cursor at its initial value and re-append rows already loaded.
+PARTITIONED_RESOURCES = {"dokumentlista"}
+
+# Keys every checkpointed chunk of a grid resource is merged on
+CHECKPOINT_MERGE_KEYS = {
+    "anforandelista": ["anforande_id"],
+    "voteringlista": ["votering_id", "intressent_id"],
+}
 
 
 def get_database_name() -> str:
@@ -28,67 +101,662 @@ def get_database_name() -> str:
     return os.environ.get("DATABASE_NAME", "spatial_dagster")
 
 
+def partition_suffix(key: str) -> str:
+    """Make a partition key (e.g. 2024-01-31) usable in a pipeline name."""
+    return re.sub(r"[^0-9A-Za-z]+", "_", key).strip("_")
+
+
+def create_pipeline(resource_name: str, database_name: str, suffix: str | None = None):
+    """Create the MotherDuck pipeline for a resource."""
+    pipeline_name = f"raw_riksdagen_{resource_name}"
+    if suffix:
+        pipeline_name = f"{pipeline_name}_{partition_suffix(suffix)}"
+    return pipeline(
+        pipeline_name=pipeline_name,
+        dataset_name="raw_riksdagen",
+        destination=create_motherduck_destination(database_name=database_name),
+        progress="log",
+    )
+
+
+def _run_pipeline(dlt_pipeline, source):
+    """Run a dlt pipeline and record its stage timings in the run metrics."""
+    try:
+        return dlt_pipeline.run(source)
+    finally:
+        get_metrics().record_trace(dlt_pipeline.last_trace)
+
+
+def run_checkpointed(
+    dlt_pipeline,
+    resource_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    max_workers: int = 1,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    resume: bool = False,
+):
+    """
+    Run a grid resource in chunks of work units, checkpointing after each load.
+
+    Each chunk is loaded together with the checkpoint rows for its units, so a
+    restarted run with resume=True only fetches units that were not committed.
+
+    Chunks are separate pipeline runs, so an incremental cursor would carry
+    over from one chunk to the next and drop the rows of older sessions in
+    later chunks. Checkpointed runs therefore fetch the full work-unit grid of
+    the date range without an incremental, and every chunk is merged on the
+    resource's key (CHECKPOINT_MERGE_KEYS): re-fetched rows replace their
+    earlier versions and rows outside the run's units are left alone.
+    """
+    module = GRID_RESOURCES[resource_name]
+    store = CheckpointStore(dlt_pipeline, checkpoint_id(resource_name, start_date, end_date))
+
+    completed = store.load() if resume else set()
+    if not resume:
+        store.clear()
+
+    units = module.get_work_units(incremental=False, start_date=start_date, end_date=end_date)
+    remaining = [unit for unit in units if unit_key(unit) not in completed]
+    print(
+        f"Checkpointed run: {len(units) - len(remaining)}/{len(units)} work units "
+        f"already complete, {len(remaining)} remaining"
+    )
+
+    info = None
+    for chunk in chunked(remaining, checkpoint_every):
+        source = module.create_source(
+            incremental=False,
+            start_date=start_date,
+            end_date=end_date,
+            max_workers=max_workers,
+            work_units=chunk,
+        )
+        source.resources[resource_name].apply_hints(
+            write_disposition="merge",
+            primary_key=CHECKPOINT_MERGE_KEYS[resource_name],
+        )
+        source.resources.add(store.resource(chunk))
+
+        info = _run_pipeline(dlt_pipeline, source)
+        completed.update(unit_key(unit) for unit in chunk)
+        print(f"Checkpoint: {len(completed)}/{len(units)} work units complete")
+
+    # The backfill is done; the next run over this range starts from scratch
+    store.clear()
+    return info
+
+
+def create_resource_source(
+    resource_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    max_workers: int = 1,
+    stream: bool = False,
+    delta: bool = False,
+    arrow: bool = False,
+    partition: str | None = None,
+    full_refresh: bool = False,
+):
+    """Create the dlt source for a resource with the options it supports."""
+    create_source_fn = RESOURCES[resource_name]
+    arrow = arrow and resource_name in ARROW_RESOURCES
+    if arrow:
+        enable_arrow_lineage_columns()
+    if delta:
+        return create_source_fn(
+            start_date=start_date,
+            end_date=end_date,
+            max_workers=max_workers,
+            delta=True,
+            arrow=arrow,
+        )
+    if full_refresh:
+        return create_source_fn(
+            incremental=False,
+            start_date=start_date,
+            end_date=end_date,
+            max_workers=max_workers,
+            stream=stream,
+            arrow=arrow,
+        )
+    if resource_name in GRID_RESOURCES:
+        return create_source_fn(
+            start_date=start_date,
+            end_date=end_date,
+            max_workers=max_workers,
+            stream=stream,
+            arrow=arrow,
+        )
+    if resource_name == "dokumentlista":
+        return create_source_fn(
+            start_date=start_date,
+            end_date=end_date,
+            max_workers=max_workers,
+            arrow=arrow,
+            partition=partition,
+        )
+    return create_source_fn()
+
+
+def run_resources(
+    resource_names: list[str],
+    start_date: str | None = None,
+    end_date: str | None = None,
+    database_name: str | None = None,
+    max_workers: int = 1,
+    stream: bool = False,
+    delta: bool = False,
+    arrow: bool = False,
+    full_refresh: bool = False,
+):
+    """
+    Run ingestion for several resources in one process.
+
+    Every resource runs in its own pipeline, the same one a single-resource
+    run uses (raw_riksdagen_<resource>), so incremental and delta state is
+    shared with `run` and switching between `run` and `run-all` never
+    re-appends rows that are already loaded. The pipelines run
+    concurrently on a thread pool and share the process-wide Riksdagen
+    session and rate limiter.
+    """
+    database_name = database_name or get_database_name()
+    
+    unknown = [name for name in resource_names if name not in RESOURCES]
+    if unknown:
+        raise ValueError(f"Unknown resources: {unknown}. Available: {list(RESOURCES.keys())}")
+    if delta and "voteringlista" not in resource_names:
+        raise ValueError("Delta mode is only supported for: ['voteringlista']")
+    if full_refresh and "voteringlista" not in resource_names:
+        raise ValueError("Full refresh is only supported for: ['voteringlista']")
+    if delta and full_refresh:
+        raise ValueError("--delta and --full-refresh are mutually exclusive")
+    
+    def run_one(resource_name: str):
+        source = create_resource_source(
+            resource_name,
+            start_date=start_date,
+            end_date=end_date,
+            max_workers=max_workers,
+            stream=stream,
+            delta=delta and resource_name == "voteringlista",
+            arrow=arrow,
+            full_refresh=full_refresh and resource_name == "voteringlista",
+        )
+        return _run_pipeline(create_pipeline(resource_name, database_name), source)
+    
+    infos = {}
+    failed = []
+    with ThreadPoolExecutor(max_workers=len(resource_names), thread_name_prefix="pipeline") as executor:
+        futures = {executor.submit(run_one, name): name for name in resource_names}
+        for future in as_completed(futures):
+            resource_name = futures[future]
+            try:
+                infos[resource_name] = future.result()
+            except Exception as e:
+                failed.append(resource_name)
+                print(f"Pipeline {resource_name} failed: {e}", file=sys.stderr)
+                continue
+            print(f"Pipeline {resource_name} completed: {infos[resource_name]}")
+    
+    if failed:
+        raise RuntimeError(f"Ingestion failed for: {sorted(failed)}")
+    return infos
+
+
 def run_resource(
     resource_name: str,
     start_date: str | None = None,
     end_date: str | None = None,
     database_name: str | None = None,
+    max_workers: int = 1,
+    stream: bool = False,
+    checkpoint_every: int | None = None,
+    resume: bool = False,
+    delta: bool = False,
+    staging_url: str | None = None,
+    stage_only: bool = False,
+    arrow: bool = False,
+    partition: str | None = None,
+    dedup: bool = False,
+    full_refresh: bool = False,
 ):
-    """Run ingestion for a specific resource."""
+    """
+    Run ingestion for a specific resource.
+
+    A `partition` key gives the run its own pipeline (and so its own dlt
+    state), so partitions of the same resource can run concurrently. With
+    `dedup`, rows whose content hash is already in the destination are
+    skipped (see ingestion.dedup).
+    """
     database_name = database_name or get_database_name()
     
-    # Map resource names to source creators
-    resource_map = {
-        "anforandelista": anforandelista.create_source,
-        "dokumentlista": dokumentlista.create_source,
-        "personlista": personlista.create_source,
-        "voteringlista": voteringlista.create_source,
-    }
+    if arrow and resource_name not in ARROW_RESOURCES:
+        raise ValueError(f"Arrow mode is only supported for: {sorted(ARROW_RESOURCES)}")
     
-    if resource_name not in resource_map:
-        raise ValueError(f"Unknown resource: {resource_name}. Available: {list(resource_map.keys())}")
+    if staging_url and (checkpoint_every or resume):
+        raise ValueError("Staged loads cannot be combined with checkpointing")
     
-    # Create source
-    create_source_fn = resource_map[resource_name]
-    if resource_name in ["anforandelista", "dokumentlista", "voteringlista"]:
-        source = create_source_fn(start_date=start_date, end_date=end_date)
-    else:
-        source = create_source_fn()
+    if delta and resource_name != "voteringlista":
+        raise ValueError("Delta mode is only supported for: ['voteringlista']")
+    if delta and (checkpoint_every or resume):
+        raise ValueError("Delta mode cannot be combined with checkpointing")
+    
+    if full_refresh and resource_name != "voteringlista":
+        raise ValueError("Full refresh is only supported for: ['voteringlista']")
+    if full_refresh and delta:
+        raise ValueError("--delta and --full-refresh are mutually exclusive")
+    
+    if (checkpoint_every or resume) and resource_name not in GRID_RESOURCES:
+        raise ValueError(
+            f"Checkpointing is only supported for: {list(GRID_RESOURCES.keys())}"
+        )
+    
+    if resource_name not in RESOURCES:
+        raise ValueError(f"Unknown resource: {resource_name}. Available: {list(RESOURCES.keys())}")
+    
+    if dedup and resource_name not in DEDUP_KEYS:
+        raise ValueError(f"Dedup is only supported for: {sorted(DEDUP_KEYS)}")
+    if dedup and (staging_url or checkpoint_every or resume):
+        raise ValueError("Dedup cannot be combined with staging or checkpointing")
+    
+    if partition and resource_name not in PARTITIONED_RESOURCES:
+        raise ValueError(f"Partitions are only supported for: {sorted(PARTITIONED_RESOURCES)}")
+    if partition and not (start_date and end_date):
+        raise ValueError("--partition requires --start-date and --end-date")
     
     # Create pipeline
-    dlt_pipeline = pipeline(
-        pipeline_name=f"raw_riksdagen_{resource_name}",
-        dataset_name="raw_riksdagen",
-        destination=create_motherduck_destination(database_name=database_name),
-        progress="log",
+    if staging_url:
+        staging_name = f"raw_riksdagen_{resource_name}_staging"
+        if partition:
+            staging_name = f"{staging_name}_{partition_suffix(partition)}"
+        dlt_pipeline = pipeline(
+            pipeline_name=staging_name,
+            dataset_name="raw_riksdagen",
+            destination=create_staging_destination(staging_url),
+            progress="log",
+        )
+    else:
+        dlt_pipeline = create_pipeline(resource_name, database_name, suffix=partition)
+    
+    if checkpoint_every or resume:
+        info = run_checkpointed(
+            dlt_pipeline,
+            resource_name,
+            start_date=start_date,
+            end_date=end_date,
+            max_workers=max_workers,
+            checkpoint_every=checkpoint_every or DEFAULT_CHECKPOINT_EVERY,
+            resume=resume,
+        )
+        print(f"Pipeline completed: {info}")
+        return info
+    
+    # Create source
+    source = create_resource_source(
+        resource_name,
+        start_date=start_date,
+        end_date=end_date,
+        max_workers=max_workers,
+        stream=stream,
+        delta=delta,
+        arrow=arrow,
+        partition=partition,
+        full_refresh=full_refresh,
     )
+    content_index = None
+    if dedup:
+        content_index = ContentIndex(dlt_pipeline, resource_name).load()
+        source = content_index.apply(source)
+    
+    if staging_url:
+        try:
+            manifest = stage(dlt_pipeline, source, resource_name, staging_url)
+        finally:
+            get_metrics().record_trace(dlt_pipeline.last_trace)
+        if manifest is None or stage_only:
+            return None
+        return run_staged_load(resource_name, [manifest], database_name)
     
     # Run pipeline
-    info = dlt_pipeline.run(source)
+    info = _run_pipeline(dlt_pipeline, source)
+    print(f"Pipeline completed: {info}")
+    if content_index:
+        print(content_index.summary())
+    return info
+
+
+def run_staged_load(resource_name: str, manifests: list, database_name: str | None = None):
+    """Bulk-load staged Parquet files of a resource into MotherDuck."""
+    dlt_pipeline = create_pipeline(
+        resource_name, database_name or get_database_name(), suffix="staged"
+    )
+    try:
+        info = load_staged(dlt_pipeline, manifests)
+    finally:
+        get_metrics().record_trace(dlt_pipeline.last_trace)
+    print(f"Pipeline completed: {info}")
+    return info
+
+
+def replay_staged(
+    resource_name: str,
+    staging_url: str,
+    database_name: str | None = None,
+    load_id: str | None = None,
+):
+    """Reload a staged resource into MotherDuck without calling the API."""
+    manifests = list_manifests(staging_url, resource_name)
+    if load_id:
+        manifests = [manifest for manifest in manifests if load_id in manifest["load_ids"]]
+    if not manifests:
+        raise ValueError(f"No staged loads found for {resource_name} in {staging_url}")
+    return run_staged_load(resource_name, manifests, database_name)
+
+
+def rebuild_resource(
+    resource_name: str,
+    archive_dir: str,
+    database_name: str | None = None,
+    arrow: bool = False,
+):
+    """Replace a resource's raw table with the rows re-derived from the response archive."""
+    if arrow and resource_name not in ARROW_RESOURCES:
+        raise ValueError(f"Arrow mode is only supported for: {sorted(ARROW_RESOURCES)}")
+    if arrow:
+        enable_arrow_lineage_columns()
+    source = create_rebuild_source(resource_name, RawArchive(archive_dir), arrow=arrow)
+    dlt_pipeline = create_pipeline(resource_name, database_name or get_database_name(), suffix="rebuild")
+    info = _run_pipeline(dlt_pipeline, source)
     print(f"Pipeline completed: {info}")
     return info
 
 
-def main():
+def plan_resources(
+    resource_names: list[str],
+    start_date: str | None = None,
+    end_date: str | None = None,
+    max_workers: int = 1,
+    output: str | None = None,
+):
+    """Estimate rows, pages, requests and bytes per work unit without fetching any data."""
+    plans = [
+        plan(resource_name, start_date=start_date, end_date=end_date, max_workers=max_workers)
+        for resource_name in resource_names
+    ]
+    document = json.dumps({"plans": plans}, indent=2, ensure_ascii=False)
+    if output:
+        Path(output).write_text(document)
+        for resource_plan in plans:
+            totals = resource_plan["totals"]
+            print(
+                f"{resource_plan['resource']}: {totals['work_units']} work units, "
+                f"~{totals['rows']} rows, ~{totals['requests']} requests, "
+                f"~{totals['bytes'] / 2**20:.0f} MiB"
+            )
+    else:
+        print(document)
+    return plans
+
+
+def use_fixtures(stack: ExitStack, record_to: str | None = None, replay_from: str | None = None):
+    """
+    Record API responses as fixtures, or replay them from a local server.
+
+    The session/valkrets catalogue is kept next to the fixtures, so a replay
+    iterates over exactly the work units that were recorded. Replays are not
+    rate-limited unless --max-rps is given.
+    """
+    fixture_dir = record_to or replay_from
+    if not fixture_dir:
+        return
+    os.environ.setdefault(CATALOGUE_PATH_ENV_VAR, str(Path(fixture_dir) / "catalogue.json"))
+    if record_to:
+        os.environ[RECORD_DIR_ENV_VAR] = record_to
+    else:
+        os.environ.setdefault(MAX_RATE_ENV_VAR, "10000")
+        os.environ.setdefault(INITIAL_RATE_ENV_VAR, os.environ[MAX_RATE_ENV_VAR])
+        base_url = stack.enter_context(serve_fixtures(replay_from))
+        print(f"Replaying recorded responses from {replay_from} via {base_url}")
+
+
+def print_request_stats():
+    """Print how the shared rate limiter treated this run's requests."""
+    stats = get_rate_limiter().stats
+    print(
+        f"Requests: {stats.requests} sent, {stats.throttled} throttled "
+        f"({stats.throttled_seconds:.1f}s waiting), {stats.retried} retried, "
+        f"{stats.retries_exhausted} over retry budget, "
+        f"final rate {stats.current_rate:.2f} req/s"
+    )
+
+
+def use_memory_budget(memory_budget: str | None = None):
+    """
+    Cap the memory of a run's extraction (see ingestion.memory).
+
+    The budget bounds the pages held by fan-out workers, and sizes dlt's
+    extract and normalize row buffers unless they are configured explicitly.
+    """
+    if memory_budget:
+        parse_size(memory_budget)  # Fail on a malformed size before the run starts
+        os.environ[MEMORY_BUDGET_ENV_VAR] = memory_budget
+    budget = get_memory_budget()
+    if budget:
+        os.environ.setdefault("DATA_WRITER__BUFFER_MAX_ITEMS", str(budget.buffer_max_items()))
+
+
+def print_memory_report():
+    """Print peak memory use against the memory budget, if one is set."""
+    budget = get_memory_budget()
+    if not budget:
+        return
+    stats = budget.as_dict()
+    peak_rss = get_metrics().summary()["peak_rss_bytes"]
+    print(
+        f"Memory budget {stats['limit_bytes'] / 2**20:.0f} MiB: peak RSS {peak_rss / 2**20:.0f} MiB "
+        f"({peak_rss / stats['limit_bytes']:.0%}), peak held pages "
+        f"{stats['peak_held_bytes'] / 2**20:.0f} of {stats['page_limit_bytes'] / 2**20:.0f} MiB, "
+        f"{stats['spilled_pages']} of {stats['pages']} pages spilled "
+        f"({stats['spilled_bytes'] / 2**20:.0f} MiB)"
+    )
+    if peak_rss > stats["limit_bytes"]:
+        print("Warning: peak RSS exceeded the memory budget", file=sys.stderr)
+
+
+def write_metrics(metrics_file: str | None = None, prometheus_file: str | None = None):
+    """Write the run metrics as JSON and/or Prometheus text."""
+    metrics = get_metrics()
+    if metrics_file:
+        budget = get_memory_budget()
+        metrics.write_json(
+            metrics_file,
+            throttle=get_rate_limiter().stats.as_dict(),
+            memory_budget=budget.as_dict() if budget else None,
+        )
+    if prometheus_file:
+        metrics.write_prometheus(prometheus_file)
+
+    summary = metrics.summary()
+    stages = ", ".join(f"{stage} {seconds:.1f}s" for stage, seconds in summary["stages"].items())
+    print(f"Stages: {stages or 'n/a'}; peak RSS {summary['peak_rss_bytes'] / 2**20:.0f} MiB")
+
+
+def _add_run_arguments(run_parser):
+    """Add the options shared by run and run-all."""
+    run_parser.add_argument("--start-date", help="Start date (YYYY-MM-DD) for backfill")
+    run_parser.add_argument("--end-date", help="End date (YYYY-MM-DD) for backfill")
+    run_parser.add_argument("--database", help="Database name (default: from DATABASE_NAME env or 'spatial_dagster')")
+    run_parser.add_argument("--workers", type=int, default=1, help="Concurrent work units for grid resources and dokumentlista date windows (default: 1 = serial)")
+    run_parser.add_argument("--stream", action="store_true", help="Decode API pages incrementally and hand rows to dlt as they arrive (grid resources)")
+    run_parser.add_argument("--checkpoint-every", type=int, help=f"Load grid resources in chunks of N work units and checkpoint progress after each (default with --resume: {DEFAULT_CHECKPOINT_EVERY})")
+    run_parser.add_argument("--resume", action="store_true", help="Continue a checkpointed backfill from its last committed work unit")
+    run_parser.add_argument("--arrow", action="store_true", help="Yield pages as normalized Arrow tables instead of dicts, skipping dlt's per-row normalization (not personlista)")
+    run_parser.add_argument("--delta", action="store_true", help="Only fetch voteringar that are new or changed since the last load (voteringlista)")
+    run_parser.add_argument("--full-refresh", action="store_true", help="Fetch every Riksmöte × Valkrets cell in the date range and replace the table, instead of the latest Riksmöte filtered by systemdatum (voteringlista)")
+    run_parser.add_argument("--cache-dir", help=f"On-disk HTTP response cache directory (default: from {CACHE_DIR_ENV_VAR} env, disabled if unset)")
+    run_parser.add_argument("--metrics-file", help="Write a JSON summary of request latency, pages, dlt stage timings and peak RSS")
+    run_parser.add_argument("--prometheus-file", help="Write the run metrics in Prometheus text format (e.g. for the node_exporter textfile collector)")
+    run_parser.add_argument("--metrics-port", type=int, help="Serve the run metrics in Prometheus format on this port while the run is in progress")
+    run_parser.add_argument("--stage-to", help=f"Stage the load as Parquet under this local path or bucket URL, then bulk-load into MotherDuck (default: from {STAGING_URL_ENV_VAR} env, disabled if unset)")
+    run_parser.add_argument("--stage-only", action="store_true", help="Only stage Parquet files; load them later with load-staged")
+    run_parser.add_argument("--dedup", action="store_true", help=f"Skip rows whose content hash is already loaded and record changed keys ({', '.join(sorted(DEDUP_KEYS))})")
+    run_parser.add_argument("--partition", help="Partition key of the date range (e.g. a Dagster partition, dokumentlista only); the run gets its own pipeline state and skips partitions that are already loaded")
+    run_parser.add_argument("--archive-to", help=f"Append every API response to the zstd raw archive in this directory, for later rebuilds (default: from {ARCHIVE_DIR_ENV_VAR} env, disabled if unset)")
+    run_parser.add_argument("--memory-budget", help=f"Memory budget for the run, e.g. 1.5g: caps fetched pages in flight and dlt's row buffers, spilling pages to local disk beyond it (default: from {MEMORY_BUDGET_ENV_VAR} env, unbounded if unset)")
+    run_parser.add_argument("--max-rps", type=float, help=f"Upper bound for the adaptive request rate to data.riksdagen.se (default: from {MAX_RATE_ENV_VAR} env or 20)")
+    fixtures = run_parser.add_mutually_exclusive_group()
+    fixtures.add_argument("--record-to", help="Record every API response as a fixture in this directory")
+    fixtures.add_argument("--replay-from", help="Serve API responses from recorded fixtures on a local server instead of calling data.riksdagen.se")
+
+
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="Ingestion CLI for DLT-based data ingestion")
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
     
     # Run command
-    run_parser = subparsers.add_parser("run", help="Run ingestion for a resource")
-    run_parser.add_argument("resource", choices=["anforandelista", "dokumentlista", "personlista", "voteringlista"])
-    run_parser.add_argument("--start-date", help="Start date (YYYY-MM-DD) for backfill")
-    run_parser.add_argument("--end-date", help="End date (YYYY-MM-DD) for backfill")
-    run_parser.add_argument("--database", help="Database name (default: from DATABASE_NAME env or 'spatial_dagster')")
+    run_parser = subparsers.add_parser("run", help="Run ingestion for one or more resources")
+    run_parser.add_argument("resource", nargs="+", choices=list(RESOURCES.keys()))
+    _add_run_arguments(run_parser)
+    
+    # Run-all command
+    run_all_parser = subparsers.add_parser("run-all", help="Run ingestion for all resources concurrently in one process")
+    _add_run_arguments(run_all_parser)
+    
+    # Load-staged command
+    load_staged_parser = subparsers.add_parser("load-staged", help="Bulk-load staged Parquet files into MotherDuck without calling the API")
+    load_staged_parser.add_argument("resource", choices=list(RESOURCES.keys()))
+    load_staged_parser.add_argument("--staging-url", help=f"Staging location (default: from {STAGING_URL_ENV_VAR} env)")
+    load_staged_parser.add_argument("--load-id", help="Only reload the staged load with this id (default: all staged loads, oldest first)")
+    load_staged_parser.add_argument("--database", help="Database name (default: from DATABASE_NAME env or 'spatial_dagster')")
     
-    args = parser.parse_args()
+    # Rebuild command
+    rebuild_parser = subparsers.add_parser("rebuild", help="Re-derive a raw table from the response archive without calling the API")
+    rebuild_parser.add_argument("resource", choices=list(REBUILD_KEYS.keys()))
+    rebuild_parser.add_argument("--archive-dir", help=f"Archive directory (default: from {ARCHIVE_DIR_ENV_VAR} env)")
+    rebuild_parser.add_argument("--database", help="Database name (default: from DATABASE_NAME env or 'spatial_dagster')")
+    rebuild_parser.add_argument("--arrow", action="store_true", help="Decode archived pages into normalized Arrow tables (not personlista)")
     
-    if args.command == "run":
+    # Plan command
+    plan_parser = subparsers.add_parser("plan", help="Estimate the cost of each work unit with cheap count probes, as JSON")
+    plan_parser.add_argument("resource", nargs="+", choices=list(PLANNERS.keys()))
+    plan_parser.add_argument("--start-date", help="Start date (YYYY-MM-DD) of the planned backfill")
+    plan_parser.add_argument("--end-date", help="End date (YYYY-MM-DD) of the planned backfill")
+    plan_parser.add_argument("--workers", type=int, default=1, help="Concurrent probe requests (default: 1)")
+    plan_parser.add_argument("--output", help="Write the plan to this file instead of stdout")
+    
+    # Serve command
+    serve_parser = subparsers.add_parser("serve", help="Run as a warm worker accepting CLI jobs over HTTP (see ingestion.worker)")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    serve_parser.add_argument("--max-jobs", type=int, default=DEFAULT_MAX_JOBS, help=f"Retire after this many jobs (default: {DEFAULT_MAX_JOBS})")
+    serve_parser.add_argument("--max-rss-growth", default="512m", help="Retire once a job's peak RSS exceeded the warm process's by this much (default: 512m)")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command in ("run", "run-all"):
+        resource_names = list(RESOURCES.keys()) if args.command == "run-all" else list(dict.fromkeys(args.resource))
+        if args.cache_dir:
+            # Picked up by every session created through riksdagen.client
+            os.environ[CACHE_DIR_ENV_VAR] = args.cache_dir
+        if args.archive_to:
+            # Picked up by every session created through riksdagen.client
+            os.environ[ARCHIVE_DIR_ENV_VAR] = args.archive_to
+        if args.max_rps:
+            os.environ[MAX_RATE_ENV_VAR] = str(args.max_rps)
+        if args.metrics_port:
+            get_metrics().serve_prometheus(args.metrics_port)
+        with ExitStack() as stack:
+            try:
+                use_memory_budget(args.memory_budget)
+                use_fixtures(stack, record_to=args.record_to, replay_from=args.replay_from)
+                if len(resource_names) > 1:
+                    if args.checkpoint_every or args.resume or args.stage_to or args.stage_only or args.partition or args.dedup:
+                        raise ValueError("Checkpointing, staging, partitions and dedup are only supported for single-resource runs")
+                    run_resources(
+                        resource_names,
+                        start_date=args.start_date,
+                        end_date=args.end_date,
+                        database_name=args.database,
+                        max_workers=args.workers,
+                        stream=args.stream,
+                        delta=args.delta,
+                        arrow=args.arrow,
+                        full_refresh=args.full_refresh,
+                    )
+                else:
+                    run_resource(
+                        resource_name=resource_names[0],
+                        start_date=args.start_date,
+                        end_date=args.end_date,
+                        database_name=args.database,
+                        max_workers=args.workers,
+                        stream=args.stream,
+                        checkpoint_every=args.checkpoint_every,
+                        resume=args.resume,
+                        delta=args.delta,
+                        staging_url=args.stage_to or get_staging_url(),
+                        stage_only=args.stage_only,
+                        arrow=args.arrow,
+                        partition=args.partition,
+                        dedup=args.dedup,
+                        full_refresh=args.full_refresh,
+                    )
+                sys.exit(0)
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+            finally:
+                print_request_stats()
+                print_memory_report()
+                write_metrics(args.metrics_file, args.prometheus_file)
+    elif args.command == "load-staged":
+        staging_url = args.staging_url or get_staging_url()
+        if not staging_url:
+            print(f"Error: --staging-url or {STAGING_URL_ENV_VAR} is required", file=sys.stderr)
+            sys.exit(1)
         try:
-            run_resource(
+            replay_staged(
                 resource_name=args.resource,
+                staging_url=staging_url,
+                database_name=args.database,
+                load_id=args.load_id,
+            )
+            sys.exit(0)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+    elif args.command == "rebuild":
+        archive_dir = args.archive_dir or get_archive_dir()
+        if not archive_dir:
+            print(f"Error: --archive-dir or {ARCHIVE_DIR_ENV_VAR} is required", file=sys.stderr)
+            sys.exit(1)
+        try:
+            rebuild_resource(
+                resource_name=args.resource,
+                archive_dir=archive_dir,
+                database_name=args.database,
+                arrow=args.arrow,
+            )
+            sys.exit(0)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+    elif args.command == "serve":
+        serve(
+            main,
+            port=args.port,
+            max_jobs=args.max_jobs,
+            max_rss_growth=parse_size(args.max_rss_growth),
+        )
+        sys.exit(0)
+    elif args.command == "plan":
+        try:
+            plan_resources(
+                list(dict.fromkeys(args.resource)),
                 start_date=args.start_date,
                 end_date=args.end_date,
-                database_name=args.database,
+                max_workers=args.workers,
+                output=args.output,
             )
             sys.exit(0)
         except Exception as e:
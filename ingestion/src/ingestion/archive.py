@@ -0,0 +1,176 @@
+"""
+Append-only archive of raw API responses, compressed with zstd.
+
+Without a raw copy of the responses, any change to a data selector, table
+nesting or normalization means crawling the API again. With an archive
+directory configured, every page a run fetches is appended to it:
+
+    <archive_dir>/<resource>/<partition>/<run_id>.zst    one zstd frame per page
+    <archive_dir>/_index/<run_id>.jsonl                   one line per page
+
+The resource is the API endpoint (e.g. voteringlista) and the partition is the
+page's Riksmöte (rm=2023/24 -> 2023-24), the month its date range starts in,
+or `all`. Every page is compressed as its own frame, so a segment can only
+grow and a crashed run leaves no half-written frames behind an index line. The
+index records the URL, segment, offset and length of each frame, so pages can
+be read back without decompressing whole segments. Each process writes its own
+segments and index file, so concurrent runs can share an archive directory.
+
+Archiving reads every response body into memory before it is decoded, so it
+gives up the streaming decoder's memory savings for the archived run.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+import zstandard
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+ARCHIVE_DIR_ENV_VAR = "INGESTION_ARCHIVE_DIR"
+INDEX_DIR = "_index"
+COMPRESSION_LEVEL = 10  # JSON pages compress ~15x; higher levels cost CPU for little gain
+
+
+def get_archive_dir() -> Optional[str]:
+    """Get the archive directory from env, or None when archiving is disabled."""
+    return os.environ.get(ARCHIVE_DIR_ENV_VAR) or None
+
+
+def page_location(url: str) -> tuple[str, str]:
+    """Get the (resource, partition) a page is archived under."""
+    parts = urlsplit(url)
+    resource = parts.path.strip("/").split("/", 1)[0] or "root"
+    params = dict(parse_qsl(parts.query))
+    if params.get("rm"):
+        partition = params["rm"].replace("/", "-")
+    elif params.get("from"):
+        partition = params["from"][:7]
+    else:
+        partition = "all"
+    return resource, partition
+
+
+class RawArchive:
+    """Writer and reader for one archive directory."""
+
+    def __init__(self, directory: str | os.PathLike, level: int = COMPRESSION_LEVEL):
+        self.directory = Path(directory)
+        self.level = level
+        self.run_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{os.getpid()}"
+        self._lock = threading.Lock()
+        self._segments: Dict[Path, Any] = {}
+        self._index = None
+        self._compressor = threading.local()
+
+    def _compress(self, body: bytes) -> bytes:
+        # ZstdCompressor instances are not thread-safe
+        compressor = getattr(self._compressor, "instance", None)
+        if compressor is None:
+            compressor = self._compressor.instance = zstandard.ZstdCompressor(level=self.level)
+        return compressor.compress(body)
+
+    def append(self, url: str, body: bytes) -> None:
+        """Append one page and its index entry."""
+        frame = self._compress(body)
+        resource, partition = page_location(url)
+        segment = self.directory / resource / partition / f"{self.run_id}.zst"
+
+        with self._lock:
+            file = self._segments.get(segment)
+            if file is None:
+                segment.parent.mkdir(parents=True, exist_ok=True)
+                file = self._segments[segment] = open(segment, "ab")
+            offset = file.tell()
+            file.write(frame)
+            file.flush()
+
+            if self._index is None:
+                index_path = self.directory / INDEX_DIR / f"{self.run_id}.jsonl"
+                index_path.parent.mkdir(parents=True, exist_ok=True)
+                self._index = open(index_path, "a")
+            entry = {
+                "url": url,
+                "resource": resource,
+                "partition": partition,
+                "segment": str(segment.relative_to(self.directory)),
+                "offset": offset,
+                "length": len(frame),
+                "size": len(body),
+                "fetched_at": time.time(),
+            }
+            self._index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._index.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            for file in self._segments.values():
+                file.close()
+            self._segments.clear()
+            if self._index is not None:
+                self._index.close()
+                self._index = None
+
+    def entries(self, resource: str | None = None) -> List[Dict[str, Any]]:
+        """Load the index entries of all runs, optionally for one resource."""
+        entries = []
+        for index_path in sorted((self.directory / INDEX_DIR).glob("*.jsonl")):
+            with open(index_path) as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if resource is None or entry["resource"] == resource:
+                        entries.append(entry)
+        return entries
+
+    def read(self, entry: Dict[str, Any]) -> bytes:
+        """Read and decompress the page of an index entry."""
+        with open(self.directory / entry["segment"], "rb") as file:
+            file.seek(entry["offset"])
+            frame = file.read(entry["length"])
+        return zstandard.ZstdDecompressor().decompress(frame)
+
+    def iter_pages(self, entries: List[Dict[str, Any]]) -> Iterator[tuple[Dict[str, Any], bytes]]:
+        for entry in entries:
+            yield entry, self.read(entry)
+
+
+class ArchivingAdapter(BaseAdapter):
+    """requests transport adapter appending every 200 GET response to a RawArchive."""
+
+    def __init__(self, archive: RawArchive, delegate: Optional[BaseAdapter] = None):
+        super().__init__()
+        self.archive = archive
+        self.delegate = delegate or HTTPAdapter()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        response = self.delegate.send(request, **kwargs)
+        if request.method == "GET" and response.status_code == 200:
+            # Reads the body; streaming callers fall back to the buffered content
+            self.archive.append(request.url, response.content)
+        return response
+
+    def close(self) -> None:
+        self.delegate.close()
+
+
+_archives: Dict[str, RawArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(directory: str) -> RawArchive:
+    """Get the process-wide writer for an archive directory."""
+    with _archives_lock:
+        archive = _archives.get(directory)
+        if archive is None:
+            archive = _archives[directory] = RawArchive(directory)
+            atexit.register(archive.close)
+        return archive
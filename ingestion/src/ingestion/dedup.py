@@ -0,0 +1,207 @@
+"""
+Content-hash deduplication for re-ingested rows.
+
+Re-running a backfill over data that has not changed upstream rewrites every
+row. With dedup enabled, each extracted row gets a short content fingerprint in
+the `_content_hash` column. The fingerprints already in the destination are
+read once per run as a compact key → hash index, and rows whose hash matches
+are dropped before normalization. Only new or changed rows are written, merged
+on the resource's key, so a backfill no longer needs the `replace` disposition.
+
+Rows are hashed as the API returned them, before any cleanup: dict rows ahead
+of the resource's own maps (e.g. normalize_publicerad) and Arrow pages before
+normalize_table. The canonical form is the same in both paths (flattened
+fields, sorted by name, values as text, nulls left out), so switching between
+the dict and the Arrow path does not mark every row as changed.
+
+The keys of the rows that were written, and whether each was new or changed,
+go to the `ingestion_changed_keys` table with the same load id, so downstream
+models can process just the changed set.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import dlt
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .sources.riksdagen.transforms import flatten_record
+
+CONTENT_HASH_COLUMN = "_content_hash"
+CHANGED_KEYS_TABLE = "ingestion_changed_keys"
+HASH_LENGTH = 16  # Hex digits; 64 bits is plenty to detect changes per key
+FIELD_SEPARATOR = "\x1f"
+RECORD_SEPARATOR = "\x1e"
+
+# Key identifying a row of each resource that supports dedup
+DEDUP_KEYS = {
+    "anforandelista": "anforande_id",
+    "dokumentlista": "id",
+}
+
+
+def _is_content(name: str) -> bool:
+    """Whether a column is record content rather than dlt or dedup bookkeeping."""
+    return name != CONTENT_HASH_COLUMN and not name.startswith("_dlt")
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+
+def content_hash(row: Dict[str, Any]) -> str:
+    """Fingerprint a raw record's content in its canonical form."""
+    fields = sorted(
+        (name, value if isinstance(value, str) else json.dumps(value, ensure_ascii=False))
+        for name, value in flatten_record(row).items()
+        if value is not None and _is_content(name)
+    )
+    return _digest(RECORD_SEPARATOR.join(f"{name}{FIELD_SEPARATOR}{value}" for name, value in fields))
+
+
+def table_content_hashes(table: pa.Table) -> pa.Array:
+    """Fingerprint every row of a raw Arrow page, matching content_hash of its record."""
+    fields = [
+        pc.binary_join_element_wise(
+            pa.scalar(name), pc.cast(table.column(name), pa.string()), FIELD_SEPARATOR
+        )
+        for name in sorted(filter(_is_content, table.column_names))
+    ]
+    if not fields:
+        return pa.array([_digest("")] * table.num_rows, pa.string())
+    # Null fields are skipped, like missing keys of a dict record
+    text = pc.binary_join_element_wise(*fields, RECORD_SEPARATOR, null_handling="skip")
+    return pa.array([_digest(value) for value in text.to_pylist()], pa.string())
+
+
+def stamp_table(table: pa.Table) -> pa.Table:
+    """Add the content hash column to an Arrow page."""
+    if CONTENT_HASH_COLUMN in table.column_names:
+        table = table.drop_columns([CONTENT_HASH_COLUMN])
+    return table.append_column(CONTENT_HASH_COLUMN, table_content_hashes(table))
+
+
+_hash_arrow_pages = False
+
+
+def enable_content_hashes() -> None:
+    """Make to_arrow_pages stamp Arrow pages with their hash before normalizing them."""
+    global _hash_arrow_pages
+    _hash_arrow_pages = True
+
+
+def content_hashes_enabled() -> bool:
+    return _hash_arrow_pages
+
+
+class ContentIndex:
+    """Hashes of the rows of one resource already in the destination."""
+
+    def __init__(self, pipeline: dlt.Pipeline, resource_name: str):
+        self.pipeline = pipeline
+        self.resource_name = resource_name
+        self.key = DEDUP_KEYS[resource_name]
+        self.hashes: Dict[str, str] = {}
+        self.changes: Dict[str, str] = {}
+        self.unchanged = 0
+
+    def load(self) -> "ContentIndex":
+        """Read the key → hash index from the destination table."""
+        try:
+            with self.pipeline.sql_client() as client:
+                table = client.make_qualified_table_name(self.resource_name)
+                rows = client.execute_sql(
+                    f"SELECT {self.key}, {CONTENT_HASH_COLUMN} FROM {table} "
+                    f"WHERE {CONTENT_HASH_COLUMN} IS NOT NULL"
+                ) or []
+        except Exception:
+            # First deduplicated load: the table or the column does not exist yet
+            rows = []
+        self.hashes = {str(key): value for key, value in rows}
+        return self
+
+    def _observe(self, key: Any, digest: str) -> bool:
+        """Record a row's hash; True when the row is new or changed."""
+        key = str(key)
+        previous = self.hashes.get(key)
+        if previous == digest:
+            self.unchanged += 1
+            return False
+        self.changes[key] = "changed" if previous else "new"
+        self.hashes[key] = digest
+        return True
+
+    def stamp_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Stamp a raw dict row with its hash, before the resource cleans it up."""
+        row[CONTENT_HASH_COLUMN] = content_hash(row)
+        return row
+
+    def keep_row(self, row: Dict[str, Any]) -> bool:
+        """Filter for dict rows: keep only new or changed rows."""
+        digest = row.get(CONTENT_HASH_COLUMN) or self.stamp_row(row)[CONTENT_HASH_COLUMN]
+        return self._observe(row.get(self.key), digest)
+
+    def filter_table(self, table: pa.Table) -> pa.Table:
+        """Keep only the new or changed rows of an Arrow page, with their hashes."""
+        if CONTENT_HASH_COLUMN not in table.column_names:
+            # Not stamped by to_arrow_pages, so this hashes the page as it is
+            table = stamp_table(table)
+        digests = table.column(CONTENT_HASH_COLUMN).to_pylist()
+        keys = table.column(self.key).to_pylist()
+        mask = [self._observe(key, digest) for key, digest in zip(keys, digests)]
+        return table.filter(pa.array(mask, pa.bool_()))
+
+    def _changed_rows(self, items) -> List[Dict[str, Any]]:
+        if isinstance(items, pa.Table):
+            keys = items.column(self.key).to_pylist()
+        else:
+            keys = [row.get(self.key) for row in (items if isinstance(items, list) else [items])]
+        detected_at = datetime.now(timezone.utc).isoformat()
+        return [
+            {
+                "resource": self.resource_name,
+                "key": str(key),
+                "change": self.changes.get(str(key), "new"),
+                CONTENT_HASH_COLUMN: self.hashes.get(str(key)),
+                "detected_at": detected_at,
+            }
+            for key in keys
+        ]
+
+    def apply(self, source):
+        """
+        Deduplicate a source's resource against this index.
+
+        Stamps raw rows with their hash right after they are fetched (Arrow
+        pages are stamped by to_arrow_pages), adds the hash filter to the
+        resource, switches it to merge on its key, and adds a transformer
+        writing the changed keys of every kept row.
+        """
+        enable_content_hashes()
+        resource = source.resources[self.resource_name]
+        # Step 0 is the resource's generator; its cleanup maps come after
+        resource.add_map(
+            lambda item: item if isinstance(item, pa.Table) else self.stamp_row(item), insert_at=1
+        )
+        resource.add_filter(lambda item: isinstance(item, pa.Table) or self.keep_row(item))
+        resource.add_map(lambda item: self.filter_table(item) if isinstance(item, pa.Table) else item)
+        resource.apply_hints(write_disposition="merge", primary_key=self.key)
+
+        @dlt.transformer(name=CHANGED_KEYS_TABLE, write_disposition="append")
+        def changed_keys(items):
+            rows = self._changed_rows(items)
+            if rows:
+                yield rows
+
+        source.resources.add(resource | changed_keys)
+        return source
+
+    def summary(self) -> str:
+        new = sum(1 for change in self.changes.values() if change == "new")
+        return (
+            f"{self.resource_name} dedup: {new} new, {len(self.changes) - new} changed, "
+            f"{self.unchanged} unchanged rows skipped"
+        )
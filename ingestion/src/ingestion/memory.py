@@ -0,0 +1,192 @@
+"""
+Memory budget for extraction: bounded pages in flight, spill to disk beyond it.
+
+Memory of a run grows with page size × pages in flight: every fan-out worker
+holds a fully decoded page until the resource generator yields it, and dlt
+buffers rows per table before writing them out. With a budget set
+(`--memory-budget` or INGESTION_MEMORY_BUDGET, e.g. "1.5g"):
+
+- fan_out only starts another work unit while the pages held, plus the
+  expected size of the pages in flight, fit in the page share of the budget
+  (at least one unit is always in flight, so an oversized page cannot stall
+  the run).
+- A page completed while the page share is exhausted is pickled to a spill
+  file and read back when it is its turn to be yielded, so held pages never
+  exceed it by more than the page being yielded.
+- dlt's row buffers are sized to a fraction of the budget (see buffer_max_items).
+
+Page sizes are estimates: the Arrow buffer size of a table, or the JSON size of
+a sample of dict rows times the overhead of Python objects. The peak of held
+pages, spills and the process's peak RSS are reported against the budget.
+"""
+
+import atexit
+import json
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+
+MEMORY_BUDGET_ENV_VAR = "INGESTION_MEMORY_BUDGET"
+SPILL_DIR_ENV_VAR = "INGESTION_SPILL_DIR"
+
+PAGE_SHARE = 0.5  # Part of the budget for pages held by fan-out; the rest is dlt and the interpreter
+BUFFER_SHARE = 0.25  # Part of the budget for dlt's row buffers
+DICT_OVERHEAD = 4  # Python dicts and strings take roughly 4x their JSON size
+ROW_SAMPLE = 50
+ESTIMATED_ROW_BYTES = 2048  # A decoded anförande or dokument row, roughly
+MIN_BUFFER_ITEMS = 500
+MAX_BUFFER_ITEMS = 50_000
+
+_UNITS = {"": 1, "k": 2**10, "m": 2**20, "g": 2**30}
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte size such as "512m", "1.5g" or "2000000"."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([kmg]?)i?b?\s*", value.lower())
+    if not match:
+        raise ValueError(f"Invalid memory size: {value!r} (expected e.g. 512m or 1.5g)")
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+def estimate_size(rows: Any) -> int:
+    """Estimate the resident size of a page of rows (Arrow table or list of dicts)."""
+    if hasattr(rows, "nbytes"):
+        return int(rows.nbytes)
+    if not rows:
+        return 0
+    sample = rows[:ROW_SAMPLE]
+    sample_bytes = len(json.dumps(sample, default=str, ensure_ascii=False))
+    return sample_bytes * DICT_OVERHEAD * len(rows) // len(sample)
+
+
+class HeldPage(NamedTuple):
+    """A completed page waiting to be yielded: in memory, or in a spill file."""
+
+    rows: Any
+    path: Optional[str]
+    size: int
+
+
+class MemoryBudget:
+    """
+    Process-wide accounting of the pages held between fetch and yield.
+
+    Thread-safe: pages are held by fan-out worker threads and released by the
+    generator yielding them.
+    """
+
+    def __init__(self, limit: int, spill_dir: str | None = None):
+        self.limit = limit
+        self.page_limit = int(limit * PAGE_SHARE)
+        self._spill_dir = spill_dir
+        self.held = 0
+        self.peak_held = 0
+        self.pages = 0
+        self.page_bytes = 0
+        self.spilled = 0
+        self.spilled_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def spill_dir(self) -> str:
+        """Directory of this process's spill files, removed at exit."""
+        with self._lock:
+            if self._spill_dir is None:
+                parent = os.environ.get(SPILL_DIR_ENV_VAR) or None
+                if parent:
+                    Path(parent).mkdir(parents=True, exist_ok=True)
+                self._spill_dir = tempfile.mkdtemp(prefix="ingestion-spill-", dir=parent)
+                atexit.register(shutil.rmtree, self._spill_dir, ignore_errors=True)
+            return self._spill_dir
+
+    def admits(self, in_flight: int) -> bool:
+        """Check whether another work unit may start with `in_flight` already running."""
+        if in_flight == 0:
+            return True
+        with self._lock:
+            expected = self.page_bytes // self.pages if self.pages else 0
+            return self.held + (in_flight + 1) * expected <= self.page_limit
+
+    def hold(self, rows: Any) -> HeldPage:
+        """Account for a completed page; spill its rows to disk beyond the budget."""
+        size = estimate_size(rows)
+        with self._lock:
+            self.pages += 1
+            self.page_bytes += size
+            spill = self.held > 0 and self.held + size > self.page_limit
+            if not spill:
+                self.held += size
+                self.peak_held = max(self.peak_held, self.held)
+                return HeldPage(rows=rows, path=None, size=size)
+            self.spilled += 1
+            self.spilled_bytes += size
+
+        fd, path = tempfile.mkstemp(dir=self.spill_dir, suffix=".pkl")
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump(rows, file, protocol=pickle.HIGHEST_PROTOCOL)
+        return HeldPage(rows=None, path=path, size=size)
+
+    def restore(self, page: HeldPage) -> Any:
+        """Get a held page's rows, loading (and accounting for) a spilled page."""
+        if page.path is None:
+            return page.rows
+        try:
+            with open(page.path, "rb") as file:
+                rows = pickle.load(file)
+        finally:
+            os.remove(page.path)
+        with self._lock:
+            self.held += page.size
+            self.peak_held = max(self.peak_held, self.held)
+        return rows
+
+    def release(self, page: HeldPage) -> None:
+        """Stop accounting for a restored page once it has been handed to dlt."""
+        with self._lock:
+            self.held = max(0, self.held - page.size)
+
+    def discard(self, page: HeldPage) -> None:
+        """Drop a page that will never be yielded, removing its spill file."""
+        if page.path is None:
+            self.release(page)
+            return
+        try:
+            os.remove(page.path)
+        except FileNotFoundError:
+            pass
+
+    def buffer_max_items(self) -> int:
+        """Rows dlt may buffer per table, sized to BUFFER_SHARE of the budget."""
+        items = int(self.limit * BUFFER_SHARE) // ESTIMATED_ROW_BYTES
+        return max(MIN_BUFFER_ITEMS, min(MAX_BUFFER_ITEMS, items))
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit_bytes": self.limit,
+                "page_limit_bytes": self.page_limit,
+                "peak_held_bytes": self.peak_held,
+                "pages": self.pages,
+                "spilled_pages": self.spilled,
+                "spilled_bytes": self.spilled_bytes,
+            }
+
+
+_budget: Optional[MemoryBudget] = None
+_budget_lock = threading.Lock()
+
+
+def get_memory_budget() -> Optional[MemoryBudget]:
+    """Get the process-wide memory budget, or None when no budget is set."""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            value = os.environ.get(MEMORY_BUDGET_ENV_VAR)
+            if value:
+                _budget = MemoryBudget(parse_size(value))
+        return _budget
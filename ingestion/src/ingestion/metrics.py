@@ -0,0 +1,301 @@
+"""
+Run metrics for ingestion: where does the time of a run go?
+
+One process-wide RunMetrics collects:
+
+- HTTP requests per endpoint: count, status codes, cache hits, bytes and a
+  latency histogram (time to response headers), via a requests response hook
+  installed on every Riksdagen session.
+- Pages and work units per resource: rows and bytes per page, time and rows per
+  work unit, recorded by the direct fetch paths (fanout/streaming).
+- dlt stages: wall time of extract/normalize/load and normalized row counts per
+  table, taken from the pipeline trace after each run.
+- Peak RSS of the process.
+
+At the end of a run the summary is written as JSON and/or in the Prometheus
+text exposition format (for the node_exporter textfile collector or a scrape
+of the optional HTTP endpoint).
+"""
+
+import json
+import resource
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+# Upper bounds in seconds, Prometheus-style (cumulative, plus +Inf)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus semantics."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate a quantile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def cumulative(self) -> List[int]:
+        total, cumulative = 0, []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "max": round(self.max, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip(map(str, self.buckets), self.cumulative())),
+        }
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def endpoint_of(url: str) -> str:
+    """Label a request by its endpoint, e.g. 'voteringlista' or 'votering'."""
+    path = urlsplit(url).path.strip("/")
+    return path.split("/", 1)[0] or "/"
+
+
+class RunMetrics:
+    """Thread-safe collector for one ingestion run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.requests: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {
+                "count": 0,
+                "bytes": 0,
+                "cache_hits": 0,
+                "status": defaultdict(int),
+                "latency": Histogram(),
+            }
+        )
+        self.resources: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {
+                "pages": 0,
+                "rows": 0,
+                "bytes": 0,
+                "rows_per_page": Histogram(buckets=(0, 10, 100, 1000, 5000, 10000, 20000)),
+                "work_units": 0,
+                "work_unit_seconds": Histogram(),
+            }
+        )
+        self.stages: Dict[str, float] = defaultdict(float)
+        self.row_counts: Dict[str, int] = defaultdict(int)
+
+    def record_response(self, response, *args, **kwargs):
+        """requests response hook: count the request, its latency and size."""
+        # Streamed bodies are not read yet; fall back to the declared length
+        size = len(response._content) if response._content_consumed and response._content else 0
+        if not size:
+            size = int(response.headers.get("Content-Length") or 0)
+
+        with self._lock:
+            stats = self.requests[endpoint_of(response.url or "")]
+            stats["count"] += 1
+            stats["bytes"] += size
+            stats["status"][str(response.status_code)] += 1
+            if response.headers.get("X-Cache") == "HIT":
+                stats["cache_hits"] += 1
+            else:
+                stats["latency"].observe(response.elapsed.total_seconds())
+        return response
+
+    def record_page(self, resource_name: str, rows: int, size: int = 0) -> None:
+        """Record one decoded page (or streamed batch) of a resource."""
+        with self._lock:
+            stats = self.resources[resource_name]
+            stats["pages"] += 1
+            stats["rows"] += rows
+            stats["bytes"] += size
+            stats["rows_per_page"].observe(rows)
+
+    def record_work_unit(self, resource_name: str, seconds: float) -> None:
+        """Record the wall time of one fetched work unit."""
+        with self._lock:
+            stats = self.resources[resource_name]
+            stats["work_units"] += 1
+            stats["work_unit_seconds"].observe(seconds)
+
+    def record_trace(self, trace) -> None:
+        """Add stage timings and normalized row counts from a dlt pipeline trace."""
+        if trace is None:
+            return
+        with self._lock:
+            for step in trace.steps:
+                if step.started_at and step.finished_at:
+                    self.stages[step.step] += (step.finished_at - step.started_at).total_seconds()
+            normalize_info = getattr(trace, "last_normalize_info", None)
+            for table, count in (getattr(normalize_info, "row_counts", None) or {}).items():
+                self.row_counts[table] += count
+
+    def summary(self) -> Dict[str, Any]:
+        """Get all metrics as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "duration_seconds": round(time.time() - self.started_at, 3),
+                "peak_rss_bytes": peak_rss_bytes(),
+                "stages": dict(self.stages),
+                "row_counts": dict(self.row_counts),
+                "requests": {
+                    endpoint: {
+                        **{name: value for name, value in stats.items() if name not in ("status", "latency")},
+                        "status": dict(stats["status"]),
+                        "latency_seconds": stats["latency"].as_dict(),
+                    }
+                    for endpoint, stats in self.requests.items()
+                },
+                "resources": {
+                    name: {
+                        "pages": stats["pages"],
+                        "rows": stats["rows"],
+                        "bytes": stats["bytes"],
+                        "rows_per_page": stats["rows_per_page"].as_dict(),
+                        "work_units": stats["work_units"],
+                        "work_unit_seconds": stats["work_unit_seconds"].as_dict(),
+                    }
+                    for name, stats in self.resources.items()
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "ingestion") -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        summary = self.summary()
+        lines = [
+            f"# TYPE {prefix}_peak_rss_bytes gauge",
+            f"{prefix}_peak_rss_bytes {summary['peak_rss_bytes']}",
+            f"# TYPE {prefix}_run_duration_seconds gauge",
+            f"{prefix}_run_duration_seconds {summary['duration_seconds']}",
+            f"# TYPE {prefix}_stage_seconds gauge",
+        ]
+        lines += [
+            f'{prefix}_stage_seconds{{stage="{stage}"}} {seconds}'
+            for stage, seconds in summary["stages"].items()
+        ]
+        lines.append(f"# TYPE {prefix}_rows_total counter")
+        lines += [
+            f'{prefix}_rows_total{{table="{table}"}} {count}'
+            for table, count in summary["row_counts"].items()
+        ]
+
+        lines.append(f"# TYPE {prefix}_http_requests_total counter")
+        for endpoint, stats in summary["requests"].items():
+            for status, count in stats["status"].items():
+                lines.append(
+                    f'{prefix}_http_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}'
+                )
+        lines.append(f"# TYPE {prefix}_http_response_bytes_total counter")
+        lines += [
+            f'{prefix}_http_response_bytes_total{{endpoint="{endpoint}"}} {stats["bytes"]}'
+            for endpoint, stats in summary["requests"].items()
+        ]
+        lines.append(f"# TYPE {prefix}_http_request_duration_seconds histogram")
+        for endpoint, stats in summary["requests"].items():
+            latency = stats["latency_seconds"]
+            for bound, count in latency["buckets"].items():
+                lines.append(
+                    f'{prefix}_http_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}'
+                )
+            lines += [
+                f'{prefix}_http_request_duration_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} {latency["count"]}',
+                f'{prefix}_http_request_duration_seconds_sum{{endpoint="{endpoint}"}} {latency["sum"]}',
+                f'{prefix}_http_request_duration_seconds_count{{endpoint="{endpoint}"}} {latency["count"]}',
+            ]
+
+        lines.append(f"# TYPE {prefix}_pages_total counter")
+        lines += [
+            f'{prefix}_pages_total{{resource="{name}"}} {stats["pages"]}'
+            for name, stats in summary["resources"].items()
+        ]
+        lines.append(f"# TYPE {prefix}_work_units_total counter")
+        lines += [
+            f'{prefix}_work_units_total{{resource="{name}"}} {stats["work_units"]}'
+            for name, stats in summary["resources"].items()
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str, **extra: Any) -> None:
+        """Write the summary, plus any extra sections (e.g. throttling), as JSON."""
+        Path(path).write_text(json.dumps({**self.summary(), **extra}, indent=2))
+
+    def write_prometheus(self, path: str) -> None:
+        Path(path).write_text(self.to_prometheus())
+
+    def serve_prometheus(self, port: int) -> ThreadingHTTPServer:
+        """Expose the metrics at http://0.0.0.0:<port>/metrics from a daemon thread."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+_metrics = RunMetrics()
+
+
+def get_metrics() -> RunMetrics:
+    """Get the process-wide metrics collector."""
+    return _metrics
+
+
+def record_response(response, *args, **kwargs):
+    """
+    requests response hook recording into the process-wide metrics.
+
+    A plain function instead of the bound RunMetrics method, so that sessions
+    can be deep-copied (rest_api_source copies its client config to validate
+    it) without copying the collector and its lock.
+    """
+    _metrics.record_response(response, *args, **kwargs)
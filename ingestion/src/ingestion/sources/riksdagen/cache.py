@@ -0,0 +1,317 @@
+"""
+Persistent on-disk HTTP response cache for Riksdagen API pages.
+
+Historical data (e.g. closed parliamentary sessions) never changes, yet every
+run of a backfill downloads it again. This cache sits in front of the requests
+session used by the sources:
+
+- Entries are keyed by method + endpoint + sorted query params.
+- Bodies are stored gzip-compressed and content-addressed by their SHA-256, so
+  identical responses (e.g. the many empty Riksmöte × Valkrets cells) are only
+  stored once.
+- Fresh entries are served without touching the network. Stale entries are
+  revalidated with If-None-Match / If-Modified-Since when the API sent an
+  ETag / Last-Modified, and re-used on 304 Not Modified.
+- Freshness depends on whether the request targets a closed session (long TTL)
+  or the ongoing one (short TTL).
+- Misses are written to the cache while the caller reads them: the body is
+  hashed and compressed chunk by chunk as the streaming decoder consumes it,
+  and the entry is stored once the body has been read to the end. Caching
+  never buffers a whole page in memory, and a partly read body is not cached.
+
+Layout:
+    <cache_dir>/entries/<key[:2]>/<key>.json   request metadata + blob pointer
+    <cache_dir>/blobs/<sha[:2]>/<sha>.gz        compressed response body
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .catalogue import current_riksmote
+
+CLOSED_SESSION_TTL = 30 * 24 * 3600  # Closed sessions only see rare corrections
+OPEN_SESSION_TTL = 3600  # The ongoing session changes daily
+
+CACHE_DIR_ENV_VAR = "RIKSDAGEN_CACHE_DIR"
+
+# Headers worth replaying from a cached response
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def get_cache_dir() -> Optional[str]:
+    """Get the cache directory from env, or None when caching is disabled."""
+    return os.environ.get(CACHE_DIR_ENV_VAR) or None
+
+
+def is_closed_request(params: Dict[str, str], today: Optional[date] = None) -> bool:
+    """
+    Check whether a request only targets data from closed sessions.
+
+    Riksmöte-filtered requests are closed when the session is older than the
+    ongoing one; date-filtered requests (dokumentlista) are closed when the
+    range ends before the ongoing session started.
+    """
+    ongoing = current_riksmote(today)
+    ongoing_start = date(int(ongoing[:4]), 9, 1)
+
+    riksmote = params.get("rm")
+    if riksmote:
+        return riksmote[:4] < ongoing[:4]
+
+    end = params.get("tom")
+    if end:
+        try:
+            return date.fromisoformat(end[:10]) < ongoing_start
+        except ValueError:
+            return False
+
+    return False
+
+
+def _canonical_url(url: str) -> str:
+    """Sort query params so equivalent requests share a cache key."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file + rename so concurrent workers never see partial files."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class _CachingBody:
+    """
+    Wraps a response's raw body and tees everything read from it into the cache.
+
+    Reads are decoded (Content-Encoding removed), as cached bodies are replayed
+    without it. Once the body has been read to EOF, `on_complete` is called
+    with the path of the compressed temp file and the body's SHA-256.
+    """
+
+    def __init__(self, raw, temp_dir: Path, on_complete: Callable[[str, str], None]):
+        self._raw = raw
+        self._on_complete = on_complete
+        self._digest = hashlib.sha256()
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        fd, self._temp_path = tempfile.mkstemp(dir=temp_dir, prefix=".tmp-")
+        self._file = os.fdopen(fd, "wb")
+        self._gzip = gzip.GzipFile(fileobj=self._file, mode="wb")
+        self._finished = False
+
+    def read(self, amt: Optional[int] = None, *args, **kwargs) -> bytes:
+        data = self._raw.read(amt, decode_content=True)
+        if self._finished:
+            return data
+        if data:
+            self._digest.update(data)
+            self._gzip.write(data)
+        if not data or amt is None:
+            self._finish()
+        return data
+
+    def stream(self, amt: int = 2**16, decode_content: Optional[bool] = None):
+        """Used by requests' iter_content, e.g. for response.content."""
+        while True:
+            data = self.read(amt)
+            if not data:
+                return
+            yield data
+
+    def _finish(self) -> None:
+        self._finished = True
+        self._gzip.close()
+        self._file.close()
+        self._on_complete(self._temp_path, self._digest.hexdigest())
+
+    def close(self) -> None:
+        if not self._finished:
+            # Closed before EOF: the body is incomplete, so don't cache it
+            self._finished = True
+            self._gzip.close()
+            self._file.close()
+            os.unlink(self._temp_path)
+        self._raw.close()
+
+    def __getattr__(self, name: str):
+        return getattr(self._raw, name)
+
+
+class ResponseCache:
+    """Content-addressed, gzip-compressed response store with TTLs by session state."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        closed_ttl: Optional[float] = CLOSED_SESSION_TTL,
+        open_ttl: Optional[float] = OPEN_SESSION_TTL,
+    ):
+        self.directory = Path(directory)
+        self.closed_ttl = closed_ttl
+        self.open_ttl = open_ttl
+
+    def key(self, request: requests.PreparedRequest) -> str:
+        """Get the cache key for a request."""
+        raw = f"{request.method} {_canonical_url(request.url)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def ttl(self, request: requests.PreparedRequest) -> Optional[float]:
+        """Get the freshness lifetime for a request; None means never stale."""
+        params = dict(parse_qsl(urlsplit(request.url).query))
+        return self.closed_ttl if is_closed_request(params) else self.open_ttl
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / "entries" / key[:2] / f"{key}.json"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.directory / "blobs" / digest[:2] / f"{digest}.gz"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a cache entry, or None if missing or unreadable."""
+        try:
+            entry = json.loads(self._entry_path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        if not self._blob_path(entry["blob"]).exists():
+            return None
+        return entry
+
+    def load_body(self, entry: Dict[str, Any]) -> bytes:
+        """Load and decompress the body of a cache entry."""
+        return gzip.decompress(self._blob_path(entry["blob"]).read_bytes())
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """
+        Store a 200 response body and its validators.
+
+        An unread body is stored as the caller reads it (see _CachingBody);
+        one that was already buffered is stored right away.
+        """
+        if getattr(response, "_content_consumed", False) or response.raw is None:
+            body = response.content
+            digest = hashlib.sha256(body).hexdigest()
+            blob_path = self._blob_path(digest)
+            if not blob_path.exists():
+                _write_atomic(blob_path, gzip.compress(body))
+            self._store_entry(key, response, digest)
+            return
+
+        def complete(temp_path: str, digest: str) -> None:
+            blob_path = self._blob_path(digest)
+            if blob_path.exists():
+                os.unlink(temp_path)
+            else:
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(temp_path, blob_path)
+            self._store_entry(key, response, digest)
+
+        response.raw = _CachingBody(response.raw, self.directory / "blobs", complete)
+
+    def _store_entry(self, key: str, response: requests.Response, digest: str) -> None:
+        entry = {
+            "url": _canonical_url(response.url or response.request.url),
+            "blob": digest,
+            "stored_at": time.time(),
+            "headers": {
+                name: response.headers[name]
+                for name in _STORED_HEADERS
+                if name in response.headers
+            },
+        }
+        _write_atomic(self._entry_path(key), json.dumps(entry).encode("utf-8"))
+
+    def touch(self, key: str, entry: Dict[str, Any]) -> None:
+        """Mark an entry as fresh again after a successful revalidation."""
+        entry["stored_at"] = time.time()
+        _write_atomic(self._entry_path(key), json.dumps(entry).encode("utf-8"))
+
+    def is_fresh(self, entry: Dict[str, Any], ttl: Optional[float]) -> bool:
+        """Check whether an entry can be served without revalidation."""
+        if ttl is None:
+            return True
+        return time.time() - entry["stored_at"] < ttl
+
+
+class CachingAdapter(BaseAdapter):
+    """
+    requests transport adapter that serves GET requests from a ResponseCache.
+
+    Misses and revalidations are passed on to the delegate adapter.
+    """
+
+    def __init__(self, cache: ResponseCache, delegate: Optional[BaseAdapter] = None):
+        super().__init__()
+        self.cache = cache
+        self.delegate = delegate or HTTPAdapter()
+
+    def _cached_response(
+        self, request: requests.PreparedRequest, entry: Dict[str, Any]
+    ) -> requests.Response:
+        body = self.cache.load_body(entry)
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = request.url
+        response.request = request
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.headers["X-Cache"] = "HIT"
+        response.raw = io.BytesIO(body)
+        response._content = body
+        response._content_consumed = True
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.connection = self
+        return response
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if request.method != "GET":
+            return self.delegate.send(request, **kwargs)
+
+        key = self.cache.key(request)
+        entry = self.cache.load(key)
+
+        if entry is not None:
+            if self.cache.is_fresh(entry, self.cache.ttl(request)):
+                return self._cached_response(request, entry)
+
+            # Stale: revalidate with whatever validators the API gave us
+            headers = entry["headers"]
+            if "ETag" in headers:
+                request.headers["If-None-Match"] = headers["ETag"]
+            if "Last-Modified" in headers:
+                request.headers["If-Modified-Since"] = headers["Last-Modified"]
+
+        response = self.delegate.send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            self.cache.touch(key, entry)
+            return self._cached_response(request, entry)
+
+        if response.status_code == 200:
+            self.cache.store(key, response)
+
+        return response
+
+    def close(self) -> None:
+        self.delegate.close()
@@ -0,0 +1,199 @@
+"""
+Catalogue of Riksmöte sessions and valkretsar (electoral districts).
+
+Every grid-shaped resource needs the same two lists: the sessions in a date
+range and the valkretsar to combine them with. Instead of hardcoding them per
+paginator:
+
+- Sessions are computed from the calendar. A Riksmöte runs from September 1 to
+  August 31 and is labelled by its two years, e.g. "2024/25" or "1999/00", so
+  a new session shows up on September 1 without a code change.
+- Valkretsar are discovered per session from the API (voteringlista grouped by
+  valkrets), which gives the exact set of districts that has votes in that
+  session. Results are memoized on disk; closed sessions never change, the
+  ongoing one is rediscovered after a day. If discovery fails, the static list
+  of today's 29 valkretsar is used.
+
+The on-disk memo lives at $RIKSDAGEN_CATALOGUE_PATH, by default
+~/.cache/riksdagen/catalogue.json.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from dlt.common import logger
+
+FIRST_RIKSMOTE_YEAR = 1990  # Oldest session available as open data
+CATALOGUE_PATH_ENV_VAR = "RIKSDAGEN_CATALOGUE_PATH"
+DEFAULT_CATALOGUE_PATH = Path.home() / ".cache" / "riksdagen" / "catalogue.json"
+OPEN_SESSION_TTL = 24 * 3600  # Rediscover the ongoing session's valkretsar daily
+DISCOVERY_TIMEOUT = 60
+
+VALKRETSAR = (
+    "Blekinge län",
+    "Dalarnas län",
+    "Gotlands län",
+    "Gävleborgs län",
+    "Göteborgs kommun",
+    "Hallands län",
+    "Jämtlands län",
+    "Jönköpings län",
+    "Kalmar län",
+    "Kronobergs län",
+    "Malmö kommun",
+    "Norrbottens län",
+    "Skåne läns norra och östra",
+    "Skåne läns södra",
+    "Skåne läns västra",
+    "Stockholms kommun",
+    "Stockholms län",
+    "Södermanlands län",
+    "Uppsala län",
+    "Värmlands län",
+    "Västerbottens län",
+    "Västernorrlands län",
+    "Västmanlands län",
+    "Västra Götalands läns norra",
+    "Västra Götalands läns södra",
+    "Västra Götalands läns västra",
+    "Västra Götalands läns östra",
+    "Örebro län",
+    "Östergötlands län",
+)
+
+_lock = threading.Lock()
+_memo: Optional[Dict[str, Any]] = None
+
+
+def riksmote_label(start_year: int) -> str:
+    """Label the session starting in `start_year`, e.g. 1999 -> "1999/00"."""
+    return f"{start_year}/{str(start_year + 1)[2:]}"
+
+
+def riksmote_span(riksmote: str) -> Tuple[date, date]:
+    """Get the first and last day of a session (Sep 1 – Aug 31)."""
+    start_year = int(riksmote[:4])
+    return date(start_year, 9, 1), date(start_year + 1, 8, 31)
+
+
+def riksmote_for_date(day: date) -> str:
+    """Get the session a calendar day belongs to."""
+    return riksmote_label(day.year if day.month >= 9 else day.year - 1)
+
+
+def current_riksmote(today: Optional[date] = None) -> str:
+    """Get the ongoing Riksmöte (sessions open in September)."""
+    return riksmote_for_date(today or date.today())
+
+
+def get_sessions(
+    start_date: str | None = None, end_date: str | None = None, today: Optional[date] = None
+) -> List[str]:
+    """
+    Get the sessions overlapping a date range, most recent first.
+
+    Without dates every session from 1990/91 up to the ongoing one is
+    returned. A range outside the available sessions gives an empty list.
+    """
+    latest = int(current_riksmote(today)[:4])
+    first = date.fromisoformat(start_date[:10]) if start_date else None
+    last = date.fromisoformat(end_date[:10]) if end_date else None
+
+    sessions = []
+    for start_year in range(latest, FIRST_RIKSMOTE_YEAR - 1, -1):
+        riksmote = riksmote_label(start_year)
+        session_start, session_end = riksmote_span(riksmote)
+        if (last is None or session_start <= last) and (first is None or session_end >= first):
+            sessions.append(riksmote)
+    return sessions
+
+
+def get_catalogue_path() -> Path:
+    return Path(os.environ.get(CATALOGUE_PATH_ENV_VAR) or DEFAULT_CATALOGUE_PATH)
+
+
+def _load() -> Dict[str, Any]:
+    global _memo
+    if _memo is None:
+        try:
+            _memo = json.loads(get_catalogue_path().read_text())
+        except (OSError, ValueError):
+            _memo = {}
+        _memo.setdefault("valkretsar", {})
+    return _memo
+
+
+def _save(catalogue: Dict[str, Any]) -> None:
+    path = get_catalogue_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "w") as tmp:
+            json.dump(catalogue, tmp, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as error:
+        # The memo only saves requests; a read-only home must not fail a run
+        logger.warning(f"Could not write Riksdagen catalogue to {path}: {error}")
+
+
+def discover_valkretsar(riksmote: str, session=None) -> List[str]:
+    """Ask the API which valkretsar have votes in a session."""
+    from .client import get_base_url, get_session
+    from .streaming import select_data
+
+    response = (session or get_session()).get(
+        urljoin(get_base_url(), "voteringlista/"),
+        params={"rm": riksmote, "gruppering": "valkrets", "utformat": "json", "sz": 500},
+        timeout=DISCOVERY_TIMEOUT,
+    )
+    response.raise_for_status()
+    rows = select_data(response.json(), "voteringlista.votering")
+    return sorted({row["valkrets"] for row in rows if row.get("valkrets")})
+
+
+def get_valkretsar(riksmote: str | None = None, discover: bool = True) -> List[str]:
+    """
+    Get the valkretsar of a session (default: the ongoing one).
+
+    Discovered lists are memoized on disk. Sessions that cannot be discovered
+    (network errors, no votes yet) fall back to VALKRETSAR without being
+    memoized, so they are retried on the next run.
+    """
+    riksmote = riksmote or current_riksmote()
+    if not discover:
+        return list(VALKRETSAR)
+
+    with _lock:
+        catalogue = _load()
+        entry = catalogue["valkretsar"].get(riksmote)
+        is_open = riksmote == current_riksmote()
+        if entry and not (is_open and time.time() - entry["discovered_at"] > OPEN_SESSION_TTL):
+            return list(entry["names"])
+
+        try:
+            names = discover_valkretsar(riksmote)
+        except Exception as error:
+            logger.warning(f"Could not discover valkretsar for {riksmote}, using static list: {error}")
+            names = []
+        if not names:
+            return list(entry["names"]) if entry else list(VALKRETSAR)
+
+        catalogue["valkretsar"][riksmote] = {"names": names, "discovered_at": time.time()}
+        _save(catalogue)
+        return names
+
+
+def get_valkrets_grid(sessions: List[str], discover: bool = True) -> List[Dict[str, str]]:
+    """Get the (rm, valkrets) work units of the given sessions."""
+    return [
+        {"rm": riksmote, "valkrets": valkrets}
+        for riksmote in sessions
+        for valkrets in get_valkretsar(riksmote, discover=discover)
+    ]
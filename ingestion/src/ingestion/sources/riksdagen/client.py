@@ -0,0 +1,95 @@
+"""
+Shared HTTP client configuration for Riksdagen API resources.
+
+All resources talk to the same host, so the base URL, default headers and the
+requests session used by both rest_api_source and the custom fetch paths live
+here. Every session sends its requests through the process-wide adaptive
+rate limiter in throttle.py.
+
+The host can be overridden with RIKSDAGEN_BASE_URL, e.g. to run against the
+local fixture server in replay.py, and RIKSDAGEN_RECORD_DIR records every
+response as a fixture for such replays. INGESTION_ARCHIVE_DIR appends every
+response to the raw archive (see ingestion.archive).
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+
+from ...archive import ArchivingAdapter, get_archive, get_archive_dir
+from ...metrics import record_response
+from .cache import CachingAdapter, ResponseCache, get_cache_dir
+from .replay import FixtureStore, RecordingAdapter, get_record_dir
+from .throttle import ThrottledAdapter
+
+BASE_URL = "https://data.riksdagen.se/"
+BASE_URL_ENV_VAR = "RIKSDAGEN_BASE_URL"
+HEADERS = {
+    "User-Agent": "riksbevakning-dagster/1.0",
+}
+POOL_MAXSIZE = 32  # Keep-alive connections shared by all resources and workers
+
+_shared_session: Optional[requests.Session] = None
+_shared_lock = threading.Lock()
+
+
+def get_base_url() -> str:
+    """Get the API base URL: BASE_URL unless overridden from env."""
+    return os.environ.get(BASE_URL_ENV_VAR) or BASE_URL
+
+
+def get_client_config() -> Dict[str, Any]:
+    """Get the client section of a rest_api_source configuration."""
+    return {
+        "base_url": get_base_url(),
+        "headers": dict(HEADERS),
+        "session": get_session(),
+    }
+
+
+def get_session() -> requests.Session:
+    """
+    Get the process-wide session shared by all Riksdagen resources.
+
+    Sharing one session lets resources loaded in the same run reuse keep-alive
+    connections, on top of sharing the rate limiter.
+    """
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+        return _shared_session
+
+
+def create_session(cache_dir: str | None = None) -> requests.Session:
+    """
+    Create a requests session with the default Riksdagen headers.
+
+    Requests are rate-limited and retried by a ThrottledAdapter sharing one
+    limiter across all sessions; cache hits are served before it and are not
+    throttled. Every response is counted in the run metrics.
+
+    Args:
+        cache_dir: Directory for the on-disk response cache. Defaults to the
+            RIKSDAGEN_CACHE_DIR env var; caching is disabled if neither is set.
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.hooks["response"].append(record_response)
+
+    adapter = ThrottledAdapter(pool_maxsize=POOL_MAXSIZE)
+    cache_dir = cache_dir or get_cache_dir()
+    if cache_dir:
+        adapter = CachingAdapter(ResponseCache(cache_dir), delegate=adapter)
+    archive_dir = get_archive_dir()
+    if archive_dir:
+        adapter = ArchivingAdapter(get_archive(archive_dir), delegate=adapter)
+    record_dir = get_record_dir()
+    if record_dir:
+        adapter = RecordingAdapter(FixtureStore(record_dir), delegate=adapter)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
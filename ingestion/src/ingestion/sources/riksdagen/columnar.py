@@ -0,0 +1,151 @@
+"""
+Arrow-native decoding of Riksdagen pages.
+
+PageReader builds one Python dict per record, which dlt then normalizes row by
+row. ArrowPageReader instead appends every scalar straight from the ijson
+event stream into per-column buffers and emits pyarrow.Table batches with a
+declared schema (see schemas.py). No per-record dicts are created, and dlt
+passes the tables through to Parquet without per-row normalization.
+
+Intended for flat resources such as anforandelista and voteringlista; a nested
+value inside a record is kept as a JSON string in the field's column.
+"""
+
+import json
+from typing import Any, Dict, IO, Iterator, List, Optional
+
+import pyarrow as pa
+
+from .streaming import DEFAULT_BATCH_SIZE, PageReader, ijson
+
+_CONTAINER_START = ("start_map", "start_array")
+_CONTAINER_END = ("end_map", "end_array")
+
+
+def _to_array(values: List[Any], type_: pa.DataType) -> pa.Array:
+    try:
+        return pa.array(values, type=type_)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # e.g. a number where the schema declares a string
+        return pa.array([None if value is None else str(value) for value in values], type=type_)
+
+
+class ArrowPageReader(PageReader):
+    """
+    Incrementally decodes one Riksdagen page into Arrow tables.
+
+    Exposes the same `attributes`, `rows` and `cursor_max` as PageReader, so it
+    can be used wherever a PageReader is (fan_out, stream_units, splitters);
+    the only difference is that batches are pyarrow.Table instead of lists.
+    iter_records still yields dicts (with the schema's columns, nested values
+    as JSON strings) for callers that need them.
+    """
+
+    def __init__(self, data_selector: str, schema: pa.Schema, cursor_field: Optional[str] = None):
+        super().__init__(data_selector, cursor_field=cursor_field)
+        self.schema = schema
+
+    def _new_columns(self) -> Dict[str, List[Any]]:
+        return {name: [] for name in self.schema.names}
+
+    def _to_table(self, columns: Dict[str, List[Any]], count: int) -> pa.Table:
+        fields = list(self.schema)
+        fields += [pa.field(name, pa.string()) for name in columns if name not in self.schema.names]
+        arrays = [
+            _to_array(columns[field.name] or [None] * count, field.type) for field in fields
+        ]
+        return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+    @staticmethod
+    def _append(columns: Dict[str, List[Any]], key: str, value: Any, count: int) -> None:
+        column = columns.setdefault(key, [])
+        if len(column) < count:
+            # Rows before this one did not have the field
+            column.extend([None] * (count - len(column)))
+        column.append(value)
+
+    def _observe_value(self, key: str, value: Any) -> None:
+        if key == self.cursor_field and value is not None:
+            if self.cursor_max is None or value > self.cursor_max:
+                self.cursor_max = value
+
+    def iter_batches(
+        self, body: IO[bytes], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[pa.Table]:
+        """Yield the page's records as Arrow tables of at most `batch_size` rows."""
+        if ijson is None:
+            yield from self._iter_batches_buffered(body, batch_size)
+            return
+
+        item_prefix = f"{self.data_selector}.item"
+        columns = self._new_columns()
+        count = 0
+        record_prefix = None
+        nested = None  # (key, prefix, builder) of a nested value being collected
+
+        for prefix, event, value in ijson.parse(body, use_float=True):
+            if record_prefix is None:
+                # Records are array items, or a bare object when there is a single hit
+                if event == "start_map" and prefix in (item_prefix, self.data_selector):
+                    record_prefix = prefix
+                    field_offset = len(prefix) + 1
+                elif self._is_attribute(prefix, event):
+                    self.attributes[prefix.rsplit(".", 1)[-1]] = value
+                continue
+
+            if nested is not None:
+                key, nested_prefix, builder = nested
+                builder.event(event, value)
+                if prefix == nested_prefix and event in _CONTAINER_END:
+                    self._append(columns, key, json.dumps(builder.value, ensure_ascii=False), count)
+                    nested = None
+                continue
+
+            if prefix == record_prefix and event == "end_map":
+                count += 1
+                self.rows += 1
+                for column in columns.values():
+                    if len(column) < count:
+                        column.extend([None] * (count - len(column)))
+                record_prefix = None
+                if count >= batch_size:
+                    yield self._to_table(columns, count)
+                    columns, count = self._new_columns(), 0
+                continue
+
+            if event == "map_key" or prefix == record_prefix:
+                continue
+
+            key = prefix[field_offset:]
+            if event in _CONTAINER_START:
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                nested = (key, prefix, builder)
+                continue
+
+            self._append(columns, key, value, count)
+            self._observe_value(key, value)
+
+        if count:
+            yield self._to_table(columns, count)
+
+    def _iter_batches_buffered(self, body: IO[bytes], batch_size: int) -> Iterator[pa.Table]:
+        """Fallback without ijson: decode the page with json.load, then batch it."""
+        records = list(self._iter_records_buffered(body))
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            columns = self._new_columns()
+            for name in {key for record in batch for key in record}:
+                columns.setdefault(name, [])
+            for name, column in columns.items():
+                for record in batch:
+                    value = record.get(name)
+                    if isinstance(value, (dict, list)):
+                        value = json.dumps(value, ensure_ascii=False)
+                    column.append(value)
+            yield self._to_table(columns, len(batch))
+
+    def iter_records(self, body: IO[bytes]) -> Iterator[Dict[str, Any]]:
+        """Yield the page's records as dicts, converted from the decoded tables."""
+        for table in self.iter_batches(body):
+            yield from table.to_pylist()
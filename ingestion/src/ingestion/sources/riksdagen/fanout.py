@@ -0,0 +1,270 @@
+"""
+Concurrent fan-out fetching for Riksdagen work units.
+
+Some resources traverse a grid of independent requests, e.g. every
+Riksmöte × Valkrets combination for voteringlista. The custom paginators walk
+that grid one request at a time; this module runs each cell as its own work
+unit on a bounded thread pool instead, while still yielding pages into a
+single dlt resource.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from string import Formatter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from ...memory import get_memory_budget
+from ...metrics import get_metrics
+from .client import get_base_url, get_session
+from .streaming import (
+    DEFAULT_BATCH_SIZE,
+    Page,
+    PageReader,
+    response_body,
+)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_PER_HOST = 4  # Keep well below what data.riksdagen.se tolerates
+DEFAULT_TIMEOUT = 120  # Large pages can take a while to render server-side
+
+
+class HostLimiter:
+    """
+    Caps the number of concurrent requests per host across all worker threads.
+
+    The thread pool size bounds total work in flight; this additionally bounds
+    how many of those workers may talk to the same host at once.
+    """
+
+    def __init__(self, max_per_host: int = DEFAULT_MAX_PER_HOST):
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold one of the host's request slots for the duration of the block."""
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                self._semaphores[host] = semaphore
+        with semaphore:
+            yield
+
+
+class WorkUnitFetcher:
+    """
+    Fetches a single work unit (one request) from a Riksdagen endpoint.
+
+    Response bodies are decoded incrementally with PageReader rather than via
+    response.json(). ``path`` may contain placeholders such as
+    ``votering/{votering_id}/json``; they are filled from each unit's params
+    and the remaining params are sent as the query. Instances are shared
+    between worker threads; requests.Session is safe to use concurrently for
+    plain GET requests.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        data_selector: str,
+        base_params: Optional[Dict[str, Any]] = None,
+        session: Optional[requests.Session] = None,
+        limiter: Optional[HostLimiter] = None,
+        timeout: int = DEFAULT_TIMEOUT,
+        cursor_field: Optional[str] = None,
+        schema=None,
+    ):
+        self.url = urljoin(get_base_url(), path)
+        self._path_fields = {
+            field for _, field, _, _ in Formatter().parse(self.url) if field
+        }
+        self.data_selector = data_selector
+        self.base_params = base_params or {}
+        self.session = session or get_session()
+        self.limiter = limiter or HostLimiter()
+        self.timeout = timeout
+        self.cursor_field = cursor_field
+        self.schema = schema
+        # Metrics label, e.g. "voteringlista" for voteringlista.votering
+        self.name = data_selector.split(".", 1)[0]
+
+    def _request(self, params: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Split a unit's params into the request URL and its query params."""
+        if not self._path_fields:
+            return self.url, {**self.base_params, **params}
+        url = self.url.format(**{field: params[field] for field in self._path_fields})
+        query = {
+            name: value for name, value in params.items() if name not in self._path_fields
+        }
+        return url, {**self.base_params, **query}
+
+    @contextmanager
+    def _open(self, params: Dict[str, Any], url: Optional[str] = None):
+        """
+        Issue the request for a work unit and hold its streamed response.
+
+        An explicit ``url`` (e.g. a next-page link returned by the API) is
+        requested as-is, without the base params.
+        """
+        if url is None:
+            url, query = self._request(params)
+        else:
+            query = None
+        with self.limiter.slot(url):
+            response = self.session.get(
+                url,
+                params=query,
+                timeout=self.timeout,
+                stream=True,
+            )
+            try:
+                response.raise_for_status()
+                yield response
+            finally:
+                response.close()
+
+    def create_reader(self) -> PageReader:
+        """Create a decoder for one response of this endpoint."""
+        if self.schema is not None:
+            from .columnar import ArrowPageReader
+
+            return ArrowPageReader(self.data_selector, self.schema, cursor_field=self.cursor_field)
+        return PageReader(self.data_selector, cursor_field=self.cursor_field)
+
+    def iter_batches(
+        self,
+        params: Dict[str, Any],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        reader: Optional[PageReader] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream the records of one work unit in batches as they are decoded."""
+        metrics = get_metrics()
+        started = time.monotonic()
+        reader = reader or self.create_reader()
+        with self._open(params) as response:
+            for batch in reader.iter_batches(response_body(response), batch_size=batch_size):
+                metrics.record_page(self.name, rows=len(batch))
+                yield batch
+        metrics.record_work_unit(self.name, time.monotonic() - started)
+
+    def _fetch(self, params: Dict[str, Any], url: Optional[str] = None) -> Page:
+        started = time.monotonic()
+        reader = self.create_reader()
+        with self._open(params, url=url) as response:
+            if self.schema is not None:
+                rows = _concat_tables(reader.iter_batches(response_body(response)))
+            else:
+                rows = list(reader.iter_records(response_body(response)))
+            size = int(response.headers.get("Content-Length") or 0)
+
+        metrics = get_metrics()
+        metrics.record_page(self.name, rows=len(rows), size=size)
+        metrics.record_work_unit(self.name, time.monotonic() - started)
+        return Page(unit=params, rows=rows, attributes=reader.attributes)
+
+    def __call__(self, params: Dict[str, Any]) -> Page:
+        """Fetch the records for one work unit."""
+        return self._fetch(params)
+
+    def follow(self, url: str, unit: Dict[str, Any]) -> Page:
+        """Fetch a linked page of a work unit, e.g. its @nasta_sida."""
+        return self._fetch(unit, url=url)
+
+
+def _concat_tables(batches: Iterable[Any]) -> Any:
+    """Concatenate a page's Arrow batches; empty pages become an empty list."""
+    import pyarrow as pa
+
+    tables = list(batches)
+    if not tables:
+        return []
+    return pa.concat_tables(tables, promote_options="default")
+
+
+def fan_out(
+    units: Iterable[Dict[str, Any]],
+    fetch: Callable[[Dict[str, Any]], Page],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    split: Optional[Callable[[Page], Optional[List[Dict[str, Any]]]]] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Run work units concurrently and yield their pages as they complete.
+
+    At most ``max_workers`` units are in flight at any time, so memory stays
+    bounded by ``max_workers`` pages regardless of the size of the grid. Under
+    a memory budget (see ingestion.memory) fewer units may run, and completed
+    pages beyond the budget wait in spill files. Pages are yielded in
+    completion order; work units must not depend on each other.
+
+    If ``split`` is given it is called with every fetched page. Returning a list
+    of smaller work units discards the page and schedules those units instead,
+    which lets callers bisect units whose response was truncated.
+
+    Args:
+        units: Request parameters for each work unit (e.g. {"rm": ..., "valkrets": ...}).
+        fetch: Callable returning the page for a single work unit.
+        max_workers: Maximum number of concurrent work units.
+        split: Optional callable returning replacement work units for a page.
+
+    Yields:
+        Non-empty lists of records, one per completed work unit.
+    """
+    pending = deque(units)
+    in_flight = set()
+    done = deque()
+    budget = get_memory_budget()
+
+    def run(unit: Dict[str, Any]) -> Page:
+        page = fetch(unit)
+        # Held pages count against the memory budget until they are yielded
+        return page._replace(rows=budget.hold(page.rows)) if budget else page
+
+    def discard(future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            budget.discard(future.result().rows)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="riksdagen") as pool:
+        try:
+            while pending or in_flight:
+                while (
+                    pending
+                    and len(in_flight) < max_workers
+                    and (budget is None or budget.admits(len(in_flight)))
+                ):
+                    in_flight.add(pool.submit(run, pending.popleft()))
+
+                completed, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                done.extend(completed)
+                while done:
+                    page = done.popleft().result()
+                    held = page.rows
+                    if budget:
+                        page = page._replace(rows=budget.restore(held))
+                    try:
+                        children = split(page) if split else None
+                        if children:
+                            pending.extend(children)
+                        elif page.rows:
+                            yield page.rows
+                    finally:
+                        if budget:
+                            budget.release(held)
+        finally:
+            # Don't start anything new if the consumer stopped early or a unit failed.
+            # Units already running finish during the pool's shutdown; their pages
+            # are dropped as they complete so holds and spill files are released.
+            for future in in_flight:
+                if not future.cancel() and budget:
+                    future.add_done_callback(discard)
+            if budget:
+                for future in done:
+                    discard(future)
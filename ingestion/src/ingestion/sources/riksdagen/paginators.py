@@ -4,9 +4,17 @@ Custom paginators for Riksdagen API resources.
 Some resources don't support standard pagination and require custom logic.
 """
 
-from typing import Any, Dict, Optional
+from datetime import date
+from typing import Any, Dict, List, Optional
 from dlt.sources.helpers.rest_client.paginators import BasePaginator
 
+from .catalogue import (
+    current_riksmote,
+    get_sessions,
+    get_valkrets_grid,
+    riksmote_for_date,
+)
+
 
 class RiksmotePaginator(BasePaginator):
     """
@@ -18,45 +26,13 @@ class RiksmotePaginator(BasePaginator):
     """
     
     def __init__(self, start_date: str | None = None, end_date: str | None = None):
-        # All parliamentary sessions from most recent to oldest
-        # Format: YYYY/YY (e.g., 2024/25, 2023/24, etc.)
-        all_sessions = [
-            "2024/25", "2023/24", "2022/23", "2021/22", "2020/21", "2019/20", 
-            "2018/19", "2017/18", "2016/17", "2015/16", "2014/15", "2013/14",
-            "2012/13", "2011/12", "2010/11", "2009/10", "2008/09", "2007/08",
-            "2006/07", "2005/06", "2004/05", "2003/04", "2002/03", "2001/02",
-            "2000/01", "1999/00", "1998/99", "1997/98", "1996/97", "1995/96",
-            "1994/95", "1993/94", "1992/93", "1991/92", "1990/91"
-        ]
-        
-        # Filter sessions based on date range if provided
-        self.riksmote_sessions = self._filter_sessions_by_date(all_sessions, start_date, end_date)
+        # Parliamentary sessions in range from most recent to oldest
+        # Format: YYYY/YY (e.g., 2024/25, 2023/24, etc.), see catalogue
+        self.riksmote_sessions = get_sessions(start_date, end_date)
         self.current_session_index = 0
-        self._has_next_page = True
+        self._has_next_page = bool(self.riksmote_sessions)
         self.first_request = True
     
-    def _filter_sessions_by_date(self, sessions: list[str], start_date: str | None, end_date: str | None) -> list[str]:
-        """Filter riksmöte sessions based on date range."""
-        if not start_date and not end_date:
-            return sessions
-        
-        # Parse dates to extract years
-        start_year = int(start_date[:4]) if start_date else 1990
-        end_year = int(end_date[:4]) if end_date else 2025
-        
-        # Filter sessions that fall within the date range
-        # A session like "2024/25" spans from September 2024 to June 2025
-        filtered = []
-        for session in sessions:
-            session_start_year = int(session[:4])
-            session_end_year = int("20" + session[5:7])  # Convert "25" to 2025
-            
-            # Include session if it overlaps with the date range
-            if session_start_year <= end_year and session_end_year >= start_year:
-                filtered.append(session)
-        
-        return filtered if filtered else sessions
-    
     def update_state(self, response: Any, data: Any = None) -> None:
         """Update paginator state based on response."""
         try:
@@ -76,6 +52,10 @@ class RiksmotePaginator(BasePaginator):
         except Exception:
             self._has_next_page = False
     
+    def work_units(self) -> List[Dict[str, Any]]:
+        """Get request parameters for every riksmöte session in range."""
+        return [{'rm': session} for session in self.riksmote_sessions]
+    
     def get_next_request_params(self) -> Optional[Dict[str, Any]]:
         """Get parameters for the next request."""
         if not self._has_next_page or self.current_session_index >= len(self.riksmote_sessions):
@@ -99,9 +79,11 @@ class RiksmotePaginator(BasePaginator):
         """Initialize the first request with rm parameter."""
         # Add rm parameter for the first session
         params = self.get_initial_request_params()
-        if params:
-            if hasattr(request, 'params'):
-                request.params.update(params)
+        if not params:
+            # Without rm the endpoint returns speeches of every session
+            raise ValueError("No Riksmöte sessions in the date range to fetch")
+        if hasattr(request, 'params'):
+            request.params.update(params)
         return request
     
     def update_request(self, request: Any) -> Any:
@@ -142,109 +124,65 @@ class VoteringlistaIncrementalPaginator(BasePaginator):
     
     For incremental loads, fetches the latest riksmöte across all valkrets.
     Uses systemdatum as cursor for filtering new records.
-    Supports date filtering to specify which riksmöte to fetch.
+    Supports date filtering to specify which riksmöte to fetch: a range with a
+    start date covers every riksmöte it overlaps, so a run over e.g. a packed
+    range of partitions that crosses September does not skip a session.
     """
     
     def __init__(self, start_date: str | None = None, end_date: str | None = None):
-        # Electoral districts (valkrets) - same as full refresh
-        self.valkretsar = [
-            "Blekinge län",
-            "Dalarnas län",
-            "Gotlands län",
-            "Gävleborgs län",
-            "Göteborgs kommun",
-            "Hallands län",
-            "Jämtlands län",
-            "Jönköpings län",
-            "Kalmar län",
-            "Kronobergs län",
-            "Malmö kommun",
-            "Norrbottens län",
-            "Skåne läns norra och östra",
-            "Skåne läns södra",
-            "Skåne läns västra",
-            "Stockholms kommun",
-            "Stockholms län",
-            "Södermanlands län",
-            "Uppsala län",
-            "Värmlands län",
-            "Västerbottens län",
-            "Västernorrlands län",
-            "Västmanlands län",
-            "Västra Götalands läns norra",
-            "Västra Götalands läns södra",
-            "Västra Götalands läns västra",
-            "Västra Götalands läns östra",
-            "Örebro län",
-            "Östergötlands län"
-        ]
-        
-        # Determine riksmöte based on end_date or use latest
-        self.current_riksmote = self._determine_riksmote(end_date)
-        self.current_valkrets_index = 0
-        self._has_next_page = True
+        self.riksmote_sessions = self._determine_sessions(start_date, end_date)
+        # Riksmöte × Valkrets combinations, with the valkretsar (electoral
+        # districts) that have votes in each session
+        self.units = get_valkrets_grid(self.riksmote_sessions)
+        self.current_unit_index = 0
+        self._has_next_page = bool(self.units)
         self.first_request = True
     
-    def _determine_riksmote(self, end_date: str | None) -> str:
-        """Determine which riksmöte to fetch based on end_date."""
+    def _determine_sessions(self, start_date: str | None, end_date: str | None) -> List[str]:
+        """Determine which riksmöten to fetch: those in the range, the one containing end_date, or the ongoing one."""
+        if start_date:
+            return get_sessions(start_date, end_date)
         if not end_date:
-            return "2024/25"  # Default to latest
-        
-        # Extract year from end_date
-        end_year = int(end_date[:4])
-        
-        # Map year to riksmöte (sessions run Sep-Jun, so 2024 could be 2023/24 or 2024/25)
-        # Use the session that starts in that year
-        next_year_suffix = str(end_year + 1)[2:]
-        return f"{end_year}/{next_year_suffix}"
+            return [current_riksmote()]
+        return [riksmote_for_date(date.fromisoformat(end_date[:10]))]
     
     def update_state(self, response: Any, data: Any = None) -> None:
         """Update paginator state based on response."""
         try:
-            # Extract data to detect riksmöte if needed
-            if data is not None and isinstance(data, list) and len(data) > 0:
-                # Get riksmöte from first record to ensure we're on the right session
-                first_record = data[0]
-                if 'rm' in first_record:
-                    self.current_riksmote = first_record['rm']
-            
-            # Move to next valkrets
-            self.current_valkrets_index += 1
+            # Move to next (riksmöte, valkrets) combination
+            self.current_unit_index += 1
             
-            # If we've exhausted all valkretsar, we're done (incremental only needs latest riksmöte)
-            self._has_next_page = self.current_valkrets_index < len(self.valkretsar)
+            # If we've exhausted all combinations, we're done
+            self._has_next_page = self.current_unit_index < len(self.units)
                 
         except Exception:
             self._has_next_page = False
     
+    def work_units(self) -> List[Dict[str, Any]]:
+        """Get request parameters for every valkrets of the targeted riksmöten."""
+        return [dict(unit) for unit in self.units]
+    
     def get_next_request_params(self) -> Optional[Dict[str, Any]]:
         """Get parameters for the next request."""
-        if not self._has_next_page or self.current_valkrets_index >= len(self.valkretsar):
+        if not self._has_next_page or self.current_unit_index >= len(self.units):
             return None
         
-        current_valkrets = self.valkretsar[self.current_valkrets_index]
-        
-        return {
-            'rm': self.current_riksmote,
-            'valkrets': current_valkrets
-        }
+        return dict(self.units[self.current_unit_index])
     
     def get_initial_request_params(self) -> Dict[str, Any]:
         """Get parameters for the initial request."""
-        if self.current_valkrets_index < len(self.valkretsar):
-            current_valkrets = self.valkretsar[self.current_valkrets_index]
-            return {
-                'rm': self.current_riksmote,
-                'valkrets': current_valkrets
-            }
+        if self.current_unit_index < len(self.units):
+            return dict(self.units[self.current_unit_index])
         return {}
     
     def init_request(self, request: Any) -> Any:
         """Initialize the first request with rm and valkrets parameters."""
         params = self.get_initial_request_params()
-        if params:
-            if hasattr(request, 'params'):
-                request.params.update(params)
+        if not params:
+            # Without rm and valkrets the endpoint returns unfiltered votes
+            raise ValueError("No Riksmöte × Valkrets units in the date range to fetch")
+        if hasattr(request, 'params'):
+            request.params.update(params)
         return request
     
     def update_request(self, request: Any) -> Any:
@@ -271,9 +209,8 @@ class VoteringlistaIncrementalPaginator(BasePaginator):
     
     def reset(self) -> None:
         """Reset paginator state."""
-        self.current_riksmote = "2024/25"
-        self.current_valkrets_index = 0
-        self._has_next_page = True
+        self.current_unit_index = 0
+        self._has_next_page = bool(self.units)
         self.first_request = True
 
 
@@ -287,126 +224,58 @@ class VoteringlistaPaginator(BasePaginator):
     """
     
     def __init__(self, start_date: str | None = None, end_date: str | None = None):
-        # All parliamentary sessions
-        all_sessions = [
-            "2024/25", "2023/24", "2022/23", "2021/22", "2020/21", "2019/20", 
-            "2018/19", "2017/18", "2016/17", "2015/16", "2014/15", "2013/14",
-            "2012/13", "2011/12", "2010/11", "2009/10", "2008/09", "2007/08",
-            "2006/07", "2005/06", "2004/05", "2003/04", "2002/03", "2001/02",
-            "2000/01", "1999/00", "1998/99", "1997/98", "1996/97", "1995/96",
-            "1994/95", "1993/94", "1992/93", "1991/92", "1990/91"
-        ]
-        
-        # Filter sessions based on date range if provided
-        self.riksmote_sessions = self._filter_sessions_by_date(all_sessions, start_date, end_date)
+        # Parliamentary sessions in range, see catalogue
+        self.riksmote_sessions = get_sessions(start_date, end_date)
         
-        # Electoral districts (valkrets)
-        self.valkretsar = [
-            "Blekinge län",
-            "Dalarnas län",
-            "Gotlands län",
-            "Gävleborgs län",
-            "Göteborgs kommun",
-            "Hallands län",
-            "Jämtlands län",
-            "Jönköpings län",
-            "Kalmar län",
-            "Kronobergs län",
-            "Malmö kommun",
-            "Norrbottens län",
-            "Skåne läns norra och östra",
-            "Skåne läns södra",
-            "Skåne läns västra",
-            "Stockholms kommun",
-            "Stockholms län",
-            "Södermanlands län",
-            "Uppsala län",
-            "Värmlands län",
-            "Västerbottens län",
-            "Västernorrlands län",
-            "Västmanlands län",
-            "Västra Götalands läns norra",
-            "Västra Götalands läns södra",
-            "Västra Götalands läns västra",
-            "Västra Götalands läns östra",
-            "Örebro län",
-            "Östergötlands län"
-        ]
+        # Riksmöte × Valkrets combinations, with the valkretsar of each session
+        self.units = get_valkrets_grid(self.riksmote_sessions)
         
-        self.current_riksmote_index = 0
-        self.current_valkrets_index = 0
-        self._has_next_page = True
+        self.current_unit_index = 0
+        self._has_next_page = bool(self.units)
         self.first_request = True
     
-    def _filter_sessions_by_date(self, sessions: list[str], start_date: str | None, end_date: str | None) -> list[str]:
-        """Filter riksmöte sessions based on date range."""
-        if not start_date and not end_date:
-            return sessions
-        
-        # Parse dates to extract years
-        start_year = int(start_date[:4]) if start_date else 1990
-        end_year = int(end_date[:4]) if end_date else 2025
-        
-        # Filter sessions that fall within the date range
-        filtered = []
-        for session in sessions:
-            session_start_year = int(session[:4])
-            session_end_year = int("20" + session[5:7])  # Convert "25" to 2025
-            
-            # Include session if it overlaps with the date range
-            if session_start_year <= end_year and session_end_year >= start_year:
-                filtered.append(session)
-        
-        return filtered if filtered else sessions
-    
     def update_state(self, response: Any, data: Any = None) -> None:
         """Update paginator state based on response."""
         try:
             # Move to next combination after processing current one
-            self.current_valkrets_index += 1
-            
-            # If we've exhausted all valkretsar for current riksmöte, move to next riksmöte
-            if self.current_valkrets_index >= len(self.valkretsar):
-                self.current_valkrets_index = 0
-                self.current_riksmote_index += 1
+            self.current_unit_index += 1
             
             # Check if we've exhausted all combinations
-            self._has_next_page = self.current_riksmote_index < len(self.riksmote_sessions)
+            self._has_next_page = self.current_unit_index < len(self.units)
                 
         except Exception:
             self._has_next_page = False
     
+    def work_units(self) -> List[Dict[str, Any]]:
+        """
+        Get request parameters for every Riksmöte × Valkrets combination.
+        
+        Each combination is independent of the others, so the full grid can be
+        fetched concurrently instead of walking it through update_state.
+        """
+        return [dict(unit) for unit in self.units]
+    
     def get_next_request_params(self) -> Optional[Dict[str, Any]]:
         """Get parameters for the next request."""
-        if not self._has_next_page or self.current_riksmote_index >= len(self.riksmote_sessions):
+        if not self._has_next_page or self.current_unit_index >= len(self.units):
             return None
         
-        current_riksmote = self.riksmote_sessions[self.current_riksmote_index]
-        current_valkrets = self.valkretsar[self.current_valkrets_index]
-        
-        return {
-            'rm': current_riksmote,
-            'valkrets': current_valkrets
-        }
+        return dict(self.units[self.current_unit_index])
     
     def get_initial_request_params(self) -> Dict[str, Any]:
         """Get parameters for the initial request."""
-        if (self.current_riksmote_index < len(self.riksmote_sessions) and 
-            self.current_valkrets_index < len(self.valkretsar)):
-            current_riksmote = self.riksmote_sessions[self.current_riksmote_index]
-            current_valkrets = self.valkretsar[self.current_valkrets_index]
-            return {
-                'rm': current_riksmote,
-                'valkrets': current_valkrets
-            }
+        if self.current_unit_index < len(self.units):
+            return dict(self.units[self.current_unit_index])
         return {}
     
     def init_request(self, request: Any) -> Any:
         """Initialize the first request with rm and valkrets parameters."""
         params = self.get_initial_request_params()
-        if params:
-            if hasattr(request, 'params'):
-                request.params.update(params)
+        if not params:
+            # Without rm and valkrets the endpoint returns unfiltered votes
+            raise ValueError("No Riksmöte × Valkrets units in the date range to fetch")
+        if hasattr(request, 'params'):
+            request.params.update(params)
         return request
     
     def update_request(self, request: Any) -> Any:
@@ -433,9 +302,8 @@ class VoteringlistaPaginator(BasePaginator):
     
     def reset(self) -> None:
         """Reset paginator state."""
-        self.current_riksmote_index = 0
-        self.current_valkrets_index = 0
-        self._has_next_page = True
+        self.current_unit_index = 0
+        self._has_next_page = bool(self.units)
         self.first_request = True
 
 
@@ -454,22 +322,24 @@ class AnforandelistaPaginator(BasePaginator):
         self._has_next_page = True
     
     def update_state(self, response: Any, data: Any = None) -> None:
-        """Update paginator state based on response."""
-        if not response or not hasattr(response, 'json'):
+        """
+        Update paginator state based on response.
+        
+        `data` is the anforande list dlt already extracted with the data
+        selector, so the cursor is read from it instead of decoding the
+        (multi-megabyte) response body a second time.
+        """
+        if data is None:
             self.has_more_pages = False
+            self._has_next_page = False
             return
         
         try:
-            # Use the data parameter if provided, otherwise parse response
-            if data is not None:
-                json_data = data
-            else:
-                json_data = response.json()
-            
-            anforanden = json_data.get('anforandelista', {}).get('anforande', [])
+            anforanden = data if isinstance(data, list) else [data]
             
             if not anforanden:
                 self.has_more_pages = False
+                self._has_next_page = False
                 return
             
             # Find the latest dok_datum in the response
@@ -0,0 +1,207 @@
+"""
+Cost estimates for Riksdagen work units, before anything is fetched.
+
+Every list endpoint reports its total number of hits next to the records
+(@antal for anforandelista and voteringlista, @traffar for dokumentlista). The
+planner requests each work unit with a page size of 1, which costs one small
+response, and turns the reported total into estimated rows, pages, requests and
+bytes per unit. Bytes are extrapolated from the size of the probed records,
+averaged over all units of the resource.
+
+The estimates let the orchestrator size tasks and choose parallelism, and let
+parallel fetchers balance work by cost instead of by unit count.
+"""
+
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from .fanout import WorkUnitFetcher
+from .resources import anforandelista, dokumentlista, voteringlista
+from .streaming import Page
+
+PROBE_SIZE = 1
+
+
+@dataclass
+class UnitEstimate:
+    """Estimated cost of one work unit."""
+
+    unit: Dict[str, Any]
+    rows: int
+    pages: int
+    requests: int
+    bytes: int
+    # False when the API did not report a total and rows is a lower bound
+    counted: bool = True
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _reported_total(page: Page, attribute: str) -> Optional[int]:
+    try:
+        return int(page.attributes[attribute])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _probe_fetcher(endpoint: Dict[str, Any], size_param: str, exclude=()) -> WorkUnitFetcher:
+    params = {name: value for name, value in endpoint["params"].items() if name not in exclude}
+    return WorkUnitFetcher(
+        path=endpoint["path"],
+        data_selector=endpoint["data_selector"],
+        base_params={**params, size_param: PROBE_SIZE},
+    )
+
+
+def estimate_units(
+    probe: WorkUnitFetcher,
+    units: List[Dict[str, Any]],
+    total_attribute: str,
+    page_size: int,
+    max_workers: int = 1,
+    requests_for: Optional[Callable[[Dict[str, Any], int], int]] = None,
+) -> List[UnitEstimate]:
+    """
+    Probe every unit and estimate its rows, pages, requests and bytes.
+
+    Args:
+        probe: Fetcher requesting a single record per unit.
+        units: Work units as passed to the resource's fetcher.
+        total_attribute: List attribute holding the unit's total hits.
+        page_size: Records per page in a real run.
+        max_workers: Number of probes in flight.
+        requests_for: Optional callable returning the number of requests a
+            unit needs given its rows, for resources that split units
+            instead of paginating them. Defaults to one request per page.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="riksdagen-plan") as pool:
+        pages = list(pool.map(probe, units))
+    return estimate_pages(pages, total_attribute, page_size, requests_for=requests_for)
+
+
+def estimate_pages(
+    pages: List[Page],
+    total_attribute: str,
+    page_size: int,
+    requests_for: Optional[Callable[[Dict[str, Any], int], int]] = None,
+) -> List[UnitEstimate]:
+    """Estimate every unit from a probe that has already been fetched (see estimate_units)."""
+    sample = [row for page in pages for row in page.rows]
+    bytes_per_row = (
+        sum(len(json.dumps(row, ensure_ascii=False).encode("utf-8")) for row in sample) / len(sample)
+        if sample
+        else 0
+    )
+
+    estimates = []
+    for page in pages:
+        total = _reported_total(page, total_attribute)
+        rows = total if total is not None else len(page.rows)
+        unit_pages = max(1, math.ceil(rows / page_size))
+        estimates.append(
+            UnitEstimate(
+                unit=page.unit,
+                rows=rows,
+                pages=unit_pages,
+                requests=requests_for(page.unit, rows) if requests_for else unit_pages,
+                bytes=round(rows * bytes_per_row),
+                counted=total is not None,
+            )
+        )
+    return estimates
+
+
+def plan_anforandelista(
+    start_date: str | None = None, end_date: str | None = None, max_workers: int = 1
+) -> List[UnitEstimate]:
+    """Estimate every Riksmöte session unit, including sessions that will be split by day."""
+    endpoint = anforandelista.get_resource(start_date, end_date)["endpoint"]
+    page_size = endpoint["params"]["sz"]
+
+    def requests_for(unit: Dict[str, Any], rows: int) -> int:
+        if rows <= page_size:
+            return 1
+        # Truncated sessions are re-fetched one day at a time
+        return 1 + len(anforandelista.session_days(unit["rm"], start_date, end_date))
+
+    return estimate_units(
+        _probe_fetcher(endpoint, "sz"),
+        anforandelista.get_work_units(start_date=start_date, end_date=end_date),
+        total_attribute="@antal",
+        page_size=page_size,
+        max_workers=max_workers,
+        requests_for=requests_for,
+    )
+
+
+def plan_voteringlista(
+    start_date: str | None = None, end_date: str | None = None, max_workers: int = 1
+) -> List[UnitEstimate]:
+    """Estimate every (rm, valkrets) unit of the grid, across all sessions in the range."""
+    endpoint = voteringlista.get_resource()["endpoint"]
+    # The endpoint has no further pages: a unit over the cap is truncated
+    return estimate_units(
+        _probe_fetcher(endpoint, "sz"),
+        voteringlista.get_work_units(
+            incremental=False, start_date=start_date, end_date=end_date
+        ),
+        total_attribute="@antal",
+        page_size=endpoint["params"]["sz"],
+        max_workers=max_workers,
+        requests_for=lambda unit, rows: 1,
+    )
+
+
+def plan_dokumentlista(
+    start_date: str | None = None, end_date: str | None = None, max_workers: int = 1
+) -> List[UnitEstimate]:
+    """Estimate the date windows a sharded backfill would fetch."""
+    endpoint = dokumentlista.get_resource(start_date, end_date)["endpoint"]
+    probe = _probe_fetcher(endpoint, "antal", exclude=("from", "tom"))
+    # The probes that planned the windows already carry each window's @traffar
+    pages = dokumentlista.probe_windows(
+        probe,
+        start_date or dokumentlista.INITIAL_INCREMENTAL_VALUE,
+        end_date or dokumentlista.get_default_end_date(),
+        max_workers=max_workers,
+    )
+    return estimate_pages(pages, total_attribute="@traffar", page_size=endpoint["params"]["antal"])
+
+
+# Planners for every resource made up of several work units
+PLANNERS = {
+    "anforandelista": plan_anforandelista,
+    "dokumentlista": plan_dokumentlista,
+    "voteringlista": plan_voteringlista,
+}
+
+
+def plan(
+    resource_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    max_workers: int = 1,
+) -> Dict[str, Any]:
+    """Estimate the cost of loading a resource, per work unit and in total."""
+    estimates = PLANNERS[resource_name](
+        start_date=start_date, end_date=end_date, max_workers=max_workers
+    )
+    return {
+        "resource": resource_name,
+        "start_date": start_date,
+        "end_date": end_date,
+        "planned_at": datetime.now(timezone.utc).isoformat(),
+        "totals": {
+            "work_units": len(estimates),
+            "rows": sum(estimate.rows for estimate in estimates),
+            "pages": sum(estimate.pages for estimate in estimates),
+            "requests": sum(estimate.requests for estimate in estimates),
+            "bytes": sum(estimate.bytes for estimate in estimates),
+        },
+        "work_units": [estimate.as_dict() for estimate in estimates],
+    }
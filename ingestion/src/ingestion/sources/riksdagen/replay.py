@@ -0,0 +1,156 @@
+"""
+Recorded Riksdagen responses and a local server replaying them.
+
+Benchmarks and offline development need the real API's responses without the
+network. Two halves:
+
+- Recording: with RIKSDAGEN_RECORD_DIR set, every session created through
+  riksdagen.client stores each successful GET response as a fixture, keyed by
+  path and sorted query params (the host is not part of the key).
+- Replay: FixtureServer serves a fixture directory over HTTP on localhost.
+  Pointing RIKSDAGEN_BASE_URL at it (see serve_fixtures) runs every resource,
+  paginator and fan-out path unchanged, but offline. Absolute links in the
+  recorded bodies (e.g. dokumentlista's @nasta_sida) are rewritten to the
+  local server. Requests without a fixture get a 404.
+
+Layout:
+    <fixture_dir>/<key[:2]>/<key>.json.gz    recorded response body
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+RECORD_DIR_ENV_VAR = "RIKSDAGEN_RECORD_DIR"
+
+# Hosts whose absolute links in recorded bodies point back at the API
+_API_ORIGINS = (b"https://data.riksdagen.se/", b"http://data.riksdagen.se/")
+
+
+def get_record_dir() -> Optional[str]:
+    """Get the fixture recording directory from env, or None when not recording."""
+    return os.environ.get(RECORD_DIR_ENV_VAR) or None
+
+
+def fixture_key(url: str) -> str:
+    """Key a request by path and sorted query params, independent of the host."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    raw = f"{parts.path.rstrip('/')}?{query}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """Directory of gzip-compressed response bodies keyed by fixture_key."""
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json.gz"
+
+    def save(self, url: str, body: bytes) -> None:
+        path = self._path(fixture_key(url))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(gzip.compress(body))
+        os.replace(tmp_path, path)
+
+    def load(self, url: str) -> Optional[bytes]:
+        try:
+            return gzip.decompress(self._path(fixture_key(url)).read_bytes())
+        except FileNotFoundError:
+            return None
+
+
+class RecordingAdapter(BaseAdapter):
+    """requests transport adapter that stores every 200 GET response in a FixtureStore."""
+
+    def __init__(self, store: FixtureStore, delegate: Optional[BaseAdapter] = None):
+        super().__init__()
+        self.store = store
+        self.delegate = delegate or HTTPAdapter()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        response = self.delegate.send(request, **kwargs)
+        if request.method == "GET" and response.status_code == 200:
+            # Reads the body; streaming callers fall back to the buffered content
+            self.store.save(request.url, response.content)
+        return response
+
+    def close(self) -> None:
+        self.delegate.close()
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Local HTTP server answering API requests from a FixtureStore."""
+
+    daemon_threads = True
+
+    def __init__(self, directory: str | os.PathLike, port: int = 0):
+        self.store = FixtureStore(directory)
+        super().__init__(("127.0.0.1", port), _FixtureHandler)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    server: FixtureServer
+
+    def do_GET(self):
+        body = self.server.store.load(self.path)
+        if body is None:
+            self.send_error(404, "No fixture recorded for this request")
+            return
+
+        base_url = self.server.base_url.encode("utf-8")
+        for origin in _API_ORIGINS:
+            body = body.replace(origin, base_url)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve_fixtures(directory: str | os.PathLike) -> Iterator[str]:
+    """
+    Serve a fixture directory and point the Riksdagen client at it.
+
+    Sets RIKSDAGEN_BASE_URL for the duration of the block, so it must be
+    entered before any source or session is created. Yields the base URL.
+    """
+    from .client import BASE_URL_ENV_VAR
+
+    server = FixtureServer(directory)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    previous = os.environ.get(BASE_URL_ENV_VAR)
+    os.environ[BASE_URL_ENV_VAR] = server.base_url
+    try:
+        yield server.base_url
+    finally:
+        if previous is None:
+            os.environ.pop(BASE_URL_ENV_VAR, None)
+        else:
+            os.environ[BASE_URL_ENV_VAR] = previous
+        server.shutdown()
+        server.server_close()
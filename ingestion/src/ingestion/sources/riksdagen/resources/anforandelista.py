@@ -6,8 +6,25 @@ Provides speeches (anföranden) from Riksdagen debates.
 Supports both incremental and backfill modes using systemnyckel as cursor.
 """
 
+from datetime import date, timedelta
+
+import dlt
+from dlt.common import logger
 from dlt.sources.rest_api import rest_api_source
 
+from ..catalogue import get_sessions, riksmote_span
+from ..client import get_client_config
+from ..fanout import (
+    DEFAULT_MAX_PER_HOST,
+    HostLimiter,
+    Page,
+    WorkUnitFetcher,
+    fan_out,
+)
+from ..schemas import SCHEMAS
+from ..streaming import stream_units
+from ..transforms import to_arrow_pages
+
 INITIAL_INCREMENTAL_VALUE = "0"  # Start from beginning
 DEFAULT_PAGE_SIZE = 20000  # Maximum allowed page size (soft limit)
 
@@ -90,8 +107,171 @@ def get_paginator_config() -> dict:
     }
 
 
+def get_work_units(
+    start_date: str | None = None, end_date: str | None = None, incremental: bool = True
+) -> list[dict]:
+    """
+    Get one work unit per Riksmöte session covered by this resource.
+
+    Incremental runs cover the same sessions (the systemnyckel cursor filters
+    rows, not requests); `incremental` is accepted for symmetry with voteringlista.
+    """
+    return get_paginator(start_date, end_date).work_units()
+
+
+def is_truncated(page: Page, page_size: int = DEFAULT_PAGE_SIZE) -> bool:
+    """
+    Check whether a response was cut off at the page-size cap.
+
+    Prefers the API's reported hit count (@antal), which is known before the
+    records have been decoded, and falls back to treating a completely full
+    page as truncated.
+    """
+    total = page.attributes.get("@antal")
+    if total is not None:
+        try:
+            return int(total) > page_size
+        except (TypeError, ValueError):
+            pass
+    return len(page.rows) >= page_size
+
+
+def session_days(
+    riksmote: str, start_date: str | None = None, end_date: str | None = None
+) -> list[str]:
+    """List the calendar days of a Riksmöte (Sep 1 – Aug 31), clipped to the date range."""
+    first, last = riksmote_span(riksmote)
+
+    if start_date:
+        first = max(first, date.fromisoformat(start_date))
+    if end_date:
+        last = min(last, date.fromisoformat(end_date))
+
+    return [
+        (first + timedelta(days=offset)).isoformat()
+        for offset in range((last - first).days + 1)
+    ]
+
+
+def create_session_splitter(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+):
+    """
+    Create a fan_out split callback that sub-divides truncated sessions.
+
+    A session whose response hits the page-size cap is replaced by one work
+    unit per day of the session, using the 'd' (dok_datum) filter. The endpoint
+    has no from/to date range, so single days are the finest slice available;
+    a day that is still truncated is logged and kept as is.
+    """
+
+    def split(page: Page) -> list[dict] | None:
+        if not is_truncated(page, page_size):
+            return None
+
+        riksmote = page.unit.get("rm")
+        if not riksmote or "d" in page.unit:
+            logger.warning(
+                f"anforandelista slice {page.unit} hit the page-size cap of {page_size} "
+                "and cannot be split further; results may be incomplete"
+            )
+            return None
+
+        days = session_days(riksmote, start_date, end_date)
+        logger.info(
+            f"anforandelista session {riksmote} truncated at {len(page.rows)} rows, "
+            f"splitting into {len(days)} daily slices"
+        )
+        return [{"rm": riksmote, "d": day} for day in days]
+
+    return split
+
+
+def create_work_unit_resource(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    max_workers: int = 1,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    work_units: list[dict] | None = None,
+    arrow: bool = False,
+    incremental: bool = True,
+):
+    """
+    Create an anforandelista dlt resource that fetches sessions directly.
+
+    Every Riksmöte session is fetched as an independent work unit and decoded
+    incrementally. With max_workers > 1 sessions run on a bounded thread pool;
+    with 1 they are streamed one after another in row batches. Sessions whose
+    response hits the page-size cap are split into smaller slices until they
+    fit, instead of being silently truncated as with RiksmotePaginator.
+
+    Args:
+        start_date: Optional start date for backfill (format: YYYY-MM-DD).
+        end_date: Optional end date for backfill (format: YYYY-MM-DD).
+        max_workers: Maximum number of work units in flight (1 = serial streaming).
+        max_per_host: Maximum concurrent requests against data.riksdagen.se.
+        work_units: Explicit subset of session units to fetch, e.g. the ones a
+            resumed backfill has not completed yet. Defaults to every session
+            in the date range.
+        arrow: Decode pages straight into Arrow tables with the declared
+            schema (see columnar) and normalize them (see transforms).
+        incremental: Filter rows by the systemnyckel cursor when no date range
+            is given (default: True).
+
+    Returns:
+        dlt resource yielding anforandelista rows.
+    """
+    resource_config = get_resource(start_date, end_date)
+    endpoint = resource_config["endpoint"]
+
+    units = work_units if work_units is not None else get_work_units(start_date, end_date)
+    fetch = WorkUnitFetcher(
+        path=endpoint["path"],
+        data_selector=endpoint["data_selector"],
+        base_params=endpoint["params"],
+        limiter=HostLimiter(max_per_host=max_per_host),
+        schema=SCHEMAS[resource_config["name"]] if arrow else None,
+    )
+    split = create_session_splitter(
+        start_date, end_date, page_size=endpoint["params"]["sz"]
+    )
+
+    def anforandelista_rows():
+        if max_workers > 1:
+            pages = fan_out(units, fetch, max_workers=max_workers, split=split)
+        else:
+            pages = stream_units(units, fetch, split=split)
+        yield from to_arrow_pages(pages, resource_config["name"]) if arrow else pages
+
+    resource = dlt.resource(
+        anforandelista_rows,
+        name=resource_config["name"],
+        write_disposition=resource_config["write_disposition"],
+        max_table_nesting=resource_config["max_table_nesting"],
+    )
+
+    if incremental and "incremental" in endpoint:
+        resource.apply_hints(
+            incremental=dlt.sources.incremental(
+                endpoint["incremental"]["cursor_path"],
+                initial_value=endpoint["incremental"]["initial_value"],
+            )
+        )
+
+    return resource
+
+
 def create_source(
-    start_date: str | None = None, end_date: str | None = None, verbose: bool = False
+    start_date: str | None = None,
+    end_date: str | None = None,
+    verbose: bool = False,
+    max_workers: int = 1,
+    stream: bool = False,
+    work_units: list[dict] | None = None,
+    arrow: bool = False,
+    incremental: bool = True,
 ):
     """
     Create a dlt source for anforandelista resource.
@@ -100,10 +280,42 @@ def create_source(
         start_date: Optional start date for backfill (format: YYYY-MM-DD).
         end_date: Optional end date for backfill (format: YYYY-MM-DD).
         verbose: Whether to enable verbose logging.
+        max_workers: Number of concurrent work units. 1 keeps the serial
+            RiksmotePaginator; anything higher fetches sessions in parallel and
+            splits sessions that exceed the page-size cap.
+        stream: Fetch sessions serially with streaming JSON decoding instead
+            of the paginator, so rows reach dlt while a page is still being read.
+        work_units: Only fetch these session units (see get_work_units).
+        arrow: Fetch sessions directly and yield normalized Arrow tables
+            instead of dicts, skipping dlt's per-row normalization.
+        incremental: Filter rows by the systemnyckel cursor when no date range
+            is given (default: True). Without it sessions are fetched directly.
 
     Returns:
         Configured dlt source with anforandelista resource and paginator.
     """
+    if work_units is None and (start_date or end_date) and not get_sessions(start_date, end_date):
+        # No Riksmöte overlaps the range (e.g. before 1990/91): load nothing instead
+        # of letting the paginator send a request without session filters
+        logger.warning(f"No Riksmöte sessions between {start_date} and {end_date}; anforandelista loads no rows")
+        work_units = []
+
+    if max_workers > 1 or stream or work_units is not None or arrow or not incremental:
+        resource = create_work_unit_resource(
+            start_date=start_date,
+            end_date=end_date,
+            max_workers=max_workers,
+            work_units=work_units,
+            arrow=arrow,
+            incremental=incremental,
+        )
+        return rest_api_source(
+            {
+                "client": get_client_config(),
+                "resources": [resource],
+            }
+        )
+
     # Get resource configuration
     resource_config = get_resource(start_date, end_date)
 
@@ -112,12 +324,7 @@ def create_source(
 
     # Create source configuration
     source_config = {
-        "client": {
-            "base_url": "https://data.riksdagen.se/",
-            "headers": {
-                "User-Agent": "riksbevakning-dagster/1.0",
-            },
-        },
+        "client": get_client_config(),
         "resources": [resource_config],
     }
 
@@ -6,13 +6,29 @@ Provides documents from Riksdagen including decisions, propositions, motions, an
 Supports both incremental and backfill modes.
 """
 
-from datetime import datetime
-from typing import Any, Dict
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
 
+import dlt
+import pyarrow.compute as pc
+from dlt.common import logger
 from dlt.sources.rest_api import rest_api_source
 
+from ..client import get_client_config
+from ..fanout import DEFAULT_MAX_PER_HOST, HostLimiter, WorkUnitFetcher, fan_out
+from ..streaming import Page
+from ..transforms import to_arrow_pages
+
 INITIAL_INCREMENTAL_VALUE = "2025-01-01"
-DEFAULT_END_DATE = "2025-06-01"
+WINDOW_TARGET_HITS = 3000  # Documents per date window in sharded backfills
+WATERMARK_FIELD = "systemdatum"  # Latest change seen in a partition
+
+
+def get_default_end_date() -> str:
+    """End of incremental ranges: today, so new documents are never cut off."""
+    return date.today().isoformat()
 
 
 def get_resource(start_date: str | None = None, end_date: str | None = None) -> dict:
@@ -60,7 +76,7 @@ def get_resource(start_date: str | None = None, end_date: str | None = None) ->
             "path": "dokumentlista/",
             "params": {
                 "utformat": "json",
-                "tom": DEFAULT_END_DATE,
+                "tom": get_default_end_date(),
                 "sort": "datum",
                 "sortorder": "asc",
                 "antal": 1000,
@@ -96,8 +112,287 @@ def get_paginator_config() -> dict:
     return {"type": "json_link", "next_url_path": "dokumentlista.@nasta_sida"}
 
 
+def normalize_publicerad(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce empty/invalid publicerad values to null to avoid destination cast errors."""
+    raw = row.get("publicerad")
+
+    if raw is None:
+        return row
+
+    if isinstance(raw, str):
+        cleaned = raw.strip()
+        if not cleaned:
+            row["publicerad"] = None
+            return row
+
+        try:
+            parsed = datetime.fromisoformat(cleaned.replace(" ", "T"))
+            # Use a normalized timestamp string DuckDB can cast consistently.
+            row["publicerad"] = parsed.isoformat(sep=" ", timespec="seconds")
+        except Exception:
+            row["publicerad_raw"] = raw
+            row["publicerad"] = None
+    else:
+        # Unexpected type: keep raw copy and null out parsed field
+        row["publicerad_raw"] = raw
+        row["publicerad"] = None
+
+    return row
+
+
+def _hits(page: Page) -> int:
+    """Get the total number of documents in a probed date window from @traffar."""
+    try:
+        return int(page.attributes.get("@traffar") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def split_window(window: Dict[str, str], parts: int) -> List[Dict[str, str]]:
+    """Split an inclusive from/tom window into up to `parts` contiguous windows."""
+    start = date.fromisoformat(window["from"])
+    end = date.fromisoformat(window["tom"])
+    days = (end - start).days + 1
+    parts = max(1, min(parts, days))
+
+    windows = []
+    for index in range(parts):
+        window_start = start + timedelta(days=days * index // parts)
+        window_end = start + timedelta(days=days * (index + 1) // parts - 1)
+        windows.append({"from": window_start.isoformat(), "tom": window_end.isoformat()})
+    return windows
+
+
+def probe_windows(
+    probe: WorkUnitFetcher,
+    start_date: str,
+    end_date: str,
+    target_hits: int = WINDOW_TARGET_HITS,
+    max_workers: int = 1,
+) -> List[Page]:
+    """
+    Split a backfill range into date windows of roughly `target_hits` documents.
+
+    The range's @traffar gives the number of windows to start from. Documents
+    are not spread evenly over time, so each window is probed again (in
+    parallel) and windows still holding more than twice the target are split
+    further. A single day is never split, however many documents it holds.
+
+    Returns the last probe of every planned window; its unit is the window.
+    """
+    window = {"from": start_date, "tom": end_date}
+    page = probe(window)
+    total = _hits(page)
+    if total == 0:
+        return []
+    if total <= 2 * target_hits:
+        return [page._replace(unit=window)]
+
+    pending = split_window(window, math.ceil(total / target_hits))
+    planned = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="riksdagen-probe") as pool:
+        while pending:
+            pages = list(pool.map(probe, pending))
+            next_pending = []
+            for candidate, page in zip(pending, pages):
+                count = _hits(page)
+                if count == 0:
+                    continue
+                if count > 2 * target_hits and candidate["from"] != candidate["tom"]:
+                    next_pending.extend(split_window(candidate, math.ceil(count / target_hits)))
+                else:
+                    planned.append(page._replace(unit=candidate))
+            pending = next_pending
+    return planned
+
+
+def plan_windows(
+    probe: WorkUnitFetcher,
+    start_date: str,
+    end_date: str,
+    target_hits: int = WINDOW_TARGET_HITS,
+    max_workers: int = 1,
+) -> List[Dict[str, str]]:
+    """Split a backfill range into date windows (see probe_windows)."""
+    pages = probe_windows(
+        probe, start_date, end_date, target_hits=target_hits, max_workers=max_workers
+    )
+    return [page.unit for page in pages]
+
+
+def _watermark(pages, field: str = WATERMARK_FIELD):
+    """Pass pages through while tracking the largest `field` value seen."""
+    tracker = {"max": None}
+
+    def observe(value):
+        if value is not None and (tracker["max"] is None or value > tracker["max"]):
+            tracker["max"] = value
+
+    def iterate():
+        for page in pages:
+            if isinstance(page, list):
+                for row in page:
+                    observe(row.get(field))
+            elif field in page.column_names:
+                observe(pc.max(page.column(field)).as_py())
+            yield page
+
+    return iterate(), tracker
+
+
+def create_sharded_resource(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    max_workers: int = 1,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    target_hits: int = WINDOW_TARGET_HITS,
+    arrow: bool = False,
+    partition: str | None = None,
+):
+    """
+    Create a dokumentlista dlt resource that backfills date windows concurrently.
+
+    Instead of one serial chain of @nasta_sida pages over the whole range, the
+    range is split into windows sized from the API's @traffar (see
+    plan_windows). Each window follows its own @nasta_sida chain, and up to
+    max_workers windows are fetched at once. Rows are merged on id as in the
+    paginator path. Without dates the range runs from the `datum` cursor of
+    the last load to today, as in incremental mode.
+
+    With a `partition` key (e.g. a Dagster daily partition) the range is a
+    partition with its own state instead of sharing the `datum` cursor: its
+    hit count, watermark (latest systemdatum) and completion time are kept in
+    the resource state under the key. A partition that completed before is
+    skipped as long as the API still reports the same number of hits and the
+    same latest systemdatum (probed by sorting on it), so re-materializing
+    partitions does not re-download them while edits to existing documents,
+    which leave the hit count unchanged, are still picked up. Run each partition
+    in its own pipeline (cli.py --partition) so concurrent partitions never
+    write the same dlt state.
+
+    Args:
+        start_date: Start date for backfill (format: YYYY-MM-DD).
+        end_date: End date for backfill (format: YYYY-MM-DD).
+        max_workers: Maximum number of windows in flight.
+        max_per_host: Maximum concurrent requests against data.riksdagen.se.
+        target_hits: Approximate number of documents per window.
+        arrow: Yield each window as a normalized Arrow table (see transforms)
+            instead of dicts cleaned by normalize_publicerad.
+        partition: Partition key of the range; requires both dates.
+
+    Returns:
+        dlt resource yielding dokumentlista rows.
+    """
+    if partition and not (start_date and end_date):
+        raise ValueError("A dokumentlista partition needs both start_date and end_date")
+
+    resource_config = get_resource(start_date, end_date)
+    endpoint = resource_config["endpoint"]
+    base_params = {
+        name: value
+        for name, value in endpoint["params"].items()
+        if name not in ("from", "tom")
+    }
+    limiter = HostLimiter(max_per_host=max_per_host)
+
+    fetcher = WorkUnitFetcher(
+        path=endpoint["path"],
+        data_selector=endpoint["data_selector"],
+        base_params=base_params,
+        limiter=limiter,
+    )
+    probe = WorkUnitFetcher(
+        path=endpoint["path"],
+        data_selector=endpoint["data_selector"],
+        base_params={**base_params, "antal": 1},
+        session=fetcher.session,
+        limiter=limiter,
+    )
+    # Most recently changed document of a range, for comparing with a partition's watermark
+    latest_probe = WorkUnitFetcher(
+        path=endpoint["path"],
+        data_selector=endpoint["data_selector"],
+        base_params={**base_params, "antal": 1, "sort": WATERMARK_FIELD, "sortorder": "desc"},
+        session=fetcher.session,
+        limiter=limiter,
+    )
+
+    def fetch_window(window: Dict[str, str]) -> Page:
+        page = fetcher(window)
+        rows = list(page.rows)
+        next_url = page.attributes.get("@nasta_sida")
+        while next_url:
+            page = fetcher.follow(next_url, window)
+            rows.extend(page.rows)
+            next_url = page.attributes.get("@nasta_sida")
+        return Page(unit=window, rows=rows, attributes={})
+
+    def fetch_range(range_start: str, range_end: str):
+        windows = plan_windows(
+            probe, range_start, range_end, target_hits=target_hits, max_workers=max_workers
+        )
+        pages = fan_out(windows, fetch_window, max_workers=max_workers)
+        return to_arrow_pages(pages, resource_config["name"]) if arrow else pages
+
+    if partition:
+        def dokumentlista_rows():
+            partitions = dlt.current.resource_state().setdefault("partitions", {})
+            previous = partitions.get(partition) or {}
+            latest = latest_probe({"from": start_date, "tom": end_date})
+            hits = _hits(latest)
+            changed_at = latest.rows[0].get(WATERMARK_FIELD) if latest.rows else None
+            if (
+                previous.get("completed_at")
+                and previous.get("hits") == hits
+                and previous.get("watermark") == changed_at
+            ):
+                logger.info(
+                    f"dokumentlista partition {partition} already loaded ({hits} documents, "
+                    f"last changed {changed_at}), skipping"
+                )
+                return
+
+            pages, watermark = _watermark(fetch_range(start_date, end_date))
+            yield from pages
+            # Only committed with the load package, i.e. once the rows are loaded
+            partitions[partition] = {
+                "from": start_date,
+                "tom": end_date,
+                "hits": hits,
+                "watermark": watermark["max"],
+                "completed_at": datetime.now(timezone.utc).isoformat(),
+            }
+    elif start_date and end_date:
+        def dokumentlista_rows():
+            yield from fetch_range(start_date, end_date)
+    else:
+        def dokumentlista_rows(
+            datum=dlt.sources.incremental(
+                endpoint["incremental"]["cursor_path"],
+                initial_value=endpoint["incremental"]["initial_value"],
+            ),
+        ):
+            yield from fetch_range(str(datum.start_value)[:10], get_default_end_date())
+
+    resource = dlt.resource(
+        dokumentlista_rows,
+        name=resource_config["name"],
+        write_disposition=resource_config["write_disposition"],
+        primary_key=resource_config["primary_key"],
+        max_table_nesting=resource_config["max_table_nesting"],
+    )
+    if not arrow:
+        resource.add_map(normalize_publicerad)
+    return resource
+
+
 def create_source(
-    start_date: str | None = None, end_date: str | None = None, verbose: bool = False
+    start_date: str | None = None,
+    end_date: str | None = None,
+    verbose: bool = False,
+    max_workers: int = 1,
+    arrow: bool = False,
+    partition: str | None = None,
 ):
     """
     Create a dlt source for dokumentlista resource.
@@ -106,10 +401,31 @@ def create_source(
         start_date: Optional start date for backfill (format: YYYY-MM-DD).
         end_date: Optional end date for backfill (format: YYYY-MM-DD).
         verbose: Whether to enable verbose logging.
+        max_workers: Number of concurrent date windows for backfills. 1 keeps
+            the serial @nasta_sida chain over the whole range.
+        arrow: Fetch date windows directly and yield normalized Arrow tables
+            instead of dicts, skipping dlt's per-row normalization.
+        partition: Load the date range as a partition with its own state
+            (see create_sharded_resource) instead of the shared cursor.
 
     Returns:
         Configured dlt source with dokumentlista resource and paginator.
     """
+    if (start_date and end_date and max_workers > 1) or arrow or partition:
+        resource = create_sharded_resource(
+            start_date=start_date,
+            end_date=end_date,
+            max_workers=max_workers,
+            arrow=arrow,
+            partition=partition,
+        )
+        return rest_api_source(
+            {
+                "client": get_client_config(),
+                "resources": [resource],
+            }
+        )
+
     # Get resource configuration
     resource_config = get_resource(start_date, end_date)
 
@@ -118,12 +434,7 @@ def create_source(
 
     # Create source configuration
     source_config = {
-        "client": {
-            "base_url": "https://data.riksdagen.se/",
-            "headers": {
-                "User-Agent": "riksbevakning-dagster/1.0",
-            },
-        },
+        "client": get_client_config(),
         "resources": [resource_config],
     }
 
@@ -132,34 +443,5 @@ def create_source(
         source_config["client"]["paginator"] = paginator
 
     source = rest_api_source(source_config)
-    resource = source.resources["dokumentlista"]
-
-    @resource.add_map
-    def normalize_publicerad(row: Dict[str, Any]) -> Dict[str, Any]:
-        """Coerce empty/invalid publicerad values to null to avoid destination cast errors."""
-        raw = row.get("publicerad")
-
-        if raw is None:
-            return row
-
-        if isinstance(raw, str):
-            cleaned = raw.strip()
-            if not cleaned:
-                row["publicerad"] = None
-                return row
-
-            try:
-                parsed = datetime.fromisoformat(cleaned.replace(" ", "T"))
-                # Use a normalized timestamp string DuckDB can cast consistently.
-                row["publicerad"] = parsed.isoformat(sep=" ", timespec="seconds")
-            except Exception:
-                row["publicerad_raw"] = raw
-                row["publicerad"] = None
-        else:
-            # Unexpected type: keep raw copy and null out parsed field
-            row["publicerad_raw"] = raw
-            row["publicerad"] = None
-
-        return row
-
+    source.resources["dokumentlista"].add_map(normalize_publicerad)
     return source
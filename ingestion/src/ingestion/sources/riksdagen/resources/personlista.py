@@ -8,6 +8,8 @@ Full refresh mode only - no pagination or incremental loading.
 
 from dlt.sources.rest_api import rest_api_source
 
+from ..client import get_client_config
+
 
 def get_resource() -> dict:
     """
@@ -71,12 +73,7 @@ def create_source(verbose: bool = False):
 
     # Create source configuration
     source_config = {
-        "client": {
-            "base_url": "https://data.riksdagen.se/",
-            "headers": {
-                "User-Agent": "riksbevakning-dagster/1.0",
-            },
-        },
+        "client": get_client_config(),
         "resources": [resource_config],
     }
 
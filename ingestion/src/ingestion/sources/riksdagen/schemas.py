@@ -0,0 +1,73 @@
+"""
+Declared Arrow schemas for flat Riksdagen resources.
+
+The API returns every field as a string, and the dict path lands them as text
+columns, so the declared types are strings too. Declaring the columns up front
+gives every Arrow page the same columns in the same order (missing fields are
+null) and lets the columnar reader build arrays without inferring types per
+page. Fields the API adds later are still kept, as extra string columns.
+"""
+
+from typing import Dict
+
+import pyarrow as pa
+
+
+def _string_schema(*names: str) -> pa.Schema:
+    return pa.schema([pa.field(name, pa.string()) for name in names])
+
+
+ANFORANDELISTA_SCHEMA = _string_schema(
+    "dok_hangar_id",
+    "dok_id",
+    "dok_titel",
+    "dok_rm",
+    "dok_nummer",
+    "dok_datum",
+    "avsnittsrubrik",
+    "underrubrik",
+    "kammaraktivitet",
+    "anforande_id",
+    "anforande_nummer",
+    "talare",
+    "parti",
+    "anforandetext",
+    "intressent_id",
+    "rel_dok_id",
+    "replik",
+    "systemdatum",
+    "systemnyckel",
+    "anforande_url_xml",
+    "anforande_url_html",
+    "protokoll_url_www",
+)
+
+VOTERINGLISTA_SCHEMA = _string_schema(
+    "hangar_id",
+    "rm",
+    "beteckning",
+    "punkt",
+    "votering_id",
+    "intressent_id",
+    "namn",
+    "fornamn",
+    "efternamn",
+    "valkrets",
+    "valkretsnummer",
+    "iort",
+    "parti",
+    "banknummer",
+    "kon",
+    "fodd",
+    "rost",
+    "avser",
+    "votering",
+    "votering_url_xml",
+    "dok_id",
+    "systemdatum",
+)
+
+SCHEMAS: Dict[str, pa.Schema] = {
+    "anforandelista": ANFORANDELISTA_SCHEMA,
+    "voteringlista": VOTERINGLISTA_SCHEMA,
+}
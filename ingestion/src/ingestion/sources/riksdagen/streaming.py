@@ -0,0 +1,208 @@
+"""
+Streaming JSON decoding of Riksdagen API pages.
+
+A page of 20,000 anföranden with full `anforandetext` is several megabytes of
+JSON. Decoding it with response.json() holds the raw body and the complete
+dict tree in memory at the same time before a single row reaches dlt. The
+PageReader here walks the body incrementally with ijson and emits records from
+the selected list (e.g. `anforandelista.anforande`) one at a time, while
+collecting the list-level @-attributes and the max cursor value on the way.
+
+ijson (with its C backend) is used when installed; otherwise the reader falls
+back to json.load so behaviour stays the same, just without the memory savings.
+"""
+
+import io
+import json
+from collections import deque
+from typing import Any, Dict, IO, Iterable, Iterator, List, NamedTuple, Optional
+
+import requests
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - exercised only without ijson installed
+    ijson = None
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Page(NamedTuple):
+    """Records returned for one work unit, plus the list-level @-attributes."""
+
+    unit: Dict[str, Any]
+    rows: List[Dict[str, Any]]
+    attributes: Dict[str, Any]
+
+
+def select_data(payload: Any, data_selector: str) -> List[Dict[str, Any]]:
+    """
+    Extract the record list from a Riksdagen payload using a dotted selector.
+
+    The API returns a single object instead of a list when there is exactly one
+    hit, and null when there are none, so both are normalized to a list.
+    """
+    node = payload
+    for key in data_selector.split("."):
+        if not isinstance(node, dict):
+            return []
+        node = node.get(key)
+
+    if node is None:
+        return []
+    if isinstance(node, dict):
+        return [node]
+    return list(node)
+
+
+def select_attributes(payload: Any, data_selector: str) -> Dict[str, Any]:
+    """
+    Extract the @-prefixed attributes of the list object wrapping the records.
+
+    e.g. {"anforandelista": {"@antal": "123", "anforande": [...]}} with selector
+    "anforandelista.anforande" gives {"@antal": "123"}.
+    """
+    node = payload
+    for key in data_selector.split(".")[:-1]:
+        if not isinstance(node, dict):
+            return {}
+        node = node.get(key)
+
+    if not isinstance(node, dict):
+        return {}
+    return {key: value for key, value in node.items() if key.startswith("@")}
+
+
+def response_body(response: requests.Response) -> IO[bytes]:
+    """
+    Get a file-like object over a response body.
+
+    Streams straight from the socket when the body has not been read yet
+    (stream=True), and wraps the buffered content otherwise (e.g. responses
+    served from the on-disk cache).
+    """
+    if getattr(response, "_content_consumed", False) or response.raw is None:
+        return io.BytesIO(response.content)
+    response.raw.decode_content = True
+    return response.raw
+
+
+class PageReader:
+    """
+    Incrementally decodes the records of one Riksdagen JSON page.
+
+    After (or during) iteration, `attributes` holds the @-attributes of the
+    list object (e.g. @antal, @nasta_sida), `rows` the number of records seen
+    and `cursor_max` the largest value of `cursor_field`, so paginators and
+    split logic never need to parse the page a second time.
+    """
+
+    def __init__(self, data_selector: str, cursor_field: Optional[str] = None):
+        self.data_selector = data_selector
+        self.cursor_field = cursor_field
+        self.attributes: Dict[str, Any] = {}
+        self.rows = 0
+        self.cursor_max: Optional[Any] = None
+
+        parts = data_selector.split(".")
+        self._parent = ".".join(parts[:-1])
+        self._attribute_prefix = f"{self._parent}.@" if self._parent else "@"
+
+    def _is_attribute(self, prefix: str, event: str) -> bool:
+        """Check whether a parse event is a scalar @-attribute of the list object."""
+        return (
+            prefix.startswith(self._attribute_prefix)
+            and "." not in prefix[len(self._attribute_prefix):]
+            and event not in ("start_map", "start_array", "end_map", "end_array", "map_key")
+        )
+
+    def _observe(self, record: Dict[str, Any]) -> None:
+        self.rows += 1
+        if self.cursor_field:
+            value = record.get(self.cursor_field)
+            if value is not None and (self.cursor_max is None or value > self.cursor_max):
+                self.cursor_max = value
+
+    def iter_records(self, body: IO[bytes]) -> Iterator[Dict[str, Any]]:
+        """Yield records from the selected list as they are decoded."""
+        if ijson is None:
+            yield from self._iter_records_buffered(body)
+            return
+
+        item_prefix = f"{self.data_selector}.item"
+        builder = None
+        builder_prefix = None
+
+        for prefix, event, value in ijson.parse(body, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == builder_prefix and event == "end_map":
+                    record = builder.value
+                    builder = None
+                    self._observe(record)
+                    yield record
+                continue
+
+            # Records are array items, or a bare object when there is a single hit
+            if event == "start_map" and prefix in (item_prefix, self.data_selector):
+                builder = ijson.ObjectBuilder()
+                builder_prefix = prefix
+                builder.event(event, value)
+            elif self._is_attribute(prefix, event):
+                self.attributes[prefix.rsplit(".", 1)[-1]] = value
+
+    def _iter_records_buffered(self, body: IO[bytes]) -> Iterator[Dict[str, Any]]:
+        payload = json.load(body)
+        self.attributes = select_attributes(payload, self.data_selector)
+        for record in select_data(payload, self.data_selector):
+            self._observe(record)
+            yield record
+
+    def iter_batches(
+        self, body: IO[bytes], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield records in lists of at most `batch_size`, as dlt pages."""
+        batch: List[Dict[str, Any]] = []
+        for record in self.iter_records(body):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def stream_units(
+    units: Iterable[Dict[str, Any]],
+    fetcher,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    split=None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Fetch work units one after another, yielding rows in batches as they arrive.
+
+    The serial counterpart of fanout.fan_out: peak memory is one batch of rows
+    plus the decoder state, independent of the page size.
+
+    ``split`` has the same contract as in fan_out, but is consulted once the
+    first batch of a unit has been decoded, using only the list-level
+    @-attributes seen so far (the API emits them before the records). A unit
+    that is split is abandoned before any of its rows are yielded.
+
+    Args:
+        units: Request parameters for each work unit.
+        fetcher: fanout.WorkUnitFetcher used to issue the requests.
+        batch_size: Maximum number of rows per yielded batch.
+        split: Optional callable returning replacement work units for a page.
+    """
+    pending = deque(units)
+    while pending:
+        unit = pending.popleft()
+        reader = fetcher.create_reader()
+        for batch in fetcher.iter_batches(unit, batch_size=batch_size, reader=reader):
+            if split and reader.rows == len(batch):
+                children = split(Page(unit=unit, rows=[], attributes=dict(reader.attributes)))
+                if children:
+                    pending.extend(children)
+                    break
+            yield batch
@@ -0,0 +1,204 @@
+"""
+Client-side rate limiting and retries for data.riksdagen.se.
+
+One AdaptiveRateLimiter is shared by every session created through
+riksdagen.client, i.e. by all four create_source functions, their paginators
+and the fan-out workers, so total request rate is controlled in one place no
+matter how much work is running concurrently.
+
+- Token bucket: requests wait for a token; the refill rate is the current
+  allowed requests per second.
+- AIMD: the rate grows additively while responses are fast and healthy, and is
+  cut multiplicatively on 429/5xx, connection errors or latency well above the
+  observed baseline.
+- Retries: transient failures are retried with full-jitter exponential backoff
+  (honouring Retry-After), limited per request and by a run-wide retry budget
+  so a struggling API is not hammered with retries.
+"""
+
+import os
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_RATE = 4.0  # Requests per second to start from
+MIN_RATE = 0.5
+MAX_RATE = 20.0
+ADDITIVE_INCREASE = 0.25  # Requests per second added per healthy response
+MULTIPLICATIVE_DECREASE = 0.5
+SLOW_RESPONSE_FACTOR = 3.0  # Latency this many times the baseline counts as congestion
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0  # Seconds
+BACKOFF_CAP = 60.0
+RETRY_BUDGET_RATIO = 0.2  # At most one retry per five requests over a run...
+RETRY_BUDGET_MIN = 20  # ...but always allow a few
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RATE_ENV_VAR = "RIKSDAGEN_MAX_RPS"
+INITIAL_RATE_ENV_VAR = "RIKSDAGEN_INITIAL_RPS"  # e.g. raised for replays against a local server
+
+
+@dataclass
+class ThrottleStats:
+    """Counters reported at the end of a run."""
+
+    requests: int = 0
+    throttled: int = 0  # Requests that had to wait for a token
+    throttled_seconds: float = 0.0
+    retried: int = 0
+    retries_exhausted: int = 0
+    rate_decreases: int = 0
+    current_rate: float = DEFAULT_RATE
+
+    def as_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe token bucket whose rate adapts with AIMD."""
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        min_rate: float = MIN_RATE,
+        max_rate: float = MAX_RATE,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.stats = ThrottleStats(current_rate=self.rate)
+
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._baseline_latency: Optional[float] = None
+        self._retries_spent = 0
+
+    def _refill(self, now: float) -> None:
+        # Allow a burst of at most one second's worth of requests, but always
+        # room for the one token a request needs, also below 1 request/s
+        capacity = max(1.0, self.rate)
+        self._tokens = min(capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self.stats.requests += 1
+                    if waited:
+                        self.stats.throttled += 1
+                        self.stats.throttled_seconds += waited
+                    return
+                delay = (1.0 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def on_success(self, latency: float) -> None:
+        """Record a healthy response; grow the rate unless it was unusually slow."""
+        with self._lock:
+            baseline = self._baseline_latency
+            self._baseline_latency = latency if baseline is None else 0.9 * baseline + 0.1 * latency
+
+            if baseline is not None and latency > baseline * SLOW_RESPONSE_FACTOR:
+                self._decrease()
+            else:
+                self.rate = min(self.max_rate, self.rate + ADDITIVE_INCREASE)
+                self.stats.current_rate = self.rate
+
+    def on_failure(self) -> None:
+        """Record a throttled/failed response; back off the rate."""
+        with self._lock:
+            self._decrease()
+
+    def _decrease(self) -> None:
+        self.rate = max(self.min_rate, self.rate * MULTIPLICATIVE_DECREASE)
+        self.stats.current_rate = self.rate
+        self.stats.rate_decreases += 1
+
+    def try_spend_retry(self) -> bool:
+        """Take one retry from the run-wide budget, if any is left."""
+        with self._lock:
+            budget = max(RETRY_BUDGET_MIN, int(self.stats.requests * RETRY_BUDGET_RATIO))
+            if self._retries_spent >= budget:
+                self.stats.retries_exhausted += 1
+                return False
+            self._retries_spent += 1
+            self.stats.retried += 1
+            return True
+
+
+_shared_limiter: Optional[AdaptiveRateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Get the process-wide limiter shared by all Riksdagen sessions."""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            max_rate = float(os.environ.get(MAX_RATE_ENV_VAR, MAX_RATE))
+            rate = float(os.environ.get(INITIAL_RATE_ENV_VAR, DEFAULT_RATE))
+            _shared_limiter = AdaptiveRateLimiter(rate=min(rate, max_rate), max_rate=max_rate)
+        return _shared_limiter
+
+
+def _backoff(attempt: int, response: Optional[requests.Response] = None) -> float:
+    """Full-jitter exponential backoff, honouring Retry-After when given."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(BACKOFF_CAP, float(retry_after))
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+class ThrottledAdapter(HTTPAdapter):
+    """HTTP adapter that rate-limits every request and retries transient failures."""
+
+    def __init__(
+        self,
+        limiter: Optional[AdaptiveRateLimiter] = None,
+        max_attempts: int = MAX_ATTEMPTS,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.limiter = limiter or get_rate_limiter()
+        self.max_attempts = max_attempts
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            started = time.monotonic()
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self.limiter.on_failure()
+                attempt += 1
+                if attempt >= self.max_attempts or not self.limiter.try_spend_retry():
+                    raise
+                time.sleep(_backoff(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUSES:
+                self.limiter.on_success(time.monotonic() - started)
+                return response
+
+            self.limiter.on_failure()
+            attempt += 1
+            if attempt >= self.max_attempts or not self.limiter.try_spend_retry():
+                return response
+            delay = _backoff(attempt, response)
+            response.close()
+            time.sleep(delay)
@@ -0,0 +1,186 @@
+"""
+Two-phase loading: stage as Parquet, then bulk-load into MotherDuck.
+
+Loading straight into MotherDuck pays remote insert overhead on every load, and
+a failed load means extracting from the API again. In staged mode:
+
+1. Extract + normalize: the source is run into a dlt filesystem destination
+   (local directory or object storage such as s3://...), written as
+   compressed Parquet files partitioned by table and load date:
+
+       <staging_url>/raw_riksdagen/<table>/<YYYY-MM-DD>/<load_id>.<file_id>.parquet
+
+   A manifest listing the files and write hints of every table is written to
+   <staging_url>/_manifests/<resource>/<load_id>.json.
+
+2. Load: the staged files are read back as Arrow tables and loaded into
+   MotherDuck by a second pipeline with the same write dispositions and keys.
+   dlt passes Arrow data through as Parquet, which MotherDuck ingests with a
+   single COPY per file instead of row-wise inserts.
+
+Phase 2 only needs the manifest, so a staged dataset can be reloaded (e.g.
+into a fresh database) without touching the Riksdagen API.
+"""
+
+import json
+import os
+import posixpath
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List
+
+import dlt
+import pyarrow.parquet as pq
+from fsspec.core import url_to_fs
+
+STAGING_URL_ENV_VAR = "INGESTION_STAGING_URL"
+STAGING_LAYOUT = "{table_name}/{YYYY}-{MM}-{DD}/{load_id}.{file_id}.{ext}"
+MANIFEST_DIR = "_manifests"
+
+
+def get_staging_url() -> str | None:
+    """Get the staging URL from env, or None when staging is disabled."""
+    return os.environ.get(STAGING_URL_ENV_VAR) or None
+
+
+def create_staging_destination(staging_url: str):
+    """Create a dlt filesystem destination writing partitioned Parquet files."""
+    return dlt.destinations.filesystem(bucket_url=staging_url, layout=STAGING_LAYOUT)
+
+
+def _table_hints(schema, table_name: str) -> Dict[str, Any]:
+    """Get the write disposition and keys needed to load a staged table."""
+    table = schema.tables[table_name]
+    parent = table.get("parent")
+    root = table
+    while root.get("parent"):
+        root = schema.tables[root["parent"]]
+
+    write_disposition = root.get("write_disposition", "append")
+    primary_key = [
+        name for name, column in table.get("columns", {}).items() if column.get("primary_key")
+    ]
+    if parent and write_disposition == "merge":
+        # Child rows of merged tables have deterministic _dlt_ids
+        primary_key = ["_dlt_id"]
+
+    return {
+        "write_disposition": write_disposition,
+        "primary_key": primary_key or None,
+        "parent": parent,
+    }
+
+
+def build_manifest(
+    dlt_pipeline: dlt.Pipeline, resource_name: str, staging_url: str, load_ids: List[str]
+) -> Dict[str, Any]:
+    """Describe the Parquet files a staging run produced, per table."""
+    fs, root = url_to_fs(staging_url)
+    schema = dlt_pipeline.default_schema
+
+    tables = {}
+    for table in schema.data_tables():
+        table_name = table["name"]
+        files = []
+        for load_id in load_ids:
+            pattern = posixpath.join(
+                root, dlt_pipeline.dataset_name, table_name, "*", f"{load_id}.*.parquet"
+            )
+            files.extend(fs.unstrip_protocol(path) for path in sorted(fs.glob(pattern)))
+        if files:
+            tables[table_name] = {"files": files, **_table_hints(schema, table_name)}
+
+    return {
+        "resource": resource_name,
+        "pipeline_name": dlt_pipeline.pipeline_name,
+        "dataset_name": dlt_pipeline.dataset_name,
+        "load_ids": load_ids,
+        "staged_at": datetime.now(timezone.utc).isoformat(),
+        "tables": tables,
+    }
+
+
+def manifest_path(staging_url: str, resource_name: str, load_id: str) -> str:
+    return posixpath.join(staging_url.rstrip("/"), MANIFEST_DIR, resource_name, f"{load_id}.json")
+
+
+def write_manifest(staging_url: str, manifest: Dict[str, Any]) -> str:
+    """Write a manifest next to the staged data and return its URL."""
+    path = manifest_path(staging_url, manifest["resource"], manifest["load_ids"][-1])
+    fs, fs_path = url_to_fs(path)
+    fs.makedirs(posixpath.dirname(fs_path), exist_ok=True)
+    with fs.open(fs_path, "w") as file:
+        json.dump(manifest, file, indent=2)
+    return path
+
+
+def list_manifests(staging_url: str, resource_name: str) -> List[Dict[str, Any]]:
+    """Load all manifests of a resource, oldest load first."""
+    fs, root = url_to_fs(posixpath.join(staging_url.rstrip("/"), MANIFEST_DIR, resource_name))
+    manifests = []
+    # Load ids are timestamps, so name order is load order
+    for path in sorted(fs.glob(posixpath.join(root, "*.json"))):
+        with fs.open(path) as file:
+            manifests.append(json.load(file))
+    return manifests
+
+
+def stage(
+    dlt_pipeline: dlt.Pipeline, source, resource_name: str, staging_url: str
+) -> Dict[str, Any] | None:
+    """
+    Phase 1: extract and normalize a source into staged Parquet files.
+
+    Returns:
+        The written manifest, or None if the run produced no data.
+    """
+    info = dlt_pipeline.run(source, loader_file_format="parquet")
+    if not info.loads_ids:
+        return None
+
+    manifest = build_manifest(dlt_pipeline, resource_name, staging_url, info.loads_ids)
+    manifest_url = write_manifest(staging_url, manifest)
+    print(f"Staged {len(manifest['tables'])} tables, manifest: {manifest_url}")
+    return manifest
+
+
+def _read_files(files: List[str]) -> Iterator[Any]:
+    for url in files:
+        fs, path = url_to_fs(url)
+        with fs.open(path, "rb") as file:
+            yield pq.read_table(file)
+
+
+def staged_resources(manifests: List[Dict[str, Any]]) -> List[Any]:
+    """Create one Arrow resource per staged table, covering all given manifests."""
+    tables: Dict[str, Dict[str, Any]] = {}
+    for manifest in manifests:
+        for table_name, entry in manifest["tables"].items():
+            merged = tables.setdefault(table_name, {**entry, "files": []})
+            if entry["write_disposition"] == "replace":
+                # Only the latest snapshot of a replaced table is meaningful
+                merged["files"] = []
+            merged["files"].extend(entry["files"])
+
+    return [
+        dlt.resource(
+            _read_files(entry["files"]),
+            name=table_name,
+            write_disposition=entry["write_disposition"],
+            primary_key=entry["primary_key"],
+        )
+        for table_name, entry in tables.items()
+    ]
+
+
+def load_staged(dlt_pipeline: dlt.Pipeline, manifests: List[Dict[str, Any]]):
+    """
+    Phase 2: bulk-load staged Parquet files into the pipeline's destination.
+
+    The staged files already carry the _dlt_id / _dlt_load_id columns assigned
+    during phase 1, so downstream models see the same lineage columns as with
+    a direct load.
+    """
+    resources = staged_resources(manifests)
+    if not resources:
+        return None
+    return dlt_pipeline.run(resources, loader_file_format="parquet")
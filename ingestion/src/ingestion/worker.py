@@ -0,0 +1,223 @@
+"""
+Warm worker: a long-lived container that runs CLI jobs on request.
+
+Cold-starting a container and importing dlt, pyarrow and duckdb (or dbt) takes
+longer than a small incremental run itself. `cli.py serve` imports everything
+once and then accepts jobs over HTTP:
+
+    POST /run     {"argv": ["run", "personlista"], "env": {"DATABASE_NAME": ...}}
+                  with `Authorization: Bearer <token>`
+                  → the job's stdout/stderr as it is written, then a final
+                    line `__exit__ <code>` (plus ` recycle` when the worker is
+                    about to retire)
+    GET  /health  → {"jobs": ..., "max_jobs": ..., "rss_bytes": ...,
+                     "peak_job_rss_bytes": ..., "retiring": ...}
+
+The token comes from the WORKER_TOKEN env var (the Dagster warm pool generates
+one per container). Without it the worker only listens on localhost, so jobs
+can never be run unauthenticated from other containers on the network.
+
+Every job runs in a child forked from the warm process, so it starts with all
+imports done but cannot leak state (process-wide sessions, rate limiter,
+metrics, env vars) into the next job. Jobs run one at a time. After
+`max_jobs` jobs, or once a job's peak RSS exceeded the warm process's by more
+than `max_rss_growth` bytes, the worker finishes the current job and exits, so
+its container can be replaced by a fresh one.
+
+This module only uses the standard library: the dbt image ships it next to
+its own CLI (see transformations_dbt/Dockerfile) so both images share it.
+"""
+
+import hmac
+import importlib
+import json
+import os
+import resource
+import sys
+import traceback
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Callable, List, Optional, Tuple
+
+DEFAULT_PORT = 8750
+DEFAULT_MAX_JOBS = 50
+DEFAULT_MAX_RSS_GROWTH = 512 * 2**20
+EXIT_MARKER = "__exit__"
+WORKER_TOKEN_ENV_VAR = "WORKER_TOKEN"
+
+# Imported up front so jobs don't pay for them; missing optional ones are skipped
+WARM_IMPORTS = (
+    "duckdb",
+    "pyarrow",
+    "pyarrow.compute",
+    "dlt.sources.rest_api",
+    "dlt.destinations",
+)
+
+
+def current_rss_bytes() -> int:
+    """Current (not peak) resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return _maxrss_bytes(resource.getrusage(resource.RUSAGE_SELF))
+
+
+def _maxrss_bytes(usage) -> int:
+    # Linux reports KiB, macOS bytes
+    return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+
+def run_forked(
+    job: Callable[[List[str]], None], argv: List[str], env: dict, output
+) -> Tuple[int, int]:
+    """Run a job in a forked child, streaming its output; returns its exit code and peak RSS."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Child: output goes to the pipe, exit code from SystemExit
+        os.close(read_fd)
+        os.dup2(write_fd, 1)
+        os.dup2(write_fd, 2)
+        sys.stdout.reconfigure(line_buffering=True)
+        sys.stderr.reconfigure(line_buffering=True)
+        os.environ.update(env)
+        code = 0
+        try:
+            job(argv)
+        except SystemExit as exit:
+            code = exit.code if isinstance(exit.code, int) else (0 if exit.code is None else 1)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as pipe:
+        for chunk in iter(lambda: pipe.read1(65536), b""):
+            output.write(chunk)
+            output.flush()
+    _, status, usage = os.wait4(pid, 0)
+    return os.waitstatus_to_exitcode(status), _maxrss_bytes(usage)
+
+
+class WorkerServer(HTTPServer):
+    """Single-threaded job server; a job blocks the next request until it finishes."""
+
+    def __init__(
+        self,
+        job: Callable[[List[str]], None],
+        port: int = DEFAULT_PORT,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        max_rss_growth: int = DEFAULT_MAX_RSS_GROWTH,
+        token: Optional[str] = None,
+    ):
+        # Other containers may only reach the worker when jobs need a token
+        super().__init__(("0.0.0.0" if token else "127.0.0.1", port), _WorkerHandler)
+        self.job = job
+        self.max_jobs = max_jobs
+        self.max_rss_growth = max_rss_growth
+        self.token = token
+        self.jobs = 0
+        self.baseline_rss = current_rss_bytes()
+        self.peak_job_rss = 0
+        self.retiring = False
+
+    def authorized(self, header: Optional[str]) -> bool:
+        if not self.token:
+            return True
+        return hmac.compare_digest(header or "", f"Bearer {self.token}")
+
+    def should_retire(self, job_rss: int) -> bool:
+        # The warm process itself never runs jobs; what grows is each forked job
+        grown = job_rss - self.baseline_rss
+        return self.jobs >= self.max_jobs or grown > self.max_rss_growth
+
+
+class _WorkerHandler(BaseHTTPRequestHandler):
+    server: WorkerServer
+
+    def _send_json(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self.send_error(404)
+            return
+        self._send_json(200, {
+            "jobs": self.server.jobs,
+            "max_jobs": self.server.max_jobs,
+            "rss_bytes": current_rss_bytes(),
+            "peak_job_rss_bytes": self.server.peak_job_rss,
+            "retiring": self.server.retiring,
+        })
+
+    def do_POST(self):
+        if self.path != "/run":
+            self.send_error(404)
+            return
+        if not self.server.authorized(self.headers.get("Authorization")):
+            self.send_error(401, "Missing or invalid worker token")
+            return
+        if self.server.retiring:
+            self.send_error(503, "Worker is retiring")
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length))
+            argv = [str(arg) for arg in request["argv"]]
+            env = {str(key): str(value) for key, value in (request.get("env") or {}).items()}
+        except (ValueError, KeyError, TypeError) as error:
+            self.send_error(400, f"Invalid job: {error}")
+            return
+
+        # HTTP/1.0 without Content-Length: the body ends when the connection closes
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.end_headers()
+        code, job_rss = run_forked(self.server.job, argv, env, self.wfile)
+
+        self.server.jobs += 1
+        self.server.peak_job_rss = max(self.server.peak_job_rss, job_rss)
+        self.server.retiring = self.server.should_retire(job_rss)
+        marker = f"\n{EXIT_MARKER} {code}{' recycle' if self.server.retiring else ''}\n"
+        self.wfile.write(marker.encode("utf-8"))
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(
+    job: Callable[[List[str]], None],
+    port: int = DEFAULT_PORT,
+    max_jobs: int = DEFAULT_MAX_JOBS,
+    max_rss_growth: int = DEFAULT_MAX_RSS_GROWTH,
+    warm_imports: Optional[tuple] = WARM_IMPORTS,
+) -> None:
+    """Import the heavy dependencies once, then run jobs until the worker retires."""
+    # Jobs inherit the environment, so they don't get to see the token
+    token = os.environ.pop(WORKER_TOKEN_ENV_VAR, None)
+    for module in warm_imports or ():
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+    server = WorkerServer(
+        job, port=port, max_jobs=max_jobs, max_rss_growth=max_rss_growth, token=token
+    )
+    host = server.server_address[0]
+    print(f"Warm worker listening on {host}:{port} (recycles after {max_jobs} jobs)", flush=True)
+    with server:
+        while not server.retiring:
+            server.handle_request()
+    print(f"Warm worker retiring after {server.jobs} jobs", flush=True)
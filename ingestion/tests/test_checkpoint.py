@@ -0,0 +1,80 @@
+import dlt
+import pytest
+
+import cli
+from ingestion.checkpoint import CheckpointStore, checkpoint_id, unit_key
+
+UNITS = [{"rm": "2023/24", "valkrets": name} for name in ("A", "B", "C", "D", "E")]
+
+
+class FakeGrid:
+    """Stand-in for a grid resource module, recording the units it is asked to fetch."""
+
+    def __init__(self, fail_on=None):
+        self.fetched = []
+        self.fail_on = fail_on
+
+    def get_work_units(self, incremental=True, start_date=None, end_date=None):
+        return [dict(unit) for unit in UNITS]
+
+    def create_source(self, incremental=True, start_date=None, end_date=None, max_workers=1, work_units=None):
+        grid = self
+
+        @dlt.resource(name="voteringlista")
+        def rows():
+            for unit in work_units:
+                if unit == grid.fail_on:
+                    raise RuntimeError("interrupted")
+                grid.fetched.append(unit_key(unit))
+                yield {"votering_id": unit["valkrets"], "intressent_id": "1", "rm": unit["rm"]}
+
+        @dlt.source(name="riksdagen")
+        def source():
+            return rows
+
+        return source()
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    return dlt.pipeline(
+        pipeline_name="test_checkpoint",
+        destination=dlt.destinations.duckdb(str(tmp_path / "test.duckdb")),
+        dataset_name="raw_riksdagen",
+        pipelines_dir=str(tmp_path / "pipelines"),
+    )
+
+
+def run(pipeline, monkeypatch, grid, resume):
+    monkeypatch.setitem(cli.GRID_RESOURCES, "voteringlista", grid)
+    return cli.run_checkpointed(pipeline, "voteringlista", checkpoint_every=2, resume=resume)
+
+
+def test_resume_skips_completed_units(pipeline, monkeypatch):
+    interrupted = FakeGrid(fail_on=UNITS[2])
+    with pytest.raises(Exception):
+        run(pipeline, monkeypatch, interrupted, resume=False)
+
+    # The first chunk was loaded and checkpointed before the failure
+    store = CheckpointStore(pipeline, checkpoint_id("voteringlista"))
+    assert store.load() == {unit_key(unit) for unit in UNITS[:2]}
+
+    resumed = FakeGrid()
+    run(pipeline, monkeypatch, resumed, resume=True)
+
+    assert resumed.fetched == [unit_key(unit) for unit in UNITS[2:]]
+    with pipeline.sql_client() as client:
+        loaded = client.execute_sql("SELECT votering_id FROM voteringlista ORDER BY votering_id")
+    assert [row[0] for row in loaded] == ["A", "B", "C", "D", "E"]
+    # A completed backfill forgets its progress
+    assert store.load() == set()
+
+
+def test_run_without_resume_starts_over(pipeline, monkeypatch):
+    with pytest.raises(Exception):
+        run(pipeline, monkeypatch, FakeGrid(fail_on=UNITS[2]), resume=False)
+
+    restarted = FakeGrid()
+    run(pipeline, monkeypatch, restarted, resume=False)
+
+    assert restarted.fetched == [unit_key(unit) for unit in UNITS]
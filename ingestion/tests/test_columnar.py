@@ -0,0 +1,38 @@
+import io
+import json
+
+import pyarrow as pa
+
+from ingestion.sources.riksdagen.columnar import ArrowPageReader
+
+SCHEMA = pa.schema([("votering_id", pa.string())])
+
+
+def page(*records):
+    payload = {"voteringlista": {"@antal": str(len(records)), "votering": list(records)}}
+    return io.BytesIO(json.dumps(payload).encode("utf-8"))
+
+
+def test_nested_field_first_seen_after_row_zero_stays_aligned():
+    body = page(
+        {"votering_id": "a"},
+        {"votering_id": "b"},
+        {"votering_id": "c", "extra": {"x": 1}},
+    )
+
+    table = next(ArrowPageReader("voteringlista.votering", SCHEMA).iter_batches(body))
+
+    assert table.column("extra").to_pylist() == [None, None, '{"x": 1}']
+
+
+def test_iter_records_yields_dicts():
+    reader = ArrowPageReader("voteringlista.votering", SCHEMA)
+
+    records = list(reader.iter_records(page({"votering_id": "a"}, {"votering_id": "b", "rm": "2023/24"})))
+
+    assert records == [
+        {"votering_id": "a", "rm": None},
+        {"votering_id": "b", "rm": "2023/24"},
+    ]
+    assert reader.rows == 2
+    assert reader.attributes == {"@antal": "2"}
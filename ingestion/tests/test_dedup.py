@@ -0,0 +1,30 @@
+import pyarrow as pa
+
+from ingestion.dedup import CONTENT_HASH_COLUMN, content_hash, stamp_table, table_content_hashes
+from ingestion.sources.riksdagen.transforms import NORMALIZATIONS, normalize_table, rows_to_table
+
+RECORDS = [
+    {"id": "a", "titel": " Motion ", "publicerad": "2024-01-02 10:00:00", "organ": ""},
+    {"id": "b", "titel": "Proposition", "publicerad": None, "dokintressent": {"intressent": [{"namn": "x"}]}},
+]
+
+
+def test_dict_and_arrow_rows_hash_the_same():
+    table = rows_to_table([dict(record) for record in RECORDS])
+
+    assert table_content_hashes(table).to_pylist() == [content_hash(record) for record in RECORDS]
+
+
+def test_hash_is_taken_before_normalization():
+    stamped = normalize_table(stamp_table(rows_to_table(RECORDS)), NORMALIZATIONS["dokumentlista"])
+
+    # Trimming and timestamp parsing do not change the stamped hashes
+    assert stamped.column("titel").to_pylist() == ["Motion", "Proposition"]
+    assert pa.types.is_timestamp(stamped.schema.field("publicerad").type)
+    assert stamped.column(CONTENT_HASH_COLUMN).to_pylist() == [content_hash(record) for record in RECORDS]
+
+
+def test_hash_ignores_bookkeeping_columns():
+    record = {"id": "a", "titel": "Motion"}
+
+    assert content_hash({**record, "_dlt_id": "x", CONTENT_HASH_COLUMN: "y"}) == content_hash(record)
@@ -0,0 +1,70 @@
+import dlt
+import pytest
+
+from ingestion.sources.riksdagen.resources import dokumentlista
+from ingestion.sources.riksdagen.streaming import Page
+
+PARTITION = {"start_date": "2024-03-01", "end_date": "2024-03-01", "partition": "2024-03-01"}
+
+
+class StubFetcher:
+    """Stand-in for WorkUnitFetcher serving one day of documents from memory."""
+
+    documents = []
+    downloads = 0
+
+    def __init__(self, path, data_selector, base_params=None, session=None, limiter=None, schema=None):
+        self.base_params = base_params or {}
+        self.session = session
+
+    def __call__(self, unit):
+        rows = list(self.documents)
+        if self.base_params.get("sort") == dokumentlista.WATERMARK_FIELD:
+            rows.sort(key=lambda row: row[dokumentlista.WATERMARK_FIELD], reverse=True)
+        if self.base_params.get("antal") == 1:
+            rows = rows[:1]
+        else:
+            StubFetcher.downloads += 1
+        return Page(unit=unit, rows=rows, attributes={"@traffar": str(len(self.documents))})
+
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    StubFetcher.documents = [
+        {"id": "a", "datum": "2024-03-01", "systemdatum": "2024-03-01 10:00:00"},
+        {"id": "b", "datum": "2024-03-01", "systemdatum": "2024-03-01 11:00:00"},
+    ]
+    StubFetcher.downloads = 0
+    monkeypatch.setattr(dokumentlista, "WorkUnitFetcher", StubFetcher)
+    return StubFetcher
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    return dlt.pipeline(
+        pipeline_name="test_partitions",
+        destination=dlt.destinations.duckdb(str(tmp_path / "test.duckdb")),
+        dataset_name="raw_riksdagen",
+        pipelines_dir=str(tmp_path / "pipelines"),
+    )
+
+
+def load_partition(pipeline):
+    pipeline.run(dokumentlista.create_sharded_resource(**PARTITION))
+
+
+def test_unchanged_partition_is_skipped(pipeline, fetcher):
+    load_partition(pipeline)
+    load_partition(pipeline)
+
+    assert fetcher.downloads == 1
+
+
+def test_edited_document_reloads_the_partition(pipeline, fetcher):
+    load_partition(pipeline)
+
+    # Same number of hits, but one document changed after the last load
+    fetcher.documents[0] = {**fetcher.documents[0], "systemdatum": "2024-03-02 09:00:00"}
+    load_partition(pipeline)
+
+    assert fetcher.downloads == 2
@@ -0,0 +1,30 @@
+import os
+import threading
+
+from ingestion.memory import MemoryBudget
+from ingestion.sources.riksdagen import fanout
+from ingestion.sources.riksdagen.streaming import Page
+
+
+def test_pages_completing_after_early_close_are_discarded(monkeypatch, tmp_path):
+    # A tiny budget, so every page after the first is spilled to disk
+    budget = MemoryBudget(1, spill_dir=str(tmp_path))
+    monkeypatch.setattr(fanout, "get_memory_budget", lambda: budget)
+    all_started = threading.Barrier(3)
+    finish_slow = threading.Event()
+
+    def fetch(unit):
+        all_started.wait(5)
+        if unit["n"] > 0:
+            finish_slow.wait(5)
+        return Page(unit=unit, rows=[{"n": unit["n"]}] * 100, attributes={})
+
+    pages = fanout.fan_out([{"n": n} for n in range(3)], fetch, max_workers=3)
+    assert next(pages)[0]["n"] == 0
+
+    # The consumer stops while two units are still running
+    threading.Timer(0.1, finish_slow.set).start()
+    pages.close()
+
+    assert budget.held == 0
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,47 @@
+import pytest
+
+from ingestion.sources.riksdagen import paginators
+from ingestion.sources.riksdagen.catalogue import get_sessions
+from ingestion.sources.riksdagen.resources import anforandelista, voteringlista
+
+# A daily partition before the first Riksmöte (1990/91) in the catalogue
+BEFORE_FIRST_SESSION = {"start_date": "1990-01-01", "end_date": "1990-08-31"}
+
+
+class Request:
+    def __init__(self):
+        self.params = {}
+
+
+def test_range_before_first_session_has_no_sessions():
+    assert get_sessions(**BEFORE_FIRST_SESSION) == []
+
+
+@pytest.mark.parametrize("module", [anforandelista, voteringlista], ids=lambda module: module.__name__)
+def test_out_of_range_partition_loads_nothing(module, monkeypatch):
+    def no_requests(*args, **kwargs):
+        raise AssertionError("no request may be sent for an empty range")
+
+    monkeypatch.setattr(module.WorkUnitFetcher, "__call__", no_requests)
+    monkeypatch.setattr(module.WorkUnitFetcher, "iter_batches", no_requests)
+
+    source = module.create_source(**BEFORE_FIRST_SESSION)
+
+    assert list(source) == []
+
+
+@pytest.mark.parametrize(
+    "paginator",
+    [
+        paginators.RiksmotePaginator,
+        paginators.VoteringlistaPaginator,
+        paginators.VoteringlistaIncrementalPaginator,
+    ],
+    ids=lambda paginator: paginator.__name__,
+)
+def test_paginators_refuse_an_unfiltered_first_request(paginator):
+    instance = paginator(**BEFORE_FIRST_SESSION)
+
+    assert not instance.has_next_page
+    with pytest.raises(ValueError):
+        instance.init_request(Request())
@@ -0,0 +1,57 @@
+import pytest
+
+from ingestion.sources.riksdagen import throttle
+from ingestion.sources.riksdagen.throttle import AdaptiveRateLimiter
+
+
+class FakeClock:
+    """Stands in for time.monotonic/time.sleep; fails instead of sleeping forever."""
+
+    def __init__(self, max_sleeps: int = 100):
+        self.now = 0.0
+        self.sleeps = 0
+        self.max_sleeps = max_sleeps
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps += 1
+        if self.sleeps > self.max_sleeps:
+            raise AssertionError("acquire() never got a token")
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(throttle.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(throttle.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_acquire_after_backing_off_to_min_rate(clock):
+    limiter = AdaptiveRateLimiter(rate=4.0, min_rate=0.5)
+    for _ in range(10):
+        limiter.on_failure()
+    assert limiter.rate == 0.5
+
+    for _ in range(3):
+        limiter.acquire()
+
+    assert limiter.stats.requests == 3
+    # The first request uses the initial token; each later one waits 1 / 0.5 s
+    assert clock.now == pytest.approx(4.0)
+
+
+def test_burst_is_capped_at_one_second_of_requests(clock):
+    limiter = AdaptiveRateLimiter(rate=4.0)
+    clock.now = 60.0
+
+    for _ in range(4):
+        limiter.acquire()
+    assert clock.sleeps == 0
+
+    limiter.acquire()
+    assert clock.sleeps == 1
+    assert limiter.stats.throttled == 1
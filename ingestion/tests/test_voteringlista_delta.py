@@ -0,0 +1,96 @@
+import dlt
+import pytest
+
+from ingestion.sources.riksdagen.resources import voteringlista
+from ingestion.sources.riksdagen.streaming import Page
+
+RIKSMOTE = "2023/24"
+
+
+class StubFetcher:
+    """Stand-in for WorkUnitFetcher serving summaries, grid cells and voteringar from memory."""
+
+    summaries = {}
+    requests = []
+
+    def __init__(self, path, data_selector, base_params=None, session=None, limiter=None, schema=None):
+        self.path = path
+        self.base_params = base_params or {}
+        self.session = session
+
+    def __call__(self, unit):
+        if "gruppering" in self.base_params:
+            rows = [
+                {"votering_id": votering_id, "Ja": counts[0], "Nej": counts[1]}
+                for votering_id, counts in self.summaries.items()
+            ]
+            return Page(unit=unit, rows=rows, attributes={})
+
+        self.requests.append(dict(unit))
+        if "votering_id" in unit:
+            voteringar = [unit["votering_id"]]
+        else:
+            voteringar = list(self.summaries)
+        rows = [
+            {"votering_id": votering_id, "intressent_id": unit.get("valkrets", "x"), "rm": RIKSMOTE}
+            for votering_id in voteringar
+        ]
+        return Page(unit=unit, rows=rows, attributes={})
+
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    StubFetcher.summaries = {"v1": (100, 200), "v2": (150, 150), "v3": (300, 0)}
+    StubFetcher.requests = []
+    monkeypatch.setattr(voteringlista, "WorkUnitFetcher", StubFetcher)
+    monkeypatch.setattr(
+        voteringlista,
+        "get_valkrets_grid",
+        lambda sessions: [{"rm": rm, "valkrets": name} for rm in sessions for name in ("A", "B")],
+    )
+    return StubFetcher
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    return dlt.pipeline(
+        pipeline_name="test_delta",
+        destination=dlt.destinations.duckdb(str(tmp_path / "test.duckdb")),
+        dataset_name="raw_riksdagen",
+        pipelines_dir=str(tmp_path / "pipelines"),
+    )
+
+
+def run_delta(pipeline, fetcher):
+    fetcher.requests = []
+    pipeline.run(voteringlista.create_delta_resource(end_date="2024-03-01"))
+    return fetcher.requests
+
+
+def test_first_run_fetches_the_whole_grid(pipeline, fetcher):
+    assert run_delta(pipeline, fetcher) == [
+        {"rm": RIKSMOTE, "valkrets": "A"},
+        {"rm": RIKSMOTE, "valkrets": "B"},
+    ]
+
+
+def test_only_changed_voteringar_are_fetched(pipeline, fetcher):
+    run_delta(pipeline, fetcher)
+
+    assert run_delta(pipeline, fetcher) == []
+
+    fetcher.summaries["v2"] = (151, 149)
+    fetcher.summaries["v4"] = (10, 20)
+    assert run_delta(pipeline, fetcher) == [{"votering_id": "v2"}, {"votering_id": "v4"}]
+
+
+def test_many_changes_fall_back_to_the_grid(pipeline, fetcher, monkeypatch):
+    run_delta(pipeline, fetcher)
+    monkeypatch.setattr(voteringlista, "MAX_DELTA_VOTERINGAR", 1)
+
+    fetcher.summaries["v1"] = (101, 199)
+    fetcher.summaries["v3"] = (299, 1)
+    assert run_delta(pipeline, fetcher) == [
+        {"rm": RIKSMOTE, "valkrets": "A"},
+        {"rm": RIKSMOTE, "valkrets": "B"},
+    ]
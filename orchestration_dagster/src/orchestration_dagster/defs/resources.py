@@ -30,5 +30,6 @@ def get_container_executor() -> ContainerExecutor:
         return ContainerExecutor(
             environment="local",
             docker_network=os.environ.get("DOCKER_NETWORK", "spatial-network"),
+            warm_pool=os.environ.get("CONTAINER_WARM_POOL", "false").lower() == "true",
         )
 
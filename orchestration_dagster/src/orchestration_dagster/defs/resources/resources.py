@@ -44,6 +44,7 @@ def get_container_executor() -> ContainerExecutor:
             environment="local",
             docker_network=os.environ.get("DOCKER_NETWORK", "spatial-network"),
             docker_host="unix:///var/run/docker.sock",
+            warm_pool=os.environ.get("CONTAINER_WARM_POOL", "false").lower() == "true",
         )
 
 
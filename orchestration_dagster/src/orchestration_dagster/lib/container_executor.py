@@ -7,15 +7,56 @@ Production: Uses ECS Tasks to execute containers in AWS
 This allows assets to be environment-agnostic - same code works locally and in production.
 """
 import os
+import re
+import tempfile
+import threading
 import time
 import uuid
-from typing import Dict, List, Optional
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional
 
 import dagster as dg
 
+from orchestration_dagster.lib.log_tailer import LogTailer, resolve_log_location
+from orchestration_dagster.lib.task_poller import get_docker_poller, get_ecs_poller
+from orchestration_dagster.lib.warm_pool import DEFAULT_MAX_JOBS, DEFAULT_POOL_SIZE, get_warm_pool
+
+LOG_SPOOL_DIR_ENV_VAR = "CONTAINER_LOG_SPOOL_DIR"
+DEFAULT_LOG_TAIL_LINES = 500  # Lines kept in memory for results and failure metadata
+
+# Images whose CLI has a `serve` command and can run as warm workers
+WARM_IMAGES = ["spatial/ingestion:latest", "transformations_dbt:latest"]
+
+_docker_client = None
+_docker_networks = set()  # Networks known to exist
+_docker_lock = threading.Lock()
+
+
+def get_docker_client(context, network: str):
+    """Get the process-wide Docker client, creating the network on first use."""
+    global _docker_client
+    import docker
+
+    with _docker_lock:
+        if _docker_client is None:
+            _docker_client = docker.from_env()
+        if network not in _docker_networks:
+            try:
+                _docker_client.networks.get(network)
+            except docker.errors.NotFound:
+                context.log.info(f"Creating Docker network: {network}")
+                _docker_client.networks.create(network, driver="bridge")
+            _docker_networks.add(network)
+        return _docker_client
+
 
 class ExecutionResult:
-    """Result of container execution."""
+    """Result of container execution.
+    
+    `logs` holds the last lines of output only; the complete output is in the
+    spooled log file at `log_path` when one was written.
+    """
     
     def __init__(
         self,
@@ -24,12 +65,74 @@ class ExecutionResult:
         stdout: str = "",
         stderr: str = "",
         logs: List[str] = None,
+        log_path: Optional[str] = None,
     ):
         self.success = success
         self.exit_code = exit_code
-        self.stdout = stdout
+        self._stdout = stdout
         self.stderr = stderr
         self.logs = logs or []
+        self.log_path = log_path
+    
+    @property
+    def stdout(self) -> str:
+        """Output of the container (the retained tail when it was streamed)."""
+        return self._stdout or "\n".join(self.logs)
+
+
+class LogCapture:
+    """Forwards container output to Dagster line by line as it arrives.
+    
+    Only the last `tail_lines` lines are kept in memory; every line is also
+    appended to a spool file under $CONTAINER_LOG_SPOOL_DIR (default: the
+    system temp directory), so hour-long runs neither stay silent until they
+    finish nor hold their whole output in orchestrator memory.
+    """
+    
+    def __init__(self, context, name: Optional[str] = None, tail_lines: int = DEFAULT_LOG_TAIL_LINES):
+        self.context = context
+        self.tail = deque(maxlen=tail_lines)
+        self.lines = 0
+        spool_dir = os.environ.get(LOG_SPOOL_DIR_ENV_VAR) or None
+        if spool_dir:
+            os.makedirs(spool_dir, exist_ok=True)
+        prefix = re.sub(r"[^0-9A-Za-z_.-]+", "_", name or "container")
+        fd, self.path = tempfile.mkstemp(dir=spool_dir, prefix=f"{prefix}-", suffix=".log")
+        self._spool = os.fdopen(fd, "w", encoding="utf-8")
+        self._partial = b""
+    
+    def write_line(self, line: str) -> None:
+        self._spool.write(line + "\n")
+        self.lines += 1
+        self.tail.append(line)
+        if line.strip():
+            self.context.log.info(line)
+    
+    def feed(self, chunk: bytes) -> None:
+        """Consume a chunk of raw output; chunks need not end on line boundaries."""
+        data = self._partial + chunk
+        *complete, self._partial = data.split(b"\n")
+        for line in complete:
+            self.write_line(line.decode("utf-8", errors="replace").rstrip("\r"))
+    
+    def consume(self, chunks: Iterable[bytes]) -> None:
+        for chunk in chunks:
+            self.feed(chunk)
+    
+    def close(self) -> None:
+        if self._partial:
+            self.write_line(self._partial.decode("utf-8", errors="replace").rstrip("\r"))
+            self._partial = b""
+        self._spool.close()
+        self.context.log.info(f"Full container log ({self.lines} lines): {self.path}")
+    
+    def result(self, exit_code: int) -> ExecutionResult:
+        return ExecutionResult(
+            success=exit_code == 0,
+            exit_code=exit_code,
+            logs=list(self.tail),
+            log_path=self.path,
+        )
 
 
 class ContainerExecutor(dg.ConfigurableResource):
@@ -46,6 +149,11 @@ class ContainerExecutor(dg.ConfigurableResource):
     ecs_task_definitions: Optional[Dict[str, str]] = None
     # Use Fargate Spot for cost savings (can be interrupted)
     use_fargate_spot: bool = True
+    # Local only: run jobs on long-lived worker containers instead of a new container per call
+    warm_pool: bool = False
+    warm_pool_size: int = DEFAULT_POOL_SIZE  # Workers per image
+    warm_worker_max_jobs: int = DEFAULT_MAX_JOBS  # Jobs before a worker is replaced
+    warm_images: List[str] = WARM_IMAGES
     
     def execute(
         self,
@@ -72,18 +180,64 @@ class ContainerExecutor(dg.ConfigurableResource):
         """
         env_vars = env_vars or {}
         
-        # Detect environment if not explicitly set
+        if self._resolve_environment() == "local":
+            return self._execute_docker(context, image, command, env_vars, name, **kwargs)
+        else:
+            return self._execute_ecs(context, image, command, env_vars, name, **kwargs)
+    
+    def submit(
+        self,
+        context,
+        image: str,
+        command: List[str],
+        env_vars: Optional[Dict[str, str]] = None,
+        name: Optional[str] = None,
+        **kwargs,
+    ) -> Future:
+        """
+        Start a container without waiting for it - Docker locally, ECS in production.
+        
+        The container is tracked by the process-wide poller of its backend (see
+        task_poller), which resolves the returned future with an ExecutionResult
+        when it stops. Any number of containers can be submitted from one step
+        or sensor and awaited together, e.g. with concurrent.futures.wait.
+        
+        Args:
+            Same as execute().
+        
+        Returns:
+            Future of the container's ExecutionResult.
+        """
+        env_vars = env_vars or {}
+        future = Future()
+        future.set_running_or_notify_cancel()
+        
+        try:
+            if self._resolve_environment() == "local":
+                container = self._start_container(context, image, command, env_vars, name, **kwargs)
+                capture = LogCapture(context, name=container.name)
+                return get_docker_poller().track(container, future, capture, context)
+            
+            import boto3
+            
+            task_arn = self._start_ecs_task(context, boto3.client("ecs"), image, command, env_vars)
+            capture = LogCapture(context, name=task_arn.split("/")[-1])
+            return get_ecs_poller(self.ecs_cluster).track(task_arn, future, capture, context)
+        except Exception as e:
+            raise dg.Failure(
+                f"Failed to submit container: {e}",
+                metadata={"image": image, "command": command, "error": str(e)},
+            )
+    
+    def _resolve_environment(self) -> str:
+        """Detect the environment if not explicitly set."""
         environment = self.environment
         if environment == "local" and os.environ.get("DAGSTER_ENVIRONMENT") == "production":
             environment = "production"
         elif environment == "local" and os.environ.get("AWS_EXECUTION_ENV"):
             # Running in ECS/Lambda
             environment = "production"
-        
-        if environment == "local":
-            return self._execute_docker(context, image, command, env_vars, name, **kwargs)
-        else:
-            return self._execute_ecs(context, image, command, env_vars, name, **kwargs)
+        return environment
     
     def _execute_docker(
         self,
@@ -103,68 +257,29 @@ class ContainerExecutor(dg.ConfigurableResource):
             )
         
         try:
-            client = docker.from_env()
+            if self.warm_pool and image in self.warm_images:
+                result = self._execute_warm(context, image, command, env_vars, name)
+                if result is not None:
+                    return result
             
-            # Check if network exists, create if not
-            try:
-                client.networks.get(self.docker_network)
-            except docker.errors.NotFound:
-                context.log.info(f"Creating Docker network: {self.docker_network}")
-                client.networks.create(self.docker_network, driver="bridge")
+            container = self._start_container(context, image, command, env_vars, name, **kwargs)
             
-            context.log.info(f"Executing container: {image} with command: {command}")
-
-            # Avoid name collisions by appending a short random suffix
-            resolved_name = f"{name}-{uuid.uuid4().hex[:8]}" if name else None
-            
-            # Run container with detach=True to get container object, then wait for completion
-            container = client.containers.run(
-                image=image,
-                command=command,
-                environment=env_vars,
-                network=self.docker_network,
-                detach=True,  # Get container object
-                name=resolved_name,
-                mem_limit=kwargs.get("mem_limit", "2g"),
-                cpu_count=kwargs.get("cpu_count", 1),
-                stdout=True,
-                stderr=True,
-            )
-            
-            # Wait for container to finish and get exit code
-            exit_code = container.wait().get("StatusCode", 1)
-            success = exit_code == 0
-            
-            # Get logs from container
-            logs_bytes = container.logs(stdout=True, stderr=True)
-            logs = logs_bytes.decode("utf-8").split("\n") if logs_bytes else []
-            
-            # Stream logs to Dagster context
-            for line in logs:
-                if line.strip():
-                    context.log.info(line)
-            
-            # Remove container after getting logs
-            container.remove()
+            # Follow the log stream until the container exits
+            capture = LogCapture(context, name=container.name)
+            try:
+                capture.consume(container.logs(stdout=True, stderr=True, stream=True, follow=True))
+                exit_code = container.wait().get("StatusCode", 1)
+            finally:
+                capture.close()
+                container.remove(force=True)
             
-            if not success:
+            result = capture.result(exit_code)
+            if not result.success:
                 context.log.error(f"Container exited with code {exit_code}")
-                return ExecutionResult(
-                    success=False,
-                    exit_code=exit_code,
-                    stdout="\n".join(logs),
-                    stderr="",
-                    logs=logs,
-                )
+                return result
             
             context.log.info(f"Container execution succeeded")
-            return ExecutionResult(
-                success=True,
-                exit_code=exit_code,
-                stdout="\n".join(logs),
-                stderr="",
-                logs=logs,
-            )
+            return result
             
         except docker.errors.ImageNotFound:
             raise dg.Failure(
@@ -183,6 +298,67 @@ class ContainerExecutor(dg.ConfigurableResource):
                 metadata={"image": image, "command": command, "error": str(e)},
             )
     
+    def _execute_warm(
+        self,
+        context,
+        image: str,
+        command: List[str],
+        env_vars: Dict[str, str],
+        name: Optional[str],
+    ) -> Optional[ExecutionResult]:
+        """Run a job on a warm worker; None if no worker took it and a cold run is needed."""
+        client = get_docker_client(context, self.docker_network)
+        pool = get_warm_pool(client, self.docker_network, self.warm_pool_size, self.warm_worker_max_jobs)
+        worker = pool.acquire(context, image)
+        if worker is None:
+            context.log.info(f"No warm worker available for {image}; starting a container")
+            return None
+        
+        context.log.info(f"Executing on warm worker {worker.container.name}: {image} with command: {command}")
+        capture = LogCapture(context, name=name or worker.container.name)
+        try:
+            exit_code = pool.run(worker, command, env_vars, capture)
+        finally:
+            capture.close()
+        if exit_code is None:
+            context.log.warning(f"Warm worker {worker.container.name} did not take the job; starting a container")
+            return None
+        
+        result = capture.result(exit_code)
+        if not result.success:
+            context.log.error(f"Job exited with code {exit_code}")
+        return result
+    
+    def _start_container(
+        self,
+        context,
+        image: str,
+        command: List[str],
+        env_vars: Dict[str, str],
+        name: Optional[str],
+        **kwargs,
+    ):
+        """Start a detached container on the Docker network and return it."""
+        client = get_docker_client(context, self.docker_network)
+        
+        context.log.info(f"Executing container: {image} with command: {command}")
+
+        # Avoid name collisions by appending a short random suffix
+        resolved_name = f"{name}-{uuid.uuid4().hex[:8]}" if name else None
+        
+        return client.containers.run(
+            image=image,
+            command=command,
+            environment=env_vars,
+            network=self.docker_network,
+            detach=True,  # Get container object
+            name=resolved_name,
+            mem_limit=kwargs.get("mem_limit", "2g"),
+            cpu_count=kwargs.get("cpu_count", 1),
+            stdout=True,
+            stderr=True,
+        )
+    
     def _execute_ecs(
         self,
         context,
@@ -200,6 +376,32 @@ class ContainerExecutor(dg.ConfigurableResource):
                 "boto3 required for production execution. Install with: pip install boto3"
             )
         
+        ecs_client = boto3.client("ecs")
+        logs_client = boto3.client("logs")
+        
+        try:
+            task_arn = self._start_ecs_task(context, ecs_client, image, command, env_vars)
+            
+            # Wait for task completion and stream logs
+            return self._wait_for_ecs_task_completion(
+                context, ecs_client, logs_client, self.ecs_cluster, task_arn
+            )
+            
+        except Exception as e:
+            raise dg.Failure(
+                f"Failed to execute ECS task: {e}",
+                metadata={"image": image, "command": command, "error": str(e)},
+            )
+    
+    def _start_ecs_task(
+        self,
+        context,
+        ecs_client,
+        image: str,
+        command: List[str],
+        env_vars: Dict[str, str],
+    ) -> str:
+        """Run an ECS task for an image and return its ARN."""
         if not self.ecs_cluster:
             raise ValueError("ecs_cluster must be set for production execution")
         if not self.ecs_subnets:
@@ -213,9 +415,6 @@ class ContainerExecutor(dg.ConfigurableResource):
                 f"Configure ecs_task_definitions mapping or ecs_task_definition."
             )
         
-        ecs_client = boto3.client("ecs")
-        logs_client = boto3.client("logs")
-        
         context.log.info(f"Executing ECS task: {image} with command: {command}")
         context.log.info(f"Task definition: {task_definition}")
         
@@ -230,50 +429,41 @@ class ContainerExecutor(dg.ConfigurableResource):
                 {"capacityProvider": "FARGATE", "weight": 0, "base": 0},  # Fallback
             ]
         
-        try:
-            # Run ECS task
-            run_task_kwargs = {
-                "cluster": self.ecs_cluster,
-                "taskDefinition": task_definition,
-                "networkConfiguration": {
-                    "awsvpcConfiguration": {
-                        "subnets": self.ecs_subnets,
-                        "securityGroups": self.ecs_security_groups or [],
-                        "assignPublicIp": "ENABLED",
+        # Run ECS task
+        run_task_kwargs = {
+            "cluster": self.ecs_cluster,
+            "taskDefinition": task_definition,
+            "networkConfiguration": {
+                "awsvpcConfiguration": {
+                    "subnets": self.ecs_subnets,
+                    "securityGroups": self.ecs_security_groups or [],
+                    "assignPublicIp": "ENABLED",
+                }
+            },
+            "overrides": {
+                "containerOverrides": [
+                    {
+                        "name": "container",  # Default container name
+                        "command": command,
+                        "environment": environment,
                     }
-                },
-                "overrides": {
-                    "containerOverrides": [
-                        {
-                            "name": "container",  # Default container name
-                            "command": command,
-                            "environment": environment,
-                        }
-                    ]
-                },
-            }
-            
-            # Use capacity provider strategy for Spot, or launchType for on-demand
-            if capacity_provider_strategy:
-                run_task_kwargs["capacityProviderStrategy"] = capacity_provider_strategy
-            else:
-                run_task_kwargs["launchType"] = "FARGATE"
-            
-            response = ecs_client.run_task(**run_task_kwargs)
-            
-            task_arn = response["tasks"][0]["taskArn"]
-            context.log.info(f"Started ECS task: {task_arn}")
-            
-            # Wait for task completion and stream logs
-            return self._wait_for_ecs_task_completion(
-                context, ecs_client, logs_client, self.ecs_cluster, task_arn
-            )
-            
-        except Exception as e:
-            raise dg.Failure(
-                f"Failed to execute ECS task: {e}",
-                metadata={"image": image, "command": command, "error": str(e)},
-            )
+                ]
+            },
+        }
+        
+        # Use capacity provider strategy for Spot, or launchType for on-demand
+        if capacity_provider_strategy:
+            run_task_kwargs["capacityProviderStrategy"] = capacity_provider_strategy
+        else:
+            run_task_kwargs["launchType"] = "FARGATE"
+        
+        response = ecs_client.run_task(**run_task_kwargs)
+        if not response.get("tasks"):
+            raise RuntimeError(f"ECS did not start the task: {response.get('failures')}")
+        
+        task_arn = response["tasks"][0]["taskArn"]
+        context.log.info(f"Started ECS task: {task_arn}")
+        return task_arn
     
     def _resolve_task_definition(self, image: str) -> Optional[str]:
         """Resolve task definition ARN from image name."""
@@ -294,6 +484,35 @@ class ContainerExecutor(dg.ConfigurableResource):
         # Fall back to legacy single task definition
         return self.ecs_task_definition
     
+    def _create_log_tailer(self, context, ecs_client, logs_client, task) -> Optional[LogTailer]:
+        """Create a tailer for the task's log stream, or None if it has none."""
+        try:
+            location = resolve_log_location(ecs_client, task)
+        except Exception as e:
+            context.log.warning(f"Could not resolve log configuration of {task['taskArn']}: {e}")
+            return None
+        if location is None:
+            context.log.warning(
+                f"Task definition {task['taskDefinitionArn']} has no awslogs stream prefix; "
+                "container logs are not streamed"
+            )
+            return None
+        if location.region and location.region != logs_client.meta.region_name:
+            import boto3
+
+            logs_client = boto3.client("logs", region_name=location.region)
+        context.log.info(f"Tailing logs from {location.group}/{location.stream}")
+        return LogTailer(logs_client, location)
+    
+    @staticmethod
+    def _forward_logs(context, tailer: LogTailer, capture: LogCapture, task_arn: str) -> None:
+        """Forward new log events; a failed fetch is logged and retried on the next poll."""
+        try:
+            for message in tailer.poll():
+                capture.write_line(message)
+        except Exception as e:
+            context.log.warning(f"Could not read logs of {task_arn}: {e}")
+    
     def _wait_for_ecs_task_completion(
         self,
         context,
@@ -304,51 +523,40 @@ class ContainerExecutor(dg.ConfigurableResource):
         poll_interval: int = 5,
         max_wait: int = 3600,
     ) -> ExecutionResult:
-        """Wait for ECS task to complete and stream logs."""
+        """Wait for ECS task to complete and stream logs.
+        
+        Logs are tailed from the CloudWatch stream named in the task's task
+        definition, forwarding only events written since the previous poll.
+        """
         start_time = time.time()
-        logs = []
+        capture = LogCapture(context, name=task_arn.split("/")[-1])
+        tailer = None
+        tailer_resolved = False
+        last_status = None
         
-        while time.time() - start_time < max_wait:
-            # Get task status
-            response = ecs_client.describe_tasks(cluster=cluster, tasks=[task_arn])
-            task = response["tasks"][0]
-            last_status = task["lastStatus"]
-            desired_status = task.get("desiredStatus")
-            
-            # Get logs (if available)
-            try:
-                # Extract log group/stream from task definition
-                # This is simplified - in practice, you'd get this from task definition
-                log_group = f"/ecs/{self.ecs_task_definition}"
-                log_stream = task_arn.split("/")[-1]
+        try:
+            while time.time() - start_time < max_wait:
+                # Get task status
+                response = ecs_client.describe_tasks(cluster=cluster, tasks=[task_arn])
+                task = response["tasks"][0]
+                last_status = task["lastStatus"]
                 
-                log_response = logs_client.get_log_events(
-                    logGroupName=log_group,
-                    logStreamName=log_stream,
-                )
+                if not tailer_resolved:
+                    tailer = self._create_log_tailer(context, ecs_client, logs_client, task)
+                    tailer_resolved = True
+                if tailer:
+                    self._forward_logs(context, tailer, capture, task_arn)
                 
-                for event in log_response.get("events", []):
-                    log_line = event["message"]
-                    logs.append(log_line)
-                    context.log.info(log_line)
-            except Exception:
-                # Logs might not be available yet
-                pass
-            
-            if last_status == "STOPPED":
-                # Task completed
-                exit_code = task.get("containers", [{}])[0].get("exitCode", 0)
-                success = exit_code == 0
+                if last_status == "STOPPED":
+                    # Task completed; pick up events delivered after the last poll
+                    if tailer:
+                        self._forward_logs(context, tailer, capture, task_arn)
+                    exit_code = task.get("containers", [{}])[0].get("exitCode", 0)
+                    return capture.result(exit_code)
                 
-                return ExecutionResult(
-                    success=success,
-                    exit_code=exit_code,
-                    stdout="\n".join(logs),
-                    stderr="",
-                    logs=logs,
-                )
-            
-            time.sleep(poll_interval)
+                time.sleep(poll_interval)
+        finally:
+            capture.close()
         
         raise dg.Failure(
             f"ECS task did not complete within {max_wait} seconds",
@@ -0,0 +1,104 @@
+"""
+Incremental CloudWatch Logs tailing for ECS tasks.
+
+An ECS task using the awslogs driver writes to the log group named in its task
+definition, in the stream `<awslogs-stream-prefix>/<container name>/<task id>`.
+LogTailer resolves that location from the task's own task definition, then
+pages forward through the stream with get_log_events' forward tokens, so every
+poll returns only events written since the previous one.
+
+The clients are plain boto3 clients, or anything with the same
+describe_task_definition / get_log_events methods, e.g. a stand-in in tests.
+"""
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+DEFAULT_CONTAINER_NAME = "container"
+MAX_PAGES_PER_POLL = 100  # get_log_events returns up to 1 MB / 10,000 events per page
+
+
+class LogLocation(NamedTuple):
+    """CloudWatch log group and stream of one container of a task."""
+
+    group: str
+    stream: str
+    region: Optional[str] = None
+
+
+def resolve_log_location(
+    ecs_client,
+    task: Dict[str, Any],
+    container_name: str = DEFAULT_CONTAINER_NAME,
+) -> Optional[LogLocation]:
+    """Find where a task's container logs, from the task definition it runs.
+
+    Returns None when the container does not use the awslogs driver, or has no
+    stream prefix (the stream is then named after the Docker container id,
+    which ECS does not report).
+    """
+    task_definition = ecs_client.describe_task_definition(
+        taskDefinition=task["taskDefinitionArn"]
+    )["taskDefinition"]
+    containers = task_definition.get("containerDefinitions", [])
+    container = next(
+        (definition for definition in containers if definition.get("name") == container_name),
+        containers[0] if containers else None,
+    )
+    if container is None:
+        return None
+
+    log_configuration = container.get("logConfiguration") or {}
+    options = log_configuration.get("options") or {}
+    if log_configuration.get("logDriver") != "awslogs" or not options.get("awslogs-stream-prefix"):
+        return None
+
+    task_id = task["taskArn"].split("/")[-1]
+    return LogLocation(
+        group=options["awslogs-group"],
+        stream=f"{options['awslogs-stream-prefix']}/{container['name']}/{task_id}",
+        region=options.get("awslogs-region"),
+    )
+
+
+class LogTailer:
+    """Follows one CloudWatch log stream, returning each event exactly once."""
+
+    def __init__(self, logs_client, location: LogLocation):
+        self.logs_client = logs_client
+        self.location = location
+        self.next_token: Optional[str] = None
+        self.events = 0
+
+    def poll(self) -> Iterator[str]:
+        """Yield the messages written since the previous poll, oldest first."""
+        for _ in range(MAX_PAGES_PER_POLL):
+            kwargs = {
+                "logGroupName": self.location.group,
+                "logStreamName": self.location.stream,
+                "startFromHead": True,
+            }
+            if self.next_token:
+                kwargs["nextToken"] = self.next_token
+            try:
+                response = self.logs_client.get_log_events(**kwargs)
+            except Exception as error:
+                # The stream is only created once the container has started
+                if _error_code(error) == "ResourceNotFoundException":
+                    return
+                raise
+
+            for event in response.get("events", []):
+                self.events += 1
+                yield event["message"]
+
+            token = response.get("nextForwardToken")
+            # The same token coming back means the end of the stream was reached
+            reached_end = token is None or token == self.next_token
+            self.next_token = token or self.next_token
+            if reached_end or not response.get("events"):
+                return
+
+
+def _error_code(error: Exception) -> Optional[str]:
+    """Get the AWS error code of a botocore ClientError."""
+    response = getattr(error, "response", None) or {}
+    return response.get("Error", {}).get("Code")
@@ -0,0 +1,220 @@
+"""
+Shared background pollers completing the futures of submitted containers.
+
+ContainerExecutor.submit() starts a container or ECS task and hands it to the
+process-wide poller of its backend, which resolves the returned future when it
+stops. One poller tracks any number of tasks, so a single Dagster step or
+sensor can drive a large backfill without one blocked process per partition:
+
+- EcsTaskPoller checks all tracked task ARNs with batched describe_tasks
+  calls (up to 100 ARNs per call) every poll interval and tails each task's
+  CloudWatch stream with a LogTailer.
+- DockerEventPoller follows the Docker daemon's `die` events instead of
+  polling; when a tracked container exits, its output is streamed into the
+  task's LogCapture and the container is removed.
+"""
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from orchestration_dagster.lib.log_tailer import LogTailer, resolve_log_location
+
+DESCRIBE_TASKS_BATCH = 100  # Maximum number of tasks per describe_tasks call
+DEFAULT_POLL_INTERVAL = 5
+
+
+class _Tracked:
+    """A submitted task: its future, log capture and (ECS) log tailer."""
+
+    def __init__(self, future: Future, capture, context):
+        self.future = future
+        self.capture = capture
+        self.context = context
+        self.tailer: Optional[LogTailer] = None
+        self.tailer_resolved = False
+
+
+def _finish(tracked: _Tracked, exit_code: Optional[int] = None, error: Optional[BaseException] = None):
+    """Close a task's log capture and resolve its future (once)."""
+    try:
+        tracked.capture.close()
+    finally:
+        if tracked.future.done():
+            return
+        if error is not None:
+            tracked.future.set_exception(error)
+        else:
+            tracked.future.set_result(tracked.capture.result(1 if exit_code is None else exit_code))
+
+
+class EcsTaskPoller:
+    """Tracks the ECS tasks of one cluster with batched describe_tasks calls."""
+
+    def __init__(self, ecs_client, logs_client, cluster: str, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.ecs_client = ecs_client
+        self.logs_client = logs_client
+        self.cluster = cluster
+        self.poll_interval = poll_interval
+        self._tasks: Dict[str, _Tracked] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, task_arn: str, future: Future, capture, context) -> Future:
+        with self._lock:
+            self._tasks[task_arn] = _Tracked(future, capture, context)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="ecs-task-poller", daemon=True)
+                self._thread.start()
+        return future
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                task_arns = list(self._tasks)
+                if not task_arns:
+                    self._thread = None
+                    return
+            for start in range(0, len(task_arns), DESCRIBE_TASKS_BATCH):
+                self._poll(task_arns[start:start + DESCRIBE_TASKS_BATCH])
+            time.sleep(self.poll_interval)
+
+    def _poll(self, task_arns: List[str]) -> None:
+        try:
+            response = self.ecs_client.describe_tasks(cluster=self.cluster, tasks=task_arns)
+        except Exception as error:
+            # Transient API errors: keep tracking and retry on the next poll
+            with self._lock:
+                contexts = {id(tracked.context): tracked.context for tracked in self._tasks.values()}
+            for context in contexts.values():
+                context.log.warning(f"describe_tasks failed, retrying: {error}")
+            return
+
+        for failure in response.get("failures", []):
+            tracked = self._pop(failure.get("arn"))
+            if tracked:
+                _finish(tracked, error=RuntimeError(f"ECS task {failure.get('arn')}: {failure.get('reason')}"))
+
+        for task in response.get("tasks", []):
+            with self._lock:
+                tracked = self._tasks.get(task["taskArn"])
+            if tracked is None:
+                continue
+            self._tail(tracked, task)
+            if task["lastStatus"] == "STOPPED":
+                # Pick up events delivered after the last poll
+                self._tail(tracked, task)
+                self._pop(task["taskArn"])
+                exit_code = task.get("containers", [{}])[0].get("exitCode")
+                if exit_code is None:
+                    tracked.context.log.error(f"Task {task['taskArn']} stopped: {task.get('stoppedReason')}")
+                _finish(tracked, exit_code=exit_code)
+
+    def _tail(self, tracked: _Tracked, task: Dict[str, Any]) -> None:
+        if not tracked.tailer_resolved:
+            tracked.tailer_resolved = True
+            try:
+                location = resolve_log_location(self.ecs_client, task)
+            except Exception as error:
+                tracked.context.log.warning(f"Could not resolve log configuration of {task['taskArn']}: {error}")
+                location = None
+            if location:
+                tracked.tailer = LogTailer(self.logs_client, location)
+        if tracked.tailer:
+            try:
+                for message in tracked.tailer.poll():
+                    tracked.capture.write_line(message)
+            except Exception as error:
+                tracked.context.log.warning(f"Could not read logs of {task['taskArn']}: {error}")
+
+    def _pop(self, task_arn: Optional[str]) -> Optional[_Tracked]:
+        with self._lock:
+            return self._tasks.pop(task_arn, None)
+
+
+class DockerEventPoller:
+    """Tracks local containers through the Docker daemon's event stream."""
+
+    def __init__(self, client):
+        self.client = client
+        self._containers: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, container, future: Future, capture, context) -> Future:
+        with self._lock:
+            self._containers[container.id] = (container, _Tracked(future, capture, context))
+            if self._thread is None:
+                # Subscribe before checking the container's state below, so no exit goes unseen
+                events = self.client.events(decode=True, filters={"type": "container", "event": "die"})
+                self._thread = threading.Thread(
+                    target=self._run, args=(events,), name="docker-event-poller", daemon=True
+                )
+                self._thread.start()
+        # The container may have exited before the subscription existed
+        container.reload()
+        if container.status in ("exited", "dead"):
+            self._complete(container.id, container.attrs.get("State", {}).get("ExitCode"))
+        return future
+
+    def _run(self, events) -> None:
+        try:
+            for event in events:
+                exit_code = event.get("Actor", {}).get("Attributes", {}).get("exitCode")
+                self._complete(event.get("id"), int(exit_code) if exit_code is not None else None)
+        finally:
+            events.close()
+            with self._lock:
+                self._thread = None
+                orphaned = [(container_id, container) for container_id, (container, _) in self._containers.items()]
+            # The event stream broke off; fall back to each container's own state
+            for container_id, container in orphaned:
+                try:
+                    exit_code = container.wait().get("StatusCode")
+                except Exception as error:
+                    with self._lock:
+                        entry = self._containers.pop(container_id, None)
+                    if entry is not None:
+                        _finish(entry[1], error=error)
+                    continue
+                self._complete(container_id, exit_code)
+
+    def _complete(self, container_id: Optional[str], exit_code: Optional[int]) -> None:
+        with self._lock:
+            entry = self._containers.pop(container_id, None)
+        if entry is None:
+            return
+        container, tracked = entry
+        try:
+            tracked.capture.consume(container.logs(stdout=True, stderr=True, stream=True))
+            container.remove(force=True)
+        except Exception as error:
+            _finish(tracked, error=error)
+            return
+        _finish(tracked, exit_code=exit_code)
+
+
+_pollers: Dict[Any, Any] = {}
+_pollers_lock = threading.Lock()
+
+
+def get_ecs_poller(cluster: str) -> EcsTaskPoller:
+    """Get the process-wide poller of an ECS cluster."""
+    import boto3
+
+    with _pollers_lock:
+        key = ("ecs", cluster)
+        if key not in _pollers:
+            _pollers[key] = EcsTaskPoller(boto3.client("ecs"), boto3.client("logs"), cluster)
+        return _pollers[key]
+
+
+def get_docker_poller() -> DockerEventPoller:
+    """Get the process-wide poller of the local Docker daemon."""
+    import docker
+
+    with _pollers_lock:
+        key = ("docker",)
+        if key not in _pollers:
+            _pollers[key] = DockerEventPoller(docker.from_env())
+        return _pollers[key]
@@ -0,0 +1,236 @@
+"""
+Pool of warm worker containers for local Docker execution.
+
+Cold runs pay for container creation, interpreter startup and importing dlt or
+dbt on every call, which is most of the latency of a small incremental run.
+Images whose CLI has a `serve` command (ingestion, transformations_dbt) can
+instead run as long-lived workers that accept jobs over HTTP (see
+ingestion/src/ingestion/worker.py for the protocol). The pool:
+
+- starts up to `size` workers per image on demand and hands out idle ones,
+  each with its own random token that jobs must present,
+- sends a job's command and env vars to a worker and streams its output into
+  the job's LogCapture,
+- drops a worker that announces it is retiring (after N jobs or memory growth),
+  fails, or stops answering,
+- returns None whenever no worker can take the job, so the caller falls back
+  to a cold run, and
+- removes every container it started when the process exits.
+"""
+import atexit
+import json
+import os
+import secrets
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+WORKER_PORT = 8750
+EXIT_MARKER = b"__exit__"
+WORKER_TOKEN_ENV_VAR = "WORKER_TOKEN"
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_JOBS = 50
+STARTUP_TIMEOUT = 60
+JOB_TIMEOUT = 6 * 3600
+
+
+class WarmWorker:
+    """One long-lived worker container."""
+
+    def __init__(self, container, url: str, token: str = ""):
+        self.container = container
+        self.url = url
+        self.token = token
+        self.busy = False
+        self.jobs = 0
+
+    def healthy(self, timeout: float = 2) -> bool:
+        try:
+            with urlopen(f"{self.url}/health", timeout=timeout) as response:
+                return not json.loads(response.read()).get("retiring")
+        except (URLError, OSError, ValueError):
+            return False
+
+
+class WarmPool:
+    """Warm workers per image, shared by all executions in this process."""
+
+    def __init__(
+        self,
+        client,
+        network: str,
+        size: int = DEFAULT_POOL_SIZE,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        mem_limit: str = "2g",
+    ):
+        self.client = client
+        self.network = network
+        self.size = size
+        self.max_jobs = max_jobs
+        self.mem_limit = mem_limit
+        self._workers: Dict[str, List[WarmWorker]] = {}
+        # Retired workers whose container could not be removed yet
+        self._retired: List[WarmWorker] = []
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def acquire(self, context, image: str) -> Optional[WarmWorker]:
+        """Get an idle worker for an image, starting one if the pool has room."""
+        with self._lock:
+            if self._closed:
+                return None
+            workers = self._workers.setdefault(image, [])
+            for worker in workers:
+                if not worker.busy:
+                    worker.busy = True
+                    return worker
+            if len(workers) >= self.size:
+                return None
+            # Reserve the slot while the container starts outside the lock
+            placeholder = WarmWorker(None, "")
+            placeholder.busy = True
+            workers.append(placeholder)
+
+        worker = self._start(context, image)
+        with self._lock:
+            workers.remove(placeholder)
+            if worker and self._closed:
+                # The pool shut down while the container was starting
+                self._retired.append(worker)
+                worker = None
+            elif worker:
+                worker.busy = True
+                workers.append(worker)
+        if worker is None:
+            self._remove_retired()
+        return worker
+
+    def _start(self, context, image: str) -> Optional[WarmWorker]:
+        name = f"warm-{image.split('/')[-1].split(':')[0]}-{uuid.uuid4().hex[:8]}"
+        token = secrets.token_urlsafe(32)
+        try:
+            container = self.client.containers.run(
+                image=image,
+                command=["serve", "--port", str(WORKER_PORT), "--max-jobs", str(self.max_jobs)],
+                network=self.network,
+                detach=True,
+                name=name,
+                mem_limit=self.mem_limit,
+                environment={WORKER_TOKEN_ENV_VAR: token},
+                ports={f"{WORKER_PORT}/tcp": ("127.0.0.1", None)},
+            )
+        except Exception as e:
+            context.log.warning(f"Could not start warm worker for {image}: {e}")
+            return None
+
+        worker = WarmWorker(container, "", token=token)
+        try:
+            worker.url = self._worker_url(container, name)
+        except Exception as e:
+            context.log.warning(f"Could not reach warm worker {name} for {image}: {e}")
+            self._remove(worker)
+            return None
+        deadline = time.time() + STARTUP_TIMEOUT
+        while time.time() < deadline:
+            if worker.healthy():
+                context.log.info(f"Started warm worker {name} for {image}")
+                return worker
+            container.reload()
+            if container.status in ("exited", "dead"):
+                break
+            time.sleep(0.5)
+        context.log.warning(f"Warm worker {name} for {image} did not become ready; using cold runs")
+        self._remove(worker)
+        return None
+
+    @staticmethod
+    def _worker_url(container, name: str) -> str:
+        """Reach the worker by name on the Docker network, or via its published port from the host."""
+        if os.path.exists("/.dockerenv"):
+            return f"http://{name}:{WORKER_PORT}"
+        container.reload()
+        binding = container.attrs["NetworkSettings"]["Ports"][f"{WORKER_PORT}/tcp"][0]
+        return f"http://127.0.0.1:{binding['HostPort']}"
+
+    def run(self, worker: WarmWorker, command: List[str], env_vars: Dict[str, str], capture) -> Optional[int]:
+        """
+        Run a job on a worker, streaming its output into `capture`.
+
+        Returns the job's exit code, or None if the worker could not take the
+        job (nothing ran, so the caller can fall back to a cold run).
+        """
+        body = json.dumps({"argv": command, "env": env_vars}).encode("utf-8")
+        request = Request(f"{worker.url}/run", data=body, method="POST",
+                          headers={"Content-Type": "application/json",
+                                   "Authorization": f"Bearer {worker.token}"})
+        recycle = True
+        try:
+            try:
+                response = urlopen(request, timeout=JOB_TIMEOUT)
+            except (URLError, OSError):
+                return None
+
+            exit_code = 1  # The connection dropped before the worker reported one
+            with response:
+                for line in response:
+                    if line.startswith(EXIT_MARKER):
+                        parts = line.decode("utf-8").split()
+                        exit_code = int(parts[1])
+                        recycle = "recycle" in parts[2:]
+                    else:
+                        capture.feed(line)
+            worker.jobs += 1
+            return exit_code
+        finally:
+            self.release(worker, recycle=recycle)
+
+    def release(self, worker: WarmWorker, recycle: bool = False) -> None:
+        """Return a worker to the pool, or retire it."""
+        with self._lock:
+            if recycle:
+                for workers in self._workers.values():
+                    if worker in workers:
+                        workers.remove(worker)
+            worker.busy = False
+        if recycle:
+            self._remove(worker)
+
+    def shutdown(self) -> None:
+        """Remove every worker container the pool started; the pool takes no more jobs."""
+        with self._lock:
+            self._closed = True
+            for workers in self._workers.values():
+                self._retired.extend(worker for worker in workers if worker.container is not None)
+            self._workers.clear()
+        self._remove_retired()
+
+    def _remove(self, worker: WarmWorker) -> None:
+        """Remove a worker's container, keeping it for another attempt if Docker refuses."""
+        try:
+            worker.container.remove(force=True)
+        except Exception:
+            with self._lock:
+                self._retired.append(worker)
+
+    def _remove_retired(self) -> None:
+        with self._lock:
+            retired, self._retired = self._retired, []
+        for worker in retired:
+            self._remove(worker)
+
+
+_pools: Dict[tuple, WarmPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_warm_pool(client, network: str, size: int, max_jobs: int) -> WarmPool:
+    """Get the process-wide warm pool for a Docker network."""
+    with _pools_lock:
+        key = (network, size, max_jobs)
+        if key not in _pools:
+            _pools[key] = WarmPool(client, network, size=size, max_jobs=max_jobs)
+            atexit.register(_pools[key].shutdown)
+        return _pools[key]
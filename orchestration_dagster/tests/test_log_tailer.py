@@ -0,0 +1,123 @@
+import pytest
+
+from orchestration_dagster.lib.log_tailer import LogLocation, LogTailer, resolve_log_location
+
+LOCATION = LogLocation(group="/ecs/ingestion", stream="ecs/container/abc123")
+TASK = {
+    "taskArn": "arn:aws:ecs:eu-north-1:123456789012:task/cluster/abc123",
+    "taskDefinitionArn": "arn:aws:ecs:eu-north-1:123456789012:task-definition/ingestion:7",
+}
+
+
+class ClientError(Exception):
+    """Shaped like botocore's ClientError, which carries the AWS error code."""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+class StubLogsClient:
+    """Serves a CloudWatch stream in pages of `page_size` events, with forward tokens."""
+
+    def __init__(self, messages=(), page_size=2, missing=False):
+        self.messages = list(messages)
+        self.page_size = page_size
+        self.missing = missing
+        self.calls = []
+
+    def get_log_events(self, logGroupName, logStreamName, startFromHead, nextToken=None):
+        self.calls.append(nextToken)
+        if self.missing:
+            raise ClientError("ResourceNotFoundException")
+        start = int(nextToken.split("/")[1]) if nextToken else 0
+        page = self.messages[start:start + self.page_size]
+        # Like CloudWatch, the end of the stream returns the token it was given
+        end = start + len(page)
+        return {
+            "events": [{"message": message} for message in page],
+            "nextForwardToken": f"f/{end}",
+        }
+
+
+class StubEcsClient:
+    def __init__(self, container_definitions):
+        self.container_definitions = container_definitions
+
+    def describe_task_definition(self, taskDefinition):
+        assert taskDefinition == TASK["taskDefinitionArn"]
+        return {"taskDefinition": {"containerDefinitions": self.container_definitions}}
+
+
+def test_poll_pages_forward_and_returns_each_event_once():
+    client = StubLogsClient(["one", "two", "three"])
+    tailer = LogTailer(client, LOCATION)
+
+    assert list(tailer.poll()) == ["one", "two", "three"]
+    assert list(tailer.poll()) == []
+
+    client.messages += ["four"]
+    assert list(tailer.poll()) == ["four"]
+    assert tailer.events == 4
+
+
+def test_poll_stops_when_the_same_token_comes_back():
+    client = StubLogsClient(["one", "two"], page_size=10)
+    tailer = LogTailer(client, LOCATION)
+
+    list(tailer.poll())
+    client.calls.clear()
+    list(tailer.poll())
+
+    # One request at the end of the stream, not a loop over the same token
+    assert client.calls == ["f/2"]
+
+
+def test_poll_before_the_stream_exists_yields_nothing():
+    client = StubLogsClient(missing=True)
+
+    assert list(LogTailer(client, LOCATION).poll()) == []
+
+
+def test_poll_raises_other_errors():
+    class ThrottledClient(StubLogsClient):
+        def get_log_events(self, **kwargs):
+            raise ClientError("ThrottlingException")
+
+    with pytest.raises(ClientError):
+        list(LogTailer(ThrottledClient(), LOCATION).poll())
+
+
+def test_resolve_log_location_from_the_task_definition():
+    ecs_client = StubEcsClient([
+        {"name": "sidecar"},
+        {
+            "name": "container",
+            "logConfiguration": {
+                "logDriver": "awslogs",
+                "options": {
+                    "awslogs-group": "/ecs/ingestion",
+                    "awslogs-stream-prefix": "ecs",
+                    "awslogs-region": "eu-north-1",
+                },
+            },
+        },
+    ])
+
+    assert resolve_log_location(ecs_client, TASK) == LogLocation(
+        group="/ecs/ingestion", stream="ecs/container/abc123", region="eu-north-1"
+    )
+
+
+@pytest.mark.parametrize(
+    "log_configuration",
+    [
+        {"logDriver": "json-file"},
+        {"logDriver": "awslogs", "options": {"awslogs-group": "/ecs/ingestion"}},
+    ],
+    ids=["other driver", "no stream prefix"],
+)
+def test_resolve_log_location_without_an_awslogs_stream(log_configuration):
+    ecs_client = StubEcsClient([{"name": "container", "logConfiguration": log_configuration}])
+
+    assert resolve_log_location(ecs_client, TASK) is None
@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from orchestration_dagster.lib.task_poller import DockerEventPoller
+
+
+class StubCapture:
+    def consume(self, stream):
+        pass
+
+    def close(self):
+        pass
+
+    def result(self, exit_code):
+        return exit_code
+
+
+class StubContainer:
+    status = "running"
+    attrs = {}
+
+    def __init__(self, container_id, exit_code=0, wait_error=None):
+        self.id = container_id
+        self.exit_code = exit_code
+        self.wait_error = wait_error
+
+    def reload(self):
+        pass
+
+    def wait(self):
+        if self.wait_error:
+            raise self.wait_error
+        return {"StatusCode": self.exit_code}
+
+    def logs(self, **kwargs):
+        return iter(())
+
+    def remove(self, force=False):
+        pass
+
+
+class BrokenEvents:
+    """A Docker event stream that breaks off once released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def __iter__(self):
+        self.release.wait(5)
+        return iter(())
+
+    def close(self):
+        pass
+
+
+class StubClient:
+    def __init__(self):
+        self.stream = BrokenEvents()
+
+    def events(self, **kwargs):
+        return self.stream
+
+
+def test_broken_event_stream_falls_back_to_container_state():
+    client = StubClient()
+    poller = DockerEventPoller(client)
+    exited = poller.track(StubContainer("a", exit_code=3), Future(), StubCapture(), context=None)
+    unreachable = poller.track(
+        StubContainer("b", wait_error=RuntimeError("daemon gone")), Future(), StubCapture(), context=None
+    )
+
+    client.stream.release.set()
+
+    assert exited.result(5) == 3
+    with pytest.raises(RuntimeError, match="daemon gone"):
+        unreachable.result(5)
+    assert poller._containers == {}
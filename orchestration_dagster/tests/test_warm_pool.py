@@ -0,0 +1,42 @@
+from orchestration_dagster.lib.warm_pool import WarmPool, WarmWorker
+
+
+class StubContainer:
+    def __init__(self, fail_removals=0):
+        self.fail_removals = fail_removals
+        self.removed = False
+
+    def remove(self, force=False):
+        if self.fail_removals:
+            self.fail_removals -= 1
+            raise RuntimeError("container is restarting")
+        self.removed = True
+
+
+def add_worker(pool, image, container):
+    worker = WarmWorker(container, "http://worker")
+    pool._workers.setdefault(image, []).append(worker)
+    return worker
+
+
+def test_shutdown_removes_every_worker_container():
+    pool = WarmPool(client=None, network="test")
+    idle = add_worker(pool, "ingestion", StubContainer())
+    busy = add_worker(pool, "dbt", StubContainer())
+    busy.busy = True
+
+    pool.shutdown()
+
+    assert idle.container.removed and busy.container.removed
+    assert pool.acquire(context=None, image="ingestion") is None
+
+
+def test_failed_recycle_is_removed_at_shutdown():
+    pool = WarmPool(client=None, network="test")
+    worker = add_worker(pool, "ingestion", StubContainer(fail_removals=1))
+
+    pool.release(worker, recycle=True)
+    assert not worker.container.removed
+
+    pool.shutdown()
+    assert worker.container.removed
@@ -6,6 +6,7 @@ Usage:
     dbt-cli run [--select=SELECTOR] [--full-refresh] [--target=TARGET]
     dbt-cli build [--select=SELECTOR] [--full-refresh] [--target=TARGET]
     dbt-cli test [--select=SELECTOR] [--target=TARGET]
+    dbt-cli serve [--port=PORT] [--max-jobs=N] [--max-rss-growth=SIZE]
 """
 import argparse
 import os
@@ -13,6 +14,9 @@ import subprocess
 import sys
 from pathlib import Path
 
+# Set by `serve`: jobs run dbt in-process in the warm worker instead of as a subprocess
+IN_PROCESS = False
+
 
 def run_dbt_command(command: str, select: str | None = None, full_refresh: bool = False, target: str | None = None):
     """Run a dbt command."""
@@ -34,12 +38,19 @@ def run_dbt_command(command: str, select: str | None = None, full_refresh: bool
     # Set working directory to dbt project root
     project_dir = Path(__file__).parent
     
+    if IN_PROCESS:
+        from dbt.cli.main import dbtRunner
+        
+        os.chdir(project_dir)
+        result = dbtRunner().invoke(cmd[1:])
+        sys.exit(0 if result.success else 1)
+    
     # Run dbt command
     result = subprocess.run(cmd, cwd=project_dir, check=False)
     sys.exit(result.returncode)
 
 
-def main():
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="DBT CLI for transformations")
     subparsers = parser.add_subparsers(dest="command", help="DBT command to run")
     
@@ -60,9 +71,32 @@ def main():
     test_parser.add_argument("--select", help="dbt selector")
     test_parser.add_argument("--target", help="dbt target")
     
-    args = parser.parse_args()
+    # Serve command
+    serve_parser = subparsers.add_parser("serve", help="Run as a warm worker accepting dbt jobs over HTTP (see ingestion.worker)")
+    serve_parser.add_argument("--port", type=int, default=8750, help="Port to listen on (default: 8750)")
+    serve_parser.add_argument("--max-jobs", type=int, default=50, help="Retire after this many jobs (default: 50)")
+    serve_parser.add_argument("--max-rss-growth", default="512m", help="Retire once a job's peak RSS exceeded the warm process's by this much (default: 512m)")
     
-    if args.command:
+    args = parser.parse_args(argv)
+    
+    if args.command == "serve":
+        # The worker is shared with the ingestion image. This image ships its
+        # package (see Dockerfile); outside it, use the repository's copy.
+        sys.path.append(str(Path(__file__).parent.parent / "ingestion" / "src"))
+        from ingestion.memory import parse_size
+        from ingestion.worker import serve
+        
+        global IN_PROCESS
+        IN_PROCESS = True
+        serve(
+            main,
+            port=args.port,
+            max_jobs=args.max_jobs,
+            max_rss_growth=parse_size(args.max_rss_growth),
+            warm_imports=("dbt.cli.main",),
+        )
+        sys.exit(0)
+    elif args.command:
         run_dbt_command(
             command=args.command,
             select=args.select,